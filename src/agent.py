@@ -1,15 +1,17 @@
 """Main agent orchestration"""
 
-import time
 import signal
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import psutil
 import os
-from typing import List, Dict, Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from src.config.settings import load_config
-from src.utils.logger import setup_logger, get_logger
+from src.utils.logger import get_logger, setup_logger, stop_logger
 from src.utils.helpers import get_hostname
+from src.utils.proc_sampler import ProcSampler
+from src.utils.periodic_scheduler import PeriodicScheduler
 from src.collectors.base import BaseCollector
 from src.collectors.cpu_collector import CPUCollector
 from src.collectors.memory_collector import MemoryCollector
@@ -17,30 +19,55 @@ from src.collectors.disk_collector import DiskCollector
 from src.collectors.network_collector import NetworkCollector
 from src.collectors.process_collector import ProcessCollector
 from src.exporters.prometheus_exporter import PrometheusExporter
+from src.alerts import AlertManager, AlertEvaluator, load_alert_rules
+
+# How often start() checks an embedder's external stop event
+EXTERNAL_STOP_POLL_SECONDS = 0.5
 
 
 class Agent:
     """Main agent class for orchestrating metric collection"""
 
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any],
+                 external_stop_event: Optional[threading.Event] = None):
         """
         Initialize agent
 
         Args:
             config: Configuration dictionary
+            external_stop_event: Optional event owned by an embedding
+                application; setting it stops the agent like stop(), and
+                start() returns at once if it is already set
         """
         self.config = config
         self.logger = get_logger(self.__class__.__name__)
-        self.running = False
+        # The agent's own stop state; an embedder's event is only ever read,
+        # never set or cleared, since other code may be sharing it
+        self._stop_event = threading.Event()
+        self._stop_event.set()
+        self._external_stop_event = external_stop_event
+        self._started = False
+        self._shutdown_lock = threading.Lock()
         self.collectors: List[BaseCollector] = []
         self.exporter = None
-        self.collector_threads = []
-        self.self_monitor_thread = None
+        self.scheduler: Optional[PeriodicScheduler] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
 
         # Alerting system
         self.alert_manager = None
         self.alert_evaluator = None
-        self.alert_evaluator_thread = None
+        self._alert_cleanup_counter = 0
+
+        # Shared sampler for the agent's own CPU/memory usage
+        self.proc_sampler = ProcSampler()
+
+        # Process CPU% is per-core (can exceed 100 on multi-core hosts);
+        # self-monitoring normalizes by the cores available to the agent
+        # so max_cpu_percent is a share of total usable CPU
+        if hasattr(os, 'sched_getaffinity'):
+            self._n_cpu = len(os.sched_getaffinity(0)) or 1
+        else:
+            self._n_cpu = psutil.cpu_count(logical=True) or 1
 
         # Setup hostname
         if config['agent']['hostname'] == 'auto':
@@ -48,7 +75,7 @@ class Agent:
         else:
             self.hostname = config['agent']['hostname']
 
-        self.logger.info(f"Initializing agent for host: {self.hostname}")
+        self.logger.info("Initializing agent for host: %s", self.hostname)
 
         # Initialize collectors
         self._init_collectors()
@@ -63,6 +90,11 @@ class Agent:
         # Setup signal handlers
         self._setup_signal_handlers()
 
+    @property
+    def running(self) -> bool:
+        """Whether the agent is running (started and not yet stopped)"""
+        return not self._stop_event.is_set()
+
     def _init_collectors(self):
         """Initialize all enabled collectors"""
         collector_classes = {
@@ -80,9 +112,9 @@ class Agent:
                 try:
                     collector = collector_class(collector_config)
                     self.collectors.append(collector)
-                    self.logger.info(f"Initialized {collector_name} collector")
+                    self.logger.info("Initialized %s collector", collector_name)
                 except Exception as e:
-                    self.logger.error(f"Failed to initialize {collector_name} collector: {e}")
+                    self.logger.error("Failed to initialize %s collector: %s", collector_name, e)
 
         if not self.collectors:
             raise ValueError("No collectors enabled! Check your configuration.")
@@ -90,9 +122,7 @@ class Agent:
     def _init_alerting(self):
         """Initialize alerting system"""
         try:
-            from src.alerts.alert_manager import AlertManager
-            from src.alerts.alert_evaluator import AlertEvaluator
-            from src.alerts.alert_rule import load_alert_rules
+            # Storage backend stays lazy (sqlite3 is only needed when alerting is on)
             from src.alerts.storage.sqlite_storage import SQLiteStorage
 
             self.logger.info("Initializing alerting system...")
@@ -101,12 +131,6 @@ class Agent:
             storage_config = self.config['alerting']['storage']
             storage = SQLiteStorage(storage_config)
 
-            # Initialize alert manager
-            self.alert_manager = AlertManager(
-                self.config['alerting'],
-                storage
-            )
-
             # Load alert rules
             rules_file = self.config['alerting'].get('alert_rules_file')
             if rules_file:
@@ -115,6 +139,13 @@ class Agent:
                 rules = []
                 self.logger.warning("No alert rules file specified")
 
+            # Initialize alert manager (restores active alerts for these rules)
+            self.alert_manager = AlertManager(
+                self.config['alerting'],
+                storage,
+                rules
+            )
+
             # Initialize alert evaluator
             self.alert_evaluator = AlertEvaluator(
                 rules,
@@ -122,99 +153,133 @@ class Agent:
                 self.alert_manager
             )
 
-            self.logger.info(f"Alerting system initialized with {len(rules)} rules")
+            self.logger.info("Alerting system initialized with %s rules", len(rules))
 
         except Exception as e:
-            self.logger.error(f"Failed to initialize alerting system: {e}", exc_info=True)
+            self.logger.error("Failed to initialize alerting system: %s", e, exc_info=True)
             raise
 
     def _setup_signal_handlers(self):
         """Setup signal handlers for graceful shutdown"""
         def signal_handler(signum, frame):
-            self.logger.info(f"Received signal {signum}, initiating graceful shutdown...")
+            self.logger.info("Received signal %s, initiating graceful shutdown...", signum)
             self.stop()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        try:
+            signal.signal(signal.SIGINT, signal_handler)
+            signal.signal(signal.SIGTERM, signal_handler)
+        except ValueError:
+            # signal.signal only works on the main thread; embedders stop
+            # the agent via stop() or the external stop event instead
+            self.logger.debug("Not on main thread, skipping signal handlers")
 
     def start(self):
         """Start the agent"""
+        external = self._external_stop_event
+        if external is not None and external.is_set():
+            self.logger.info("Stop requested before start, not starting agent")
+            return
+
         self.logger.info("Starting agent...")
-        self.running = True
+        self._stop_event.clear()
+        self._started = True
 
         try:
             # Start Prometheus HTTP server
             self.exporter.start()
-            self.exporter.agent_info.labels(
-                version='1.0.0',
-                hostname=self.hostname
-            ).set(1)
+            self.exporter.agent_info.labels(version='1.0.0').set(1)
+            self.exporter.agent_hostname_info.labels(hostname=self.hostname).set(1)
+
+            # A single scheduler thread dispatches collector and alert runs
+            # to a bounded worker pool
+            pooled_tasks = len(self.collectors) + (1 if self.alert_evaluator else 0)
+            self._pool = ThreadPoolExecutor(
+                max_workers=max(1, min(pooled_tasks, os.cpu_count() or 1)),
+                thread_name_prefix="agent-worker"
+            )
+            self.scheduler = PeriodicScheduler(
+                self._stop_event, name="agent-scheduler", executor=self._pool
+            )
 
-            # Start collector threads
+            # Schedule collectors
             for collector in self.collectors:
-                thread = threading.Thread(
-                    target=self._run_collector_loop,
-                    args=(collector,),
-                    daemon=True,
-                    name=f"collector-{collector.get_name()}"
+                self.scheduler.add_task(
+                    f"collector-{collector.get_name()}",
+                    self._make_collector_task(collector),
+                    collector.get_interval()
                 )
-                thread.start()
-                self.collector_threads.append(thread)
-                self.logger.info(f"Started {collector.get_name()} collector thread")
-
-            # Start self-monitoring thread
-            self.self_monitor_thread = threading.Thread(
-                target=self._self_monitor_loop,
-                daemon=True,
-                name="self-monitor"
+                self.logger.info("Scheduled %s collector (interval: %ss)",
+                                 collector.get_name(), collector.get_interval())
+
+            # Schedule self-monitoring on the scheduler thread itself (it may
+            # stop the agent); the first check waits a full interval so the
+            # CPU sample covers it
+            check_interval = self.config['resource_limits']['check_interval']
+            self.scheduler.add_task(
+                "self-monitor", self._self_monitor_check, check_interval,
+                delay=check_interval, inline=True
             )
-            self.self_monitor_thread.start()
-            self.logger.info("Started self-monitoring thread")
+            self.logger.info("Scheduled self-monitoring")
 
-            # Start alert evaluator thread (if enabled)
+            # Schedule alert evaluation (if enabled)
             if self.alert_evaluator:
-                self.alert_evaluator_thread = threading.Thread(
-                    target=self._run_alert_evaluator_loop,
-                    daemon=True,
-                    name="alert-evaluator"
+                self.scheduler.add_task(
+                    "alert-evaluator",
+                    self._run_alert_evaluation,
+                    self.config['alerting']['evaluation_interval']
                 )
-                self.alert_evaluator_thread.start()
-                self.logger.info("Started alert evaluator thread")
+                self.logger.info("Scheduled alert evaluation")
+
+            self.scheduler.start()
 
             self.logger.info("Agent started successfully")
-            self.logger.info(f"Prometheus metrics available at http://{self.config['prometheus']['host']}:{self.config['prometheus']['port']}/metrics")
+            self.logger.info(
+                "Prometheus metrics available at http://%s:%s/metrics",
+                self.config['prometheus']['host'], self.config['prometheus']['port']
+            )
 
-            # Keep main thread alive
-            while self.running:
-                time.sleep(1)
+            # Keep the calling thread alive until stop(); an embedder's event
+            # can't wake this wait, so it is polled instead
+            poll = EXTERNAL_STOP_POLL_SECONDS if external is not None else None
+            while not self._stop_event.wait(poll):
+                if external.is_set():
+                    self.logger.info("External stop event set, stopping agent")
+                    self._stop_event.set()
+            self._shutdown()
 
         except KeyboardInterrupt:
             self.logger.info("Keyboard interrupt received")
             self.stop()
         except Exception as e:
-            self.logger.error(f"Agent error: {e}", exc_info=True)
+            self.logger.error("Agent error: %s", e, exc_info=True)
             self.stop()
             raise
 
     def stop(self):
         """Stop the agent"""
-        if not self.running:
-            return
+        self._stop_event.set()
+        self._shutdown()
 
-        self.logger.info("Stopping agent...")
-        self.running = False
+    def _shutdown(self):
+        """Release agent resources once, whichever of stop() or start() gets here first"""
+        with self._shutdown_lock:
+            if not self._started:
+                return
+            self._started = False
 
-        # Wait for collector threads to finish
-        for thread in self.collector_threads:
-            thread.join(timeout=5)
+        self.logger.info("Stopping agent...")
 
-        # Wait for self-monitor thread
-        if self.self_monitor_thread:
-            self.self_monitor_thread.join(timeout=2)
+        # Wait for the scheduler and in-flight tasks under one shared
+        # deadline, so shutdown is bounded by the slowest task
+        if self.scheduler:
+            still_running = self.scheduler.join(timeout=5)
+            if still_running:
+                self.logger.warning("Still running after shutdown timeout: %s", ', '.join(still_running))
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
 
-        # Wait for alert evaluator thread
-        if self.alert_evaluator_thread:
-            self.alert_evaluator_thread.join(timeout=2)
+        for collector in self.collectors:
+            collector.close()
 
         # Cleanup alert manager
         if self.alert_manager:
@@ -226,109 +291,98 @@ class Agent:
 
         self.logger.info("Agent stopped")
 
-    def _run_collector_loop(self, collector: BaseCollector):
+        # Flush records still queued for the logging thread
+        stop_logger()
+
+    def _make_collector_task(self, collector: BaseCollector) -> Callable[[], None]:
         """
-        Run collector loop
+        Build the scheduled task that runs one collection and updates agent metrics
 
         Args:
             collector: Collector to run
-        """
-        collector_name = collector.get_name()
-        interval = collector.get_interval()
-
-        self.logger.debug(f"Starting collection loop for {collector_name} (interval: {interval}s)")
 
-        while self.running:
+        Returns:
+            Callable run by the scheduler once per collector interval
+        """
+        # Bind per-collector attributes once; the task runs every interval
+        name = collector.get_name()
+        run_collection = collector.run_collection
+        is_healthy = collector.is_healthy
+        update = self.exporter.update_agent_metrics
+        log_warn = self.logger.warning
+        log_error = self.logger.error
+
+        def run():
             try:
                 # Run collection
-                success = collector.run_collection()
+                run_collection()
 
                 # Update agent metrics
-                self.exporter.update_agent_metrics([collector])
+                update(collector)
 
                 # Check if collector is unhealthy
-                if not collector.is_healthy():
-                    self.logger.warning(
-                        f"{collector_name} collector is unhealthy "
-                        f"(failed {collector.error_count} consecutive times)"
+                if not is_healthy():
+                    log_warn(
+                        "%s collector is unhealthy (failed %s consecutive times)",
+                        name, collector.error_count
                     )
 
-                # Sleep until next collection
-                time.sleep(interval)
-
             except Exception as e:
-                self.logger.error(f"Error in {collector_name} collector loop: {e}", exc_info=True)
-                time.sleep(interval)
-
-    def _self_monitor_loop(self):
-        """Monitor agent's own resource usage"""
-        check_interval = self.config['resource_limits']['check_interval']
-        max_cpu = self.config['resource_limits']['max_cpu_percent']
-        max_memory_mb = self.config['resource_limits']['max_memory_mb']
-        action = self.config['resource_limits']['action_on_exceed']
-
-        # Get agent process
-        agent_process = psutil.Process(os.getpid())
+                log_error("Error running %s collector: %s", name, e, exc_info=True)
 
-        while self.running:
-            try:
-                # Measure CPU usage (over 1 second)
-                cpu_percent = agent_process.cpu_percent(interval=1.0)
-
-                # Measure memory usage
-                memory_info = agent_process.memory_info()
-                memory_mb = memory_info.rss / 1024 / 1024
-
-                self.logger.debug(f"Agent resource usage: CPU={cpu_percent:.2f}%, Memory={memory_mb:.2f}MB")
+        return run
 
-                # Check limits
-                if cpu_percent > max_cpu:
-                    self.logger.warning(
-                        f"Agent CPU usage ({cpu_percent:.2f}%) exceeds limit ({max_cpu}%)"
-                    )
-                    if action == 'stop':
-                        self.logger.error("Stopping agent due to CPU limit exceeded")
-                        self.stop()
-
-                if memory_mb > max_memory_mb:
-                    self.logger.warning(
-                        f"Agent memory usage ({memory_mb:.2f}MB) exceeds limit ({max_memory_mb}MB)"
-                    )
-                    if action == 'stop':
-                        self.logger.error("Stopping agent due to memory limit exceeded")
-                        self.stop()
+    def _self_monitor_check(self):
+        """Check agent's own resource usage against configured limits"""
+        limits = self.config['resource_limits']
+        max_cpu = limits['max_cpu_percent']
+        max_memory_mb = limits['max_memory_mb']
+        action = limits['action_on_exceed']
 
-                # Sleep until next check
-                time.sleep(check_interval)
-
-            except Exception as e:
-                self.logger.error(f"Error in self-monitoring: {e}")
-                time.sleep(check_interval)
-
-    def _run_alert_evaluator_loop(self):
-        """Run alert evaluator loop"""
-        interval = self.config['alerting']['evaluation_interval']
+        try:
+            # CPU usage since the last sample and current RSS (non-blocking),
+            # CPU normalized to a share of all usable cores
+            cpu_percent, rss = self.proc_sampler.sample()
+            cpu_percent /= self._n_cpu
+            memory_mb = rss / 1024 / 1024
+
+            self.logger.debug("Agent resource usage: CPU=%.2f%%, Memory=%.2fMB", cpu_percent, memory_mb)
+
+            # Check limits
+            if cpu_percent > max_cpu:
+                self.logger.warning(
+                    f"Agent CPU usage ({cpu_percent:.2f}%) exceeds limit ({max_cpu}%)"
+                )
+                if action == 'stop':
+                    self.logger.error("Stopping agent due to CPU limit exceeded")
+                    self.stop()
 
-        self.logger.debug(f"Starting alert evaluator loop (interval: {interval}s)")
+            if memory_mb > max_memory_mb:
+                self.logger.warning(
+                    f"Agent memory usage ({memory_mb:.2f}MB) exceeds limit ({max_memory_mb}MB)"
+                )
+                if action == 'stop':
+                    self.logger.error("Stopping agent due to memory limit exceeded")
+                    self.stop()
 
-        while self.running:
-            try:
-                # Evaluate all rules
-                self.alert_evaluator.evaluate_all_rules()
+        except Exception as e:
+            self.logger.error("Error in self-monitoring: %s", e)
 
-                # Cleanup old alerts (every 100 evaluations)
-                if hasattr(self, '_alert_cleanup_counter'):
-                    self._alert_cleanup_counter += 1
-                else:
-                    self._alert_cleanup_counter = 0
+    def _run_alert_evaluation(self):
+        """Evaluate alert rules once and periodically cleanup old alerts"""
+        alert_evaluator = self.alert_evaluator
+        alert_manager = self.alert_manager
 
-                if self._alert_cleanup_counter >= 100:
-                    self.alert_manager.cleanup_old_alerts()
-                    self._alert_cleanup_counter = 0
+        try:
+            # Evaluate all rules
+            alert_evaluator.evaluate_all_rules()
 
-                # Sleep until next evaluation
-                time.sleep(interval)
+            # Cleanup old alerts (every 100 evaluations)
+            counter = self._alert_cleanup_counter + 1
+            if counter >= 100:
+                alert_manager.cleanup_old_alerts()
+                counter = 0
+            self._alert_cleanup_counter = counter
 
-            except Exception as e:
-                self.logger.error(f"Error in alert evaluator loop: {e}", exc_info=True)
-                time.sleep(interval)
+        except Exception as e:
+            self.logger.error("Error in alert evaluation: %s", e, exc_info=True)
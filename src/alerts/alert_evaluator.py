@@ -3,21 +3,52 @@ Alert evaluator for checking rule conditions against metrics.
 """
 
 import logging
-from typing import List
+from collections import defaultdict
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, NamedTuple, Tuple
 from prometheus_client import CollectorRegistry
 
-from src.alerts.alert_rule import AlertRule
+from src.alerts.alert_rule import AlertRule, _OPS
 from src.alerts.alert_manager import AlertManager
 from src.utils.metric_reader import MetricReader
 
 logger = logging.getLogger(__name__)
 
 
+class FiringAlert(NamedTuple):
+    """A sample whose rule condition is met"""
+    rule: AlertRule
+    value: float
+    labels: Dict[str, str]
+
+
+def _compile_condition(rule: AlertRule) -> Callable[[float], bool]:
+    """
+    Build a condition function specialized for one rule.
+
+    The operator is inlined as a comparison and the threshold is bound as a
+    default argument, avoiding the attribute lookups and call of the generic
+    path. Changes to the rule after compilation are not picked up.
+
+    Args:
+        rule: Alert rule with a validated operator and numeric threshold
+
+    Returns:
+        Function returning True when a value meets the rule's condition
+    """
+    # Only ever inline one of the known comparison operators
+    if rule.operator not in _OPS:
+        raise ValueError(f"Invalid operator: {rule.operator}")
+    source = f"def check(value, threshold=threshold):\n    return value {rule.operator} threshold\n"
+    namespace: Dict[str, Any] = {'threshold': rule.threshold}
+    exec(compile(source, f"<alert rule {rule.name}>", 'exec'), namespace)
+    return namespace['check']
+
+
 class AlertEvaluator:
     """Evaluates alert rules against current metrics"""
 
     def __init__(self, rules: List[AlertRule], registry: CollectorRegistry,
-                 alert_manager: AlertManager):
+                 alert_manager: AlertManager, codegen: bool = False):
         """
         Initialize alert evaluator.
 
@@ -25,54 +56,163 @@ class AlertEvaluator:
             rules: List of alert rules to evaluate
             registry: Prometheus CollectorRegistry for reading metrics
             alert_manager: AlertManager for processing alerts
+            codegen: Compile a specialized condition function per rule with
+                the operator inlined and the threshold bound as a local
         """
         self.rules = rules
         self.metric_reader = MetricReader(registry)
         self.alert_manager = alert_manager
+        self.codegen = codegen
+
+        # Enabled rules and the same rules grouped by metric name,
+        # kept in sync by the mutators below
+        self._enabled_rules: List[AlertRule] = []
+        self._rules_by_metric: Dict[str, List[AlertRule]] = {}
+        self._compiled_conditions: Dict[int, Callable[[float], bool]] = {}
+        self._rebuild_rule_index()
 
         logger.info(f"Alert evaluator initialized with {len(rules)} rules")
 
+    def _rebuild_rule_index(self) -> None:
+        """Rebuild the enabled-rule list and per-metric grouping"""
+        self._enabled_rules = [r for r in self.rules if r.enabled]
+
+        rules_by_metric = defaultdict(list)
+        for rule in self._enabled_rules:
+            rules_by_metric[rule.metric_name].append(rule)
+        self._rules_by_metric = dict(rules_by_metric)
+
+        if self.codegen:
+            self._compiled_conditions = {
+                id(rule): _compile_condition(rule) for rule in self._enabled_rules
+            }
+
     def evaluate_all_rules(self) -> None:
         """Evaluate all enabled rules against current metrics"""
-        for rule in self.rules:
-            if not rule.enabled:
-                logger.debug(f"Skipping disabled rule: {rule.name}")
-                continue
-
+        for rule, metric_values in self._iter_rule_values():
             try:
-                self._evaluate_rule(rule)
+                firing, clear = self._compute_firings(rule, metric_values)
+                self._dispatch(rule, firing, clear)
             except Exception as e:
-                logger.error(f"Error evaluating rule {rule.name}: {e}", exc_info=True)
+                logger.error("Error evaluating rule %s: %s", rule.name, e, exc_info=True)
+
+    def run_once(self) -> List[FiringAlert]:
+        """
+        Evaluate all enabled rules once without notifying the alert manager.
 
-    def _evaluate_rule(self, rule: AlertRule) -> None:
+        Useful for tests and benchmarks that need evaluation results without
+        the scheduler or the manager's side effects.
+
+        Returns:
+            Samples whose rule condition is currently met
+        """
+        firings: List[FiringAlert] = []
+        for rule, metric_values in self._iter_rule_values():
+            firing, _ = self._compute_firings(rule, metric_values)
+            firings.extend(FiringAlert(rule, value, labels) for value, labels in firing)
+        return firings
+
+    def _iter_rule_values(self) -> Iterator[Tuple[AlertRule, List[Tuple[float, Dict[str, str]]]]]:
         """
-        Evaluate a single rule.
+        Yield each enabled rule with the samples matching its label selector.
+
+        Yields:
+            Tuples of (rule, matching (value, labels) samples)
+        """
+        # Filtered views for this tick only, so rules sharing a metric and
+        # label selector filter the series once; dropped after the tick
+        tick_cache: Dict[Tuple[str, FrozenSet], List[Tuple[float, Dict[str, str]]]] = {}
+
+        # One registry collect per tick, shared by every metric read below
+        self.metric_reader.invalidate()
+
+        # Read each metric once and share its series across rules
+        for metric_name, rules in self._rules_by_metric.items():
+            series = self.metric_reader.get_all_series(metric_name)
+
+            for rule in rules:
+                key = (metric_name, frozenset(rule.label_selector.items()))
+                metric_values = tick_cache.get(key)
+                if metric_values is None:
+                    metric_values = self._filter_series(series, rule.label_selector)
+                    tick_cache[key] = metric_values
+
+                yield rule, metric_values
+
+    @staticmethod
+    def _filter_series(series: List[Tuple[float, Dict[str, str]]],
+                       selector: Dict[str, str]) -> List[Tuple[float, Dict[str, str]]]:
+        """
+        Filter series by a label selector.
+
+        Args:
+            series: (value, labels) samples of a metric
+            selector: Labels a sample must have to match
+
+        Returns:
+            Matching samples (the input list itself if selector is empty)
+        """
+        if not selector:
+            return series
+        selector_items = selector.items()
+        return [
+            (value, labels) for value, labels in series
+            if selector_items <= labels.items()
+        ]
+
+    def _compute_firings(self, rule: AlertRule,
+                         metric_values: List[Tuple[float, Dict[str, str]]]
+                         ) -> Tuple[List[Tuple[float, Dict[str, str]]], List[Dict[str, str]]]:
+        """
+        Split a rule's samples by whether its condition is met.
 
         Args:
             rule: Alert rule to evaluate
+            metric_values: (value, labels) samples matching the rule's selector
+
+        Returns:
+            Tuple of (firing (value, labels) samples, labels of clear samples)
         """
-        # Read metric values
-        metric_values = self.metric_reader.get_metric_value(
-            rule.metric_name,
-            rule.label_selector
-        )
+        check = self._compiled_conditions.get(id(rule))
 
-        if not metric_values:
-            logger.debug(f"No metric values found for rule {rule.name} (metric: {rule.metric_name})")
+        firing = []
+        clear = []
+        for value, labels in metric_values:
+            if check(value) if check is not None else self._evaluate_condition(rule, value):
+                firing.append((value, labels))
+            else:
+                clear.append(labels)
+        return firing, clear
+
+    def _dispatch(self, rule: AlertRule, firing: List[Tuple[float, Dict[str, str]]],
+                  clear: List[Dict[str, str]]) -> None:
+        """
+        Hand a rule's evaluation results to the alert manager.
+
+        Args:
+            rule: Evaluated alert rule
+            firing: (value, labels) samples whose condition is met
+            clear: Labels of samples whose condition is not met
+        """
+        if not firing and not clear:
+            logger.debug("No metric values found for rule %s (metric: %s)",
+                         rule.name, rule.metric_name)
             return
 
-        # Evaluate condition for each label combination
-        for value, labels in metric_values:
-            condition_met = self._evaluate_condition(rule, value)
+        # Checked once per rule so the per-sample loops skip log calls
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-            if condition_met:
-                # Alert condition is true
-                logger.debug(f"Rule {rule.name} condition met: {value} {rule.operator} {rule.threshold}")
-                self.alert_manager.process_alert(rule, value, labels)
-            else:
-                # Alert condition is false - check if we should resolve
-                logger.debug(f"Rule {rule.name} condition not met: {value} {rule.operator} {rule.threshold}")
-                self.alert_manager.resolve_alert(rule, labels)
+        for value, labels in firing:
+            if debug:
+                logger.debug("Rule %s condition met: %s %s %s",
+                             rule.name, value, rule.operator, rule.threshold)
+            self.alert_manager.process_alert(rule, value, labels)
+
+        # Condition is false - resolve any active alert for these labels
+        for labels in clear:
+            if debug:
+                logger.debug("Rule %s condition not met for %s", rule.name, labels)
+            self.alert_manager.resolve_alert(rule, labels)
 
     def _evaluate_condition(self, rule: AlertRule, value: float) -> bool:
         """
@@ -85,25 +225,8 @@ class AlertEvaluator:
         Returns:
             True if condition is met, False otherwise
         """
-        operators = {
-            '>': lambda v, t: v > t,
-            '<': lambda v, t: v < t,
-            '>=': lambda v, t: v >= t,
-            '<=': lambda v, t: v <= t,
-            '==': lambda v, t: v == t,
-            '!=': lambda v, t: v != t,
-        }
-
-        operator_func = operators.get(rule.operator)
-        if not operator_func:
-            logger.error(f"Unknown operator: {rule.operator}")
-            return False
-
-        try:
-            return operator_func(value, rule.threshold)
-        except Exception as e:
-            logger.error(f"Error evaluating condition for rule {rule.name}: {e}")
-            return False
+        # Operator and numeric threshold were validated when the rule was created
+        return rule._op_fn(value, rule.threshold)
 
     def add_rule(self, rule: AlertRule) -> None:
         """
@@ -113,6 +236,7 @@ class AlertEvaluator:
             rule: Alert rule to add
         """
         self.rules.append(rule)
+        self._rebuild_rule_index()
         logger.info(f"Added new alert rule: {rule.name}")
 
     def remove_rule(self, rule_name: str) -> bool:
@@ -128,16 +252,38 @@ class AlertEvaluator:
         for i, rule in enumerate(self.rules):
             if rule.name == rule_name:
                 del self.rules[i]
+                self._rebuild_rule_index()
                 logger.info(f"Removed alert rule: {rule_name}")
                 return True
 
         logger.warning(f"Rule not found: {rule_name}")
         return False
 
+    def set_rule_enabled(self, rule_name: str, enabled: bool) -> bool:
+        """
+        Enable or disable a rule by name.
+
+        Args:
+            rule_name: Name of rule to update
+            enabled: New enabled state
+
+        Returns:
+            True if rule was found, False otherwise
+        """
+        for rule in self.rules:
+            if rule.name == rule_name:
+                rule.enabled = enabled
+                self._rebuild_rule_index()
+                logger.info(f"Alert rule {rule_name} {'enabled' if enabled else 'disabled'}")
+                return True
+
+        logger.warning(f"Rule not found: {rule_name}")
+        return False
+
     def get_rule_count(self) -> int:
         """Get total number of rules"""
         return len(self.rules)
 
     def get_enabled_rule_count(self) -> int:
         """Get number of enabled rules"""
-        return sum(1 for rule in self.rules if rule.enabled)
+        return len(self._enabled_rules)
@@ -3,54 +3,170 @@ Alert manager for tracking alert state and sending notifications.
 """
 
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List
-from collections import defaultdict
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional, List, Set, Tuple
 
 from src.alerts.alert_rule import AlertRule
 from src.alerts.storage.base_storage import BaseStorage, Alert, AlertState
 
 logger = logging.getLogger(__name__)
 
+# Maximum seconds to wait for all channels to finish sending one notification
+NOTIFICATION_TIMEOUT_SECONDS = 15
+
+# Buffered storage writes are flushed when this many are pending, or at
+# least every WRITE_FLUSH_INTERVAL_SECONDS
+WRITE_BUFFER_MAX_SIZE = 64
+WRITE_FLUSH_INTERVAL_SECONDS = 2.0
+
+# Maximum notifications waiting for the notification worker
+NOTIFICATION_QUEUE_SIZE = 10_000
+
+
+class NotificationJob(NamedTuple):
+    """Snapshot of an alert to notify about"""
+    alert_id: str
+    rule: AlertRule
+    metric_value: float
+    labels: Dict[str, str]
+    # Not 'count', which would shadow tuple.count()
+    occurrences: int
+
 
 class AlertTracker:
     """Tracks state for individual alert instance"""
 
-    def __init__(self, alert_id: str, rule: AlertRule, metric_value: float, labels: Dict[str, str]):
+    # Many trackers may be alive at once; slots avoid a per-instance dict
+    __slots__ = (
+        'alert_id', 'rule', 'first_triggered_at', 'last_notified_at',
+        'last_value', 'labels', 'state', 'notification_count',
+        '_first_mono', '_last_triggered_mono', '_last_notified_mono',
+        '_for_seconds', '_cooldown_seconds', 'count', 'last_sample_bucket',
+        '_snapshot',
+    )
+
+    def __init__(self, alert_id: str, rule: AlertRule, metric_value: float,
+                 labels: Dict[str, str], now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
         self.alert_id = alert_id
         self.rule = rule
-        self.first_triggered_at = datetime.now()
-        self.last_triggered_at = datetime.now()
-        self.last_notified_at: Optional[datetime] = None
         self.last_value = metric_value
         self.labels = labels
         self.state = AlertState.TRIGGERED
         self.notification_count = 0
 
-    def update(self, metric_value: float):
-        """Update tracker with new metric value"""
-        self.last_triggered_at = datetime.now()
-        self.last_value = metric_value
+        # Wall-clock times are kept for storage only; duration and cooldown
+        # checks use monotonic seconds, unaffected by clock adjustments
+        self.first_triggered_at = datetime.now()
+        self.last_notified_at: Optional[datetime] = None
+        self._first_mono = now
+        self._last_triggered_mono = now
+        self._last_notified_mono: Optional[float] = None
 
-    def should_notify(self) -> bool:
-        """Check if notification should be sent based on duration and cooldown"""
-        now = datetime.now()
+        # Rule durations converted once rather than on every check
+        self._for_seconds = rule.for_duration_minutes * 60
+        self._cooldown_seconds = rule.cooldown_minutes * 60
+
+        # Number of samples seen while firing, and the last value rounded
+        # to the precision used for duplicate detection
+        self.count = 1
+        self.last_sample_bucket = round(metric_value, 2)
+
+        # Last storage record built by to_alert()
+        self._snapshot: Optional[Alert] = None
+
+    @classmethod
+    def _from_row(cls, alert: Alert, rule: AlertRule, now: float,
+                  wall_now: datetime) -> 'AlertTracker':
+        """
+        Rebuild a tracker from a stored alert without __init__'s clock reads.
+
+        Args:
+            alert: Stored active alert
+            rule: Rule the alert belongs to
+            now: Current monotonic time
+            wall_now: Current wall-clock time, used to age stored timestamps
 
-        # Check duration requirement
-        duration_met = (now - self.first_triggered_at) >= timedelta(minutes=self.rule.for_duration_minutes)
-        if not duration_met:
-            return False
+        Returns:
+            Restored tracker
+        """
+        tracker = cls.__new__(cls)
+        tracker.alert_id = alert.alert_id
+        tracker.rule = rule
+        tracker.last_value = alert.metric_value
+        tracker.labels = alert.labels
+        tracker.state = alert.state
+        tracker.notification_count = alert.notification_count
+        tracker.first_triggered_at = alert.triggered_at
+        tracker.last_notified_at = alert.last_notified_at
+
+        # Map stored wall-clock times onto the monotonic clock by their age
+        tracker._first_mono = now - (wall_now - alert.triggered_at).total_seconds()
+        tracker._last_triggered_mono = now
+        tracker._last_notified_mono = (
+            now - (wall_now - alert.last_notified_at).total_seconds()
+            if alert.last_notified_at else None
+        )
+
+        tracker._for_seconds = rule.for_duration_minutes * 60
+        tracker._cooldown_seconds = rule.cooldown_minutes * 60
+        tracker.count = 1
+        tracker.last_sample_bucket = round(alert.metric_value, 2)
+        tracker._snapshot = alert
+        return tracker
+
+    def to_alert(self) -> Alert:
+        """Snapshot the tracker as a storage record"""
+        rule = self.rule
+        alert = Alert(
+            alert_id=self.alert_id,
+            rule_name=rule.name,
+            state=self.state,
+            severity=rule.severity,
+            metric_name=rule.metric_name,
+            metric_value=self.last_value,
+            threshold=rule.threshold,
+            triggered_at=self.first_triggered_at,
+            labels=self.labels,
+            annotations=rule.annotations,
+            last_notified_at=self.last_notified_at,
+            notification_count=self.notification_count,
+        )
+
+        # Reuse the JSON of an earlier snapshot built from the same dicts
+        snapshot = self._snapshot
+        if snapshot is not None:
+            if snapshot.labels is alert.labels:
+                alert._labels_json = snapshot._labels_json
+            if snapshot.annotations is alert.annotations:
+                alert._annotations_json = snapshot._annotations_json
+        self._snapshot = alert
+        return alert
+
+    def update(self, metric_value: float, now: Optional[float] = None):
+        """Update tracker with new metric value"""
+        self._last_triggered_mono = time.monotonic() if now is None else now
+        self.last_value = metric_value
+        self.last_sample_bucket = round(metric_value, 2)
+        self.count += 1
 
-        # Check cooldown
-        if self.last_notified_at:
-            cooldown_met = (now - self.last_notified_at) >= timedelta(minutes=self.rule.cooldown_minutes)
-            if not cooldown_met:
-                return False
+    def in_cooldown(self, now: float) -> bool:
+        """Check if a notification was sent less than the cooldown ago (monotonic seconds)"""
+        return (self._last_notified_mono is not None
+                and (now - self._last_notified_mono) < self._cooldown_seconds)
 
-        return True
+    def should_notify(self, now: Optional[float] = None) -> bool:
+        """Check if notification should be sent based on duration and cooldown"""
+        now = time.monotonic() if now is None else now
+        return (now - self._first_mono) >= self._for_seconds and not self.in_cooldown(now)
 
     def mark_notified(self):
         """Mark alert as notified"""
+        self._last_notified_mono = time.monotonic()
         self.last_notified_at = datetime.now()
         self.state = AlertState.ACTIVE
         self.notification_count += 1
@@ -59,13 +175,15 @@ class AlertTracker:
 class AlertManager:
     """Manages alert lifecycle and notifications"""
 
-    def __init__(self, config: Dict, storage: BaseStorage):
+    def __init__(self, config: Dict, storage: BaseStorage,
+                 rules: Optional[List[AlertRule]] = None):
         """
         Initialize alert manager.
 
         Args:
             config: Alerting configuration dict
             storage: Storage backend for alert history
+            rules: Loaded alert rules, used to restore active alerts from storage
         """
         self.config = config
         self.storage = storage
@@ -73,11 +191,43 @@ class AlertManager:
         # In-memory tracking of active alerts
         self.alert_trackers: Dict[str, AlertTracker] = {}
 
+        # Active alert IDs grouped by severity and by rule name, kept in
+        # step with alert_trackers by _index/_unindex
+        self._by_severity: Dict[str, Set[str]] = {}
+        self._by_rule: Dict[str, Set[str]] = {}
+
         # Initialize notification channels
         self.channels = self._init_channels()
 
+        # Channels are sent to concurrently so a notification costs the
+        # slowest channel's round-trip rather than the sum of all of them
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(4, len(self.channels)),
+            thread_name_prefix="alert-notify"
+        )
+
+        # Notifications are sent by a worker thread so slow channels never
+        # block alert evaluation
+        self._notif_q: queue.Queue = queue.Queue(maxsize=NOTIFICATION_QUEUE_SIZE)
+        self.dropped_notifications = 0
+        self._notif_thread = threading.Thread(
+            target=self._notif_worker, daemon=True, name="alert-notifier"
+        )
+        self._notif_thread.start()
+
+        # Storage writes are buffered as (op, args) in call order and
+        # flushed in batches by a background thread
+        self._write_buf: List[Tuple[str, Any]] = []
+        self._buf_lock = threading.Lock()
+        self._flush_wakeup = threading.Event()
+        self._flush_stop = threading.Event()
+        self._flush_thread = threading.Thread(
+            target=self._flush_loop, daemon=True, name="alert-storage-flush"
+        )
+        self._flush_thread.start()
+
         # Load active alerts from storage
-        self._restore_active_alerts()
+        self._restore_active_alerts(rules or [])
 
         logger.info("Alert manager initialized")
 
@@ -93,7 +243,7 @@ class AlertManager:
                 channels['email'] = EmailChannel(channel_config['email'])
                 logger.info("Email channel initialized")
             except Exception as e:
-                logger.error(f"Failed to initialize email channel: {e}")
+                logger.error("Failed to initialize email channel: %s", e)
 
         if channel_config.get('slack', {}).get('enabled', False):
             try:
@@ -101,7 +251,7 @@ class AlertManager:
                 channels['slack'] = SlackChannel(channel_config['slack'])
                 logger.info("Slack channel initialized")
             except Exception as e:
-                logger.error(f"Failed to initialize slack channel: {e}")
+                logger.error("Failed to initialize slack channel: %s", e)
 
         if channel_config.get('webhook', {}).get('enabled', False):
             try:
@@ -109,24 +259,42 @@ class AlertManager:
                 channels['webhook'] = WebhookChannel(channel_config['webhook'])
                 logger.info("Webhook channel initialized")
             except Exception as e:
-                logger.error(f"Failed to initialize webhook channel: {e}")
+                logger.error("Failed to initialize webhook channel: %s", e)
 
         if not channels:
             logger.warning("No notification channels enabled")
 
         return channels
 
-    def _restore_active_alerts(self):
-        """Restore active alert trackers from storage"""
-        try:
-            active_alerts = self.storage.get_active_alerts()
-            logger.info(f"Restoring {len(active_alerts)} active alerts from storage")
+    def _restore_active_alerts(self, rules: List[AlertRule]):
+        """
+        Restore active alert trackers from storage.
 
-            # Note: Full restoration would require rule objects, which we don't have here
-            # This is a simplified version - in production, you might want to store
-            # rule definitions in the database as well
+        Args:
+            rules: Loaded alert rules; alerts whose rule is no longer
+                loaded stay in storage but are not tracked
+        """
+        try:
+            rule_index = {rule.name: rule for rule in rules}
+            now = time.monotonic()
+            wall_now = datetime.now()
+
+            # Rows stream newest first; keep the first row seen if an alert
+            # ID appears more than once
+            trackers = {}
+            stored = 0
+            for alert in self.storage.iter_active_alerts():
+                stored += 1
+                rule = rule_index.get(alert.rule_name)
+                if rule is not None and alert.alert_id not in trackers:
+                    trackers[alert.alert_id] = AlertTracker._from_row(alert, rule, now, wall_now)
+            self.alert_trackers.update(trackers)
+            for tracker in trackers.values():
+                self._index(tracker)
+
+            logger.info("Restored %s of %s active alerts from storage", len(trackers), stored)
         except Exception as e:
-            logger.error(f"Failed to restore active alerts: {e}")
+            logger.error("Failed to restore active alerts: %s", e)
 
     def process_alert(self, rule: AlertRule, metric_value: float, labels: Dict[str, str]) -> None:
         """
@@ -138,36 +306,34 @@ class AlertManager:
             labels: Metric labels
         """
         alert_id = rule.generate_alert_id(labels)
+        now = time.monotonic()
 
         # Get or create tracker
         if alert_id not in self.alert_trackers:
             # New alert triggered
-            tracker = AlertTracker(alert_id, rule, metric_value, labels)
+            tracker = AlertTracker(alert_id, rule, metric_value, labels, now)
             self.alert_trackers[alert_id] = tracker
+            self._index(tracker)
 
             # Save to storage
-            alert = Alert(
-                alert_id=alert_id,
-                rule_name=rule.name,
-                state=AlertState.TRIGGERED,
-                severity=rule.severity,
-                metric_name=rule.metric_name,
-                metric_value=metric_value,
-                threshold=rule.threshold,
-                triggered_at=tracker.first_triggered_at,
-                labels=labels,
-                annotations=rule.annotations,
-            )
-            self.storage.save_alert(alert)
-
-            logger.info(f"Alert triggered: {alert_id} ({rule.name})")
+            self._enqueue_write('upsert', tracker.to_alert())
+
+            logger.info("Alert triggered: %s (%s)", alert_id, rule.name)
         else:
-            # Update existing tracker
             tracker = self.alert_trackers[alert_id]
-            tracker.update(metric_value)
+
+            # Same value as last sample and still in cooldown: nothing to
+            # notify or persist, only count the occurrence
+            if tracker.last_sample_bucket == round(metric_value, 2) and tracker.in_cooldown(now):
+                tracker.count += 1
+                tracker._last_triggered_mono = now
+                return
+
+            # Update existing tracker
+            tracker.update(metric_value, now)
 
         # Check if we should send notification
-        if tracker.should_notify():
+        if tracker.should_notify(now):
             self._send_notifications(tracker)
 
     def resolve_alert(self, rule: AlertRule, labels: Dict[str, str]) -> None:
@@ -184,16 +350,13 @@ class AlertManager:
             tracker = self.alert_trackers[alert_id]
 
             # Update storage
-            self.storage.update_alert_state(
-                alert_id,
-                AlertState.RESOLVED,
-                resolved_at=datetime.now()
-            )
+            self._enqueue_write('state', (alert_id, AlertState.RESOLVED, datetime.now()))
 
             # Remove from tracking
             del self.alert_trackers[alert_id]
+            self._unindex(tracker)
 
-            logger.info(f"Alert resolved: {alert_id} ({rule.name})")
+            logger.info("Alert resolved: %s (%s)", alert_id, rule.name)
 
             # Optionally send resolution notification
             if self.config.get('send_resolved_notifications', False):
@@ -201,42 +364,142 @@ class AlertManager:
 
     def _send_notifications(self, tracker: AlertTracker) -> None:
         """
-        Send notifications through configured channels.
+        Queue notifications for the notification worker.
+
+        The tracker is marked notified right away so later samples respect
+        the cooldown while the send is still pending.
 
         Args:
             tracker: Alert tracker with notification details
         """
-        rule = tracker.rule
-        metric_value = tracker.last_value
-        labels = tracker.labels
+        job = NotificationJob(
+            alert_id=tracker.alert_id,
+            rule=tracker.rule,
+            metric_value=tracker.last_value,
+            labels=tracker.labels,
+            occurrences=tracker.count,
+        )
+        try:
+            self._notif_q.put_nowait(job)
+        except queue.Full:
+            self.dropped_notifications += 1
+            logger.warning("Notification queue full, dropping notification for %s", tracker.alert_id)
+
+        # Update tracker and storage (state, time and count in one write)
+        tracker.mark_notified()
+        self._enqueue_write('upsert', tracker.to_alert())
 
-        logger.info(f"Sending notifications for alert: {tracker.alert_id}")
+    def _notif_worker(self) -> None:
+        """Send queued notifications until the shutdown sentinel arrives"""
+        while True:
+            job = self._notif_q.get()
+            try:
+                if job is None:
+                    return
+                self._dispatch_notification(job)
+            except Exception as e:
+                logger.error("Error dispatching notification: %s", e, exc_info=True)
+            finally:
+                self._notif_q.task_done()
+
+    def _dispatch_notification(self, job: 'NotificationJob') -> None:
+        """
+        Send one notification through the rule's channels concurrently.
+
+        Args:
+            job: Queued notification
+        """
+        logger.info("Sending notifications for alert: %s", job.alert_id)
 
-        # Send through each configured channel
-        for channel_name in rule.channels:
+        futures = {}
+        for channel_name in job.rule.channels:
             channel = self.channels.get(channel_name)
             if not channel:
-                logger.warning(f"Channel {channel_name} not available")
+                logger.warning("Channel %s not available", channel_name)
                 continue
+            futures[self._pool.submit(channel.send, job.rule, job.metric_value, job.labels,
+                                      count=job.occurrences)] = channel_name
 
-            try:
-                success = channel.send(rule, metric_value, labels)
-                if success:
-                    logger.info(f"Sent notification via {channel_name} for {tracker.alert_id}")
-                else:
-                    logger.error(f"Failed to send notification via {channel_name}")
-            except Exception as e:
-                logger.error(f"Error sending notification via {channel_name}: {e}")
+        try:
+            for future in as_completed(futures, timeout=NOTIFICATION_TIMEOUT_SECONDS):
+                channel_name = futures[future]
+                try:
+                    if future.result():
+                        logger.info("Sent notification via %s for %s", channel_name, job.alert_id)
+                    else:
+                        logger.error("Failed to send notification via %s", channel_name)
+                except Exception as e:
+                    logger.error("Error sending notification via %s: %s", channel_name, e)
+        except FuturesTimeoutError:
+            pending = [name for future, name in futures.items() if not future.done()]
+            logger.error("Timed out waiting for notification channels: %s", ', '.join(pending))
+
+    def _enqueue_write(self, op: str, args: Any) -> None:
+        """
+        Buffer a storage write for the flush thread.
 
-        # Update tracker and storage
-        tracker.mark_notified()
-        self.storage.update_notification_info(tracker.alert_id, tracker.last_notified_at)
-        self.storage.update_alert_state(tracker.alert_id, AlertState.ACTIVE)
+        Args:
+            op: 'upsert' (args: Alert snapshot) or 'state' (args:
+                (alert_id, state, resolved_at))
+            args: Arguments of the write
+        """
+        with self._buf_lock:
+            self._write_buf.append((op, args))
+            full = len(self._write_buf) >= WRITE_BUFFER_MAX_SIZE
+        if full:
+            self._flush_wakeup.set()
+
+    def _flush_loop(self) -> None:
+        """Flush buffered writes periodically, or early when the buffer fills"""
+        while not self._flush_stop.is_set():
+            self._flush_wakeup.wait(timeout=WRITE_FLUSH_INTERVAL_SECONDS)
+            self._flush_wakeup.clear()
+            self._flush_buffer()
+
+    def _flush_buffer(self) -> None:
+        """Write all buffered operations to storage in batches"""
+        with self._buf_lock:
+            pending, self._write_buf = self._write_buf, []
+        if not pending:
+            return
+
+        # Within a batch, upserts run before state updates, and only the
+        # latest snapshot of each alert is written. A resolve must land
+        # before the row of a re-triggered alert is inserted, so an upsert
+        # for an ID resolved earlier in the batch starts a new one.
+        upserts: Dict[str, Alert] = {}
+        states: List[Tuple[str, str, Optional[datetime]]] = []
+        resolved_ids: Set[str] = set()
+
+        for op, args in pending:
+            if op == 'upsert':
+                if args.alert_id in resolved_ids:
+                    self._write_batch(upserts, states)
+                    upserts, states = {}, []
+                    resolved_ids.clear()
+                upserts[args.alert_id] = args
+            else:
+                states.append(args)
+                resolved_ids.add(args[0])
+
+        self._write_batch(upserts, states)
+
+    def _write_batch(self, upserts: Dict[str, Alert],
+                     states: List[Tuple[str, str, Optional[datetime]]]) -> None:
+        """Write one batch of buffered operations, logging storage errors"""
+        try:
+            if upserts:
+                self.storage.upsert_alerts(list(upserts.values()))
+            if states:
+                self.storage.update_states_bulk(states)
+        except Exception as e:
+            logger.error("Failed to flush alert writes to storage: %s", e)
 
     def _send_resolution_notifications(self, tracker: AlertTracker) -> None:
         """Send resolution notifications"""
         # Implementation for resolution notifications
-        logger.debug(f"Resolution notification for {tracker.alert_id} (not implemented)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Resolution notification for %s (not implemented)", tracker.alert_id)
 
     def get_active_alert_count(self) -> int:
         """Get count of currently active alerts"""
@@ -244,10 +507,26 @@ class AlertManager:
 
     def get_alerts_by_severity(self) -> Dict[str, int]:
         """Get active alert counts by severity"""
-        severity_counts = defaultdict(int)
-        for tracker in self.alert_trackers.values():
-            severity_counts[tracker.rule.severity] += 1
-        return dict(severity_counts)
+        return {severity: len(ids) for severity, ids in self._by_severity.items()}
+
+    def get_alerts_by_rule(self) -> Dict[str, int]:
+        """Get active alert counts by rule name"""
+        return {rule_name: len(ids) for rule_name, ids in self._by_rule.items()}
+
+    def _index(self, tracker: AlertTracker) -> None:
+        """Add a tracker to the severity and rule indices"""
+        self._by_severity.setdefault(tracker.rule.severity, set()).add(tracker.alert_id)
+        self._by_rule.setdefault(tracker.rule.name, set()).add(tracker.alert_id)
+
+    def _unindex(self, tracker: AlertTracker) -> None:
+        """Remove a tracker from the severity and rule indices"""
+        for index, key in ((self._by_severity, tracker.rule.severity),
+                           (self._by_rule, tracker.rule.name)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(tracker.alert_id)
+                if not ids:
+                    del index[key]
 
     def cleanup_old_alerts(self) -> None:
         """Cleanup old resolved alerts from storage"""
@@ -255,16 +534,39 @@ class AlertManager:
             retention_days = self.storage.retention_days
             deleted_count = self.storage.cleanup_old_alerts(retention_days)
             if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} old alerts")
+                logger.info("Cleaned up %s old alerts", deleted_count)
         except Exception as e:
-            logger.error(f"Failed to cleanup old alerts: {e}")
+            logger.error("Failed to cleanup old alerts: %s", e)
 
     def shutdown(self) -> None:
         """Shutdown alert manager and cleanup resources"""
         logger.info("Shutting down alert manager")
 
+        # Let the worker drain queued notifications, then stop the senders
+        try:
+            self._notif_q.put(None, timeout=1)
+        except queue.Full:
+            logger.warning("Notification queue full at shutdown, pending notifications dropped")
+        self._notif_thread.join(timeout=NOTIFICATION_TIMEOUT_SECONDS)
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+        # Close channel connections
+        for channel_name, channel in self.channels.items():
+            try:
+                channel.close()
+            except Exception as e:
+                logger.error("Error closing %s channel: %s", channel_name, e)
+
+        # Stop the flush thread and write out anything still buffered
+        self._flush_stop.set()
+        self._flush_wakeup.set()
+        self._flush_thread.join(timeout=5)
+        self._flush_buffer()
+
         # Close storage
         self.storage.close()
 
         # Clear trackers
         self.alert_trackers.clear()
+        self._by_severity.clear()
+        self._by_rule.clear()
@@ -2,13 +2,56 @@
 Alert rule data structures and loading utilities.
 """
 
+import copy
+import os
 import yaml
+import operator
+from collections import OrderedDict
+from functools import lru_cache
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed C parser; it is much faster on large rule files
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+    logger.warning("libyaml not available, using the pure-Python YAML loader "
+                   "(install libyaml and reinstall pyyaml for faster rule loading)")
+
+# Comparison operator -> C-implemented comparison function
+_OPS = {
+    '>': operator.gt,
+    '<': operator.lt,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+# Parsed rule files by path -> (st_mtime_ns, st_size, rules), least recently
+# used first
+_RULES_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+RULES_CACHE_SIZE = 64
+
+# Notification color per severity (Slack attachments, email headers)
+SEVERITY_COLORS = {
+    'info': '#0066cc',
+    'warning': '#ff9900',
+    'critical': '#cc0000',
+}
+
+
+@lru_cache(maxsize=4096)
+def _alert_id(name: str, label_items: tuple) -> str:
+    """Build an alert ID from a rule name and sorted label items (cached)"""
+    if not label_items:
+        return name
+    return name + "_" + "_".join([k + "=" + str(v) for k, v in label_items])
+
 
 @dataclass
 class AlertRule:
@@ -29,15 +72,26 @@ class AlertRule:
 
     def __post_init__(self):
         """Validate rule configuration"""
-        # Validate operator
-        valid_operators = ['>', '<', '>=', '<=', '==', '!=']
-        if self.operator not in valid_operators:
-            raise ValueError(f"Invalid operator: {self.operator}. Must be one of {valid_operators}")
+        # Validate operator and bind its comparison function once
+        if self.operator not in _OPS:
+            raise ValueError(f"Invalid operator: {self.operator}. Must be one of {list(_OPS)}")
+        self._op_fn = _OPS[self.operator]
+
+        # Coerce threshold once so evaluation always compares numbers
+        try:
+            self.threshold = float(self.threshold)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid threshold: {self.threshold!r}. Must be a number")
 
         # Validate severity
         valid_severities = ['info', 'warning', 'critical']
         if self.severity not in valid_severities:
             raise ValueError(f"Invalid severity: {self.severity}. Must be one of {valid_severities}")
+        self._severity_color = SEVERITY_COLORS.get(self.severity, '#666666')
+
+        # Display strings depend only on the rule; channels reuse them per send
+        self._severity_upper = self.severity.upper()
+        self._threshold_str = f"{self.operator} {self.threshold}"
 
         # Validate duration
         if self.for_duration_minutes < 0:
@@ -61,15 +115,12 @@ class AlertRule:
         Returns:
             Unique alert ID string
         """
-        label_str = ""
-        if labels:
-            # Sort for consistency
-            sorted_labels = sorted(labels.items())
-            label_str = "_".join(f"{k}={v}" for k, v in sorted_labels)
+        # Label-less alerts (the common case) skip the sort and cache lookup
+        if not labels:
+            return self.name
 
-        if label_str:
-            return f"{self.name}_{label_str}"
-        return self.name
+        # Sort for consistency
+        return _alert_id(self.name, tuple(sorted(labels.items())))
 
 
 def load_alert_rules(rules_file: str) -> List[AlertRule]:
@@ -87,44 +138,23 @@ def load_alert_rules(rules_file: str) -> List[AlertRule]:
         ValueError: If rules file has invalid format
     """
     try:
-        with open(rules_file, 'r') as f:
-            config = yaml.safe_load(f)
-
-        if not config or 'alert_rules' not in config:
-            logger.warning(f"No alert_rules found in {rules_file}")
-            return []
-
-        rules = []
-        for rule_config in config['alert_rules']:
-            try:
-                # Extract condition
-                condition = rule_config.get('condition', {})
-
-                # Create rule object
-                rule = AlertRule(
-                    name=rule_config['name'],
-                    metric_name=rule_config['metric_name'],
-                    operator=condition.get('operator', '>'),
-                    threshold=float(condition.get('threshold', 0)),
-                    for_duration_minutes=rule_config.get('for_duration_minutes', 1),
-                    severity=rule_config.get('severity', 'warning'),
-                    channels=rule_config.get('channels', []),
-                    enabled=rule_config.get('enabled', True),
-                    labels=rule_config.get('labels', {}),
-                    label_selector=rule_config.get('label_selector', {}),
-                    annotations=rule_config.get('annotations', {}),
-                    cooldown_minutes=rule_config.get('cooldown_minutes', 15),
-                    description=rule_config.get('description', ''),
-                )
-                rules.append(rule)
-                logger.debug(f"Loaded alert rule: {rule.name}")
-
-            except (KeyError, ValueError) as e:
-                logger.error(f"Failed to load rule {rule_config.get('name', 'unknown')}: {e}")
-                continue
-
-        logger.info(f"Loaded {len(rules)} alert rules from {rules_file}")
-        return rules
+        st = os.stat(rules_file)
+        key = str(rules_file)
+        cached = _RULES_CACHE.get(key)
+        if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+            _RULES_CACHE.move_to_end(key)
+            # Rules are mutable (e.g. enabled is toggled at runtime), so
+            # callers never share the cached objects
+            return copy.deepcopy(cached[2])
+
+        rules = _parse_rules_file(rules_file)
+
+        _RULES_CACHE[key] = (st.st_mtime_ns, st.st_size, rules)
+        _RULES_CACHE.move_to_end(key)
+        if len(_RULES_CACHE) > RULES_CACHE_SIZE:
+            _RULES_CACHE.popitem(last=False)
+
+        return copy.deepcopy(rules)
 
     except FileNotFoundError:
         logger.error(f"Alert rules file not found: {rules_file}")
@@ -132,3 +162,53 @@ def load_alert_rules(rules_file: str) -> List[AlertRule]:
     except yaml.YAMLError as e:
         logger.error(f"Failed to parse YAML file {rules_file}: {e}")
         raise ValueError(f"Invalid YAML format: {e}")
+
+
+def _parse_rules_file(rules_file: str) -> List[AlertRule]:
+    """
+    Parse alert rules from a YAML file, skipping invalid rules.
+
+    Args:
+        rules_file: Path to YAML configuration file
+
+    Returns:
+        List of AlertRule objects
+    """
+    with open(rules_file, 'r') as f:
+        config = yaml.load(f, Loader=_Loader)
+
+    if not config or 'alert_rules' not in config:
+        logger.warning(f"No alert_rules found in {rules_file}")
+        return []
+
+    rules = []
+    for rule_config in config['alert_rules']:
+        try:
+            # Extract condition
+            condition = rule_config.get('condition', {})
+
+            # Create rule object
+            rule = AlertRule(
+                name=rule_config['name'],
+                metric_name=rule_config['metric_name'],
+                operator=condition.get('operator', '>'),
+                threshold=float(condition.get('threshold', 0)),
+                for_duration_minutes=rule_config.get('for_duration_minutes', 1),
+                severity=rule_config.get('severity', 'warning'),
+                channels=rule_config.get('channels', []),
+                enabled=rule_config.get('enabled', True),
+                labels=rule_config.get('labels', {}),
+                label_selector=rule_config.get('label_selector', {}),
+                annotations=rule_config.get('annotations', {}),
+                cooldown_minutes=rule_config.get('cooldown_minutes', 15),
+                description=rule_config.get('description', ''),
+            )
+            rules.append(rule)
+            logger.debug(f"Loaded alert rule: {rule.name}")
+
+        except (KeyError, ValueError) as e:
+            logger.error(f"Failed to load rule {rule_config.get('name', 'unknown')}: {e}")
+            continue
+
+    logger.info(f"Loaded {len(rules)} alert rules from {rules_file}")
+    return rules
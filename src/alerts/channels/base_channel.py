@@ -5,15 +5,19 @@ Base notification channel interface.
 from abc import ABC, abstractmethod
 from typing import Dict
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Matches {{ value }}, {{ threshold }} and {{ labels.<name> }} placeholders
+_TEMPLATE_VAR = re.compile(r'\{\{\s*(value|threshold|labels\.([A-Za-z_][A-Za-z0-9_]*))\s*\}\}')
+
 
 class BaseChannel(ABC):
     """Abstract base class for notification channels"""
 
     @abstractmethod
-    def send(self, rule, value: float, labels: Dict[str, str]) -> bool:
+    def send(self, rule, value: float, labels: Dict[str, str], count: int = 1) -> bool:
         """
         Send alert notification.
 
@@ -21,12 +25,17 @@ class BaseChannel(ABC):
             rule: AlertRule instance
             value: Current metric value that triggered alert
             labels: Metric labels
+            count: Number of samples seen while the alert has been firing
 
         Returns:
             True if notification sent successfully, False otherwise
         """
         pass
 
+    def close(self) -> None:
+        """Release channel resources (no-op by default)"""
+        pass
+
     def format_message(self, rule, value: float, labels: Dict[str, str]) -> Dict[str, str]:
         """
         Format alert message from rule annotations.
@@ -73,17 +82,20 @@ class BaseChannel(ABC):
         Returns:
             Formatted string
         """
-        try:
-            # Simple template substitution
-            result = template.replace('{{ value }}', f'{value:.2f}')
-            result = result.replace('{{ threshold }}', f'{threshold:.2f}')
-
-            # Substitute labels
-            for key, val in labels.items():
-                result = result.replace(f'{{{{ labels.{key} }}}}', str(val))
+        def resolve(match):
+            name = match.group(1)
+            if name == 'value':
+                return f'{value:.2f}'
+            if name == 'threshold':
+                return f'{threshold:.2f}'
+            # Unknown labels are left as-is
+            label = labels.get(match.group(2))
+            return match.group(0) if label is None else str(label)
 
-            return result
+        try:
+            # Single pass over the template for all placeholders
+            return _TEMPLATE_VAR.sub(resolve, template)
 
         except Exception as e:
-            logger.error(f"Error substituting template: {e}")
+            logger.error("Error substituting template: %s", e)
             return template
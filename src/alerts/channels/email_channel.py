@@ -34,9 +34,9 @@ class EmailChannel(BaseChannel):
         if not isinstance(self.to_addresses, list):
             self.to_addresses = [self.to_addresses]
 
-        logger.info(f"Email channel initialized (host: {self.smtp_host}, port: {self.smtp_port})")
+        logger.info("Email channel initialized (host: %s, port: %s)", self.smtp_host, self.smtp_port)
 
-    def send(self, rule, value: float, labels: Dict[str, str]) -> bool:
+    def send(self, rule, value: float, labels: Dict[str, str], count: int = 1) -> bool:
         """
         Send email notification.
 
@@ -44,6 +44,7 @@ class EmailChannel(BaseChannel):
             rule: AlertRule instance
             value: Current metric value
             labels: Metric labels
+            count: Number of samples seen while firing
 
         Returns:
             True if sent successfully
@@ -53,28 +54,23 @@ class EmailChannel(BaseChannel):
             message_content = self.format_message(rule, value, labels)
 
             # Create email
-            subject = f"[{rule.severity.upper()}] {message_content['summary']}"
-            body = self._create_email_body(rule, value, labels, message_content)
+            subject = f"[{rule._severity_upper}] {message_content['summary']}"
+            body = self._create_email_body(rule, value, labels, message_content, count)
 
             # Send email
             self._send_smtp(subject, body)
 
-            logger.info(f"Email sent for alert: {rule.name}")
+            logger.info("Email sent for alert: %s", rule.name)
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send email for alert {rule.name}: {e}")
+            logger.error("Failed to send email for alert %s: %s", rule.name, e)
             return False
 
     def _create_email_body(self, rule, value: float, labels: Dict[str, str],
-                          message_content: Dict[str, str]) -> str:
+                          message_content: Dict[str, str], count: int = 1) -> str:
         """Create HTML email body"""
-        severity_colors = {
-            'info': '#0066cc',
-            'warning': '#ff9900',
-            'critical': '#cc0000',
-        }
-        color = severity_colors.get(rule.severity, '#666666')
+        color = rule._severity_color
 
         # Format labels
         labels_html = ""
@@ -89,7 +85,7 @@ class EmailChannel(BaseChannel):
         <body style="font-family: Arial, sans-serif; padding: 20px;">
             <div style="border-left: 4px solid {color}; padding-left: 15px; margin-bottom: 20px;">
                 <h2 style="color: {color}; margin: 0;">{message_content['summary']}</h2>
-                <p style="color: #666; margin: 5px 0 0 0;">Severity: {rule.severity.upper()}</p>
+                <p style="color: #666; margin: 5px 0 0 0;">Severity: {rule._severity_upper}</p>
             </div>
 
             <p style="font-size: 16px; line-height: 1.5;">
@@ -102,8 +98,9 @@ class EmailChannel(BaseChannel):
             <ul>
                 <li><strong>Rule:</strong> {rule.name}</li>
                 <li><strong>Metric:</strong> {rule.metric_name}</li>
-                <li><strong>Condition:</strong> {rule.operator} {rule.threshold}</li>
+                <li><strong>Condition:</strong> {rule._threshold_str}</li>
                 <li><strong>Current Value:</strong> {value:.2f}</li>
+                <li><strong>Occurrences:</strong> {count}</li>
             </ul>
 
             {labels_html}
@@ -148,4 +145,4 @@ class EmailChannel(BaseChannel):
             server.login(self.smtp_user, self.smtp_password)
             server.send_message(msg)
 
-        logger.debug(f"SMTP email sent to {self.to_addresses}")
+        logger.debug("SMTP email sent to %s", self.to_addresses)
@@ -0,0 +1,57 @@
+"""
+Shared HTTP connection pool setup for webhook-based channels.
+"""
+
+import json
+from typing import TYPE_CHECKING
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if TYPE_CHECKING:
+    import urllib3
+
+
+def dumps_payload(payload) -> bytes:
+    """
+    Serialize a JSON payload to UTF-8 bytes, using orjson when installed.
+
+    Args:
+        payload: JSON-serializable payload
+
+    Returns:
+        Encoded JSON body
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def create_pool_manager() -> 'urllib3.PoolManager':
+    """
+    Create a urllib3 pool manager with connection pooling and retries.
+
+    Reusing pooled connections avoids a new TCP/TLS handshake per
+    notification. Only connection failures are retried: the request was
+    never sent then, whereas re-sending a POST after a read timeout or an
+    error status could deliver the notification twice. Failed statuses are
+    returned as responses (not raised) so callers can check the status code.
+
+    Returns:
+        Configured urllib3.PoolManager
+    """
+    # Imported here so loading a channel module does not pull in urllib3
+    import urllib3
+
+    retry = urllib3.Retry(
+        total=3,
+        connect=3,
+        read=0,
+        status=0,
+        other=0,
+        backoff_factor=0.2,
+        raise_on_status=False,
+    )
+    return urllib3.PoolManager(num_pools=4, maxsize=20, retries=retry)
@@ -3,17 +3,15 @@ Slack notification channel using webhooks.
 """
 
 import logging
-import json
-from typing import Dict
-try:
-    import requests
-except ImportError:
-    requests = None
-
+from typing import Any, Dict, Tuple
 from src.alerts.channels.base_channel import BaseChannel
+from src.alerts.channels.http_session import create_pool_manager, dumps_payload
 
 logger = logging.getLogger(__name__)
 
+# Prefix of each label line in the attachment text
+_LABEL_SEP = "\n• *"
+
 
 class SlackChannel(BaseChannel):
     """Slack notification channel via webhooks"""
@@ -25,17 +23,28 @@ class SlackChannel(BaseChannel):
         Args:
             config: Slack configuration dict with webhook_url
         """
-        if requests is None:
-            raise ImportError("requests library required for Slack channel. Install with: pip install requests")
+        # Deferred until the channel is enabled, so a missing HTTP client
+        # only matters to users who configure this channel
+        try:
+            import urllib3
+        except ImportError:
+            raise ImportError("urllib3 library required for Slack channel. Install with: pip install urllib3")
+        self._urllib3 = urllib3
 
         self.webhook_url = config['webhook_url']
         self.channel = config.get('channel', '#alerts')
         self.username = config.get('username', 'Metrics Agent')
         self.icon_emoji = config.get('icon_emoji', ':rotating_light:')
 
-        logger.info(f"Slack channel initialized (channel: {self.channel})")
+        # Pooled keep-alive connections reused across alerts
+        self._http = create_pool_manager()
+
+        # Static payload parts per rule: id(rule) -> (rule, template)
+        self._payload_cache: Dict[int, Tuple[Any, Dict]] = {}
+
+        logger.info("Slack channel initialized (channel: %s)", self.channel)
 
-    def send(self, rule, value: float, labels: Dict[str, str]) -> bool:
+    def send(self, rule, value: float, labels: Dict[str, str], count: int = 1) -> bool:
         """
         Send Slack notification.
 
@@ -43,6 +52,7 @@ class SlackChannel(BaseChannel):
             rule: AlertRule instance
             value: Current metric value
             labels: Metric labels
+            count: Number of samples seen while firing
 
         Returns:
             True if sent successfully
@@ -52,90 +62,123 @@ class SlackChannel(BaseChannel):
             message_content = self.format_message(rule, value, labels)
 
             # Create Slack payload
-            payload = self._create_slack_payload(rule, value, labels, message_content)
+            payload = self._create_slack_payload(rule, value, labels, message_content, count)
 
             # Send to webhook
-            response = requests.post(
+            response = self._http.request(
+                'POST',
                 self.webhook_url,
-                json=payload,
+                body=dumps_payload(payload),
                 headers={'Content-Type': 'application/json'},
                 timeout=10
             )
 
-            response.raise_for_status()
+            # Plain status check: no HTTPError/traceback built per failed
+            # send, which matters when the endpoint is down during incidents
+            if not 200 <= response.status < 300:
+                logger.error("Slack HTTP %s for alert %s: %s",
+                             response.status, rule.name, response.data[:200])
+                return False
 
-            logger.info(f"Slack notification sent for alert: {rule.name}")
+            logger.info("Slack notification sent for alert: %s", rule.name)
             return True
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send Slack notification for alert {rule.name}: {e}")
+        except self._urllib3.exceptions.HTTPError as e:
+            logger.error("Failed to send Slack notification for alert %s: %s", rule.name, e)
             return False
         except Exception as e:
-            logger.error(f"Error sending Slack notification: {e}")
+            logger.error("Error sending Slack notification: %s", e)
             return False
 
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._http.clear()
+
+    def _get_payload_template(self, rule) -> Dict:
+        """
+        Get the parts of a rule's payload that do not change between sends.
+
+        Built on first use and cached per rule; values are shared between
+        payloads, so they must not be mutated.
+        """
+        cached = self._payload_cache.get(id(rule))
+        if cached is not None and cached[0] is rule:
+            return cached[1]
+
+        # Add @channel mention for critical alerts
+        text = ""
+        if rule.severity == 'critical':
+            text = "<!channel> Critical Alert"
+
+        template = {
+            "payload": {
+                "username": self.username,
+                "icon_emoji": self.icon_emoji,
+                "text": text,
+            },
+            "attachment": {
+                "color": rule._severity_color,
+                "footer": "Metrics Monitoring Agent",
+            },
+            "severity_field": {
+                "title": "Severity",
+                "value": rule._severity_upper,
+                "short": True
+            },
+            "static_fields": [
+                {
+                    "title": "Threshold",
+                    "value": rule._threshold_str,
+                    "short": True
+                },
+                {
+                    "title": "Metric",
+                    "value": rule.metric_name,
+                    "short": True
+                },
+            ],
+        }
+        # Keep the rule itself so a recycled id() is never mistaken for it
+        self._payload_cache[id(rule)] = (rule, template)
+        return template
+
     def _create_slack_payload(self, rule, value: float, labels: Dict[str, str],
-                             message_content: Dict[str, str]) -> Dict:
+                             message_content: Dict[str, str], count: int = 1) -> Dict:
         """Create Slack webhook payload"""
-        severity_colors = {
-            'info': '#0066cc',
-            'warning': '#ff9900',
-            'critical': '#cc0000',
-        }
-        color = severity_colors.get(rule.severity, '#666666')
+        template = self._get_payload_template(rule)
 
-        # Format labels for display
-        labels_text = ""
+        # Format labels for display (one join, nothing built without labels)
         if labels:
-            labels_text = "\n" + "\n".join(f"• *{k}:* {v}" for k, v in labels.items())
+            labels_text = _LABEL_SEP + _LABEL_SEP.join(f"{k}:* {v}" for k, v in labels.items())
+        else:
+            labels_text = ""
 
-        # Build fields
+        # Build fields: static ones come from the cached template
         fields = [
-            {
-                "title": "Severity",
-                "value": rule.severity.upper(),
-                "short": True
-            },
+            template["severity_field"],
             {
                 "title": "Current Value",
                 "value": f"{value:.2f}",
                 "short": True
             },
+            *template["static_fields"],
             {
-                "title": "Threshold",
-                "value": f"{rule.operator} {rule.threshold}",
-                "short": True
-            },
-            {
-                "title": "Metric",
-                "value": rule.metric_name,
+                "title": "Occurrences",
+                "value": str(count),
                 "short": True
             },
         ]
 
         # Create attachment
-        attachment = {
-            "color": color,
-            "title": message_content['summary'],
-            "text": message_content['description'] + labels_text,
-            "fields": fields,
-            "footer": "Metrics Monitoring Agent",
-            "ts": int(datetime.now().timestamp()),
-        }
-
-        # Add @channel mention for critical alerts
-        text = ""
-        if rule.severity == 'critical':
-            text = "<!channel> Critical Alert"
-
-        payload = {
-            "username": self.username,
-            "icon_emoji": self.icon_emoji,
-            "text": text,
-            "attachments": [attachment]
-        }
-
-        return payload
+        attachment = dict(
+            template["attachment"],
+            title=message_content['summary'],
+            text=message_content['description'] + labels_text,
+            fields=fields,
+            ts=int(datetime.now().timestamp()),
+        )
+
+        return dict(template["payload"], attachments=[attachment])
 
 
 # Import datetime for timestamp
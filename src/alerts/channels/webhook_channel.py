@@ -3,14 +3,10 @@ Custom webhook notification channel.
 """
 
 import logging
-import json
-from typing import Dict
-try:
-    import requests
-except ImportError:
-    requests = None
-
+from datetime import datetime
+from typing import Any, Dict, Tuple
 from src.alerts.channels.base_channel import BaseChannel
+from src.alerts.channels.http_session import create_pool_manager, dumps_payload
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +21,13 @@ class WebhookChannel(BaseChannel):
         Args:
             config: Webhook configuration dict with url, method, headers
         """
-        if requests is None:
-            raise ImportError("requests library required for Webhook channel. Install with: pip install requests")
+        # Deferred until the channel is enabled, so a missing HTTP client
+        # only matters to users who configure this channel
+        try:
+            import urllib3
+        except ImportError:
+            raise ImportError("urllib3 library required for Webhook channel. Install with: pip install urllib3")
+        self._urllib3 = urllib3
 
         self.url = config['url']
         self.method = config.get('method', 'POST').upper()
@@ -37,9 +38,15 @@ class WebhookChannel(BaseChannel):
         if 'Content-Type' not in self.headers:
             self.headers['Content-Type'] = 'application/json'
 
-        logger.info(f"Webhook channel initialized (url: {self.url}, method: {self.method})")
+        # Pooled keep-alive connections reused across alerts
+        self._http = create_pool_manager()
+
+        # Static payload parts per rule: id(rule) -> (rule, template)
+        self._payload_cache: Dict[int, Tuple[Any, Dict]] = {}
 
-    def send(self, rule, value: float, labels: Dict[str, str]) -> bool:
+        logger.info("Webhook channel initialized (url: %s, method: %s)", self.url, self.method)
+
+    def send(self, rule, value: float, labels: Dict[str, str], count: int = 1) -> bool:
         """
         Send webhook notification.
 
@@ -47,6 +54,7 @@ class WebhookChannel(BaseChannel):
             rule: AlertRule instance
             value: Current metric value
             labels: Metric labels
+            count: Number of samples seen while firing
 
         Returns:
             True if sent successfully
@@ -56,57 +64,81 @@ class WebhookChannel(BaseChannel):
             message_content = self.format_message(rule, value, labels)
 
             # Create payload
-            payload = self._create_webhook_payload(rule, value, labels, message_content)
+            payload = self._create_webhook_payload(rule, value, labels, message_content, count)
 
             # Send HTTP request
-            if self.method == 'POST':
-                response = requests.post(
-                    self.url,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=self.timeout
-                )
-            elif self.method == 'PUT':
-                response = requests.put(
-                    self.url,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=self.timeout
-                )
-            else:
-                logger.error(f"Unsupported HTTP method: {self.method}")
+            if self.method not in ('POST', 'PUT'):
+                logger.error("Unsupported HTTP method: %s", self.method)
                 return False
 
-            response.raise_for_status()
+            response = self._http.request(
+                self.method,
+                self.url,
+                body=dumps_payload(payload),
+                headers=self.headers,
+                timeout=self.timeout
+            )
+
+            # Plain status check: no HTTPError/traceback built per failed
+            # send, which matters when the endpoint is down during incidents
+            if not 200 <= response.status < 300:
+                logger.error("Webhook HTTP %s for alert %s: %s",
+                             response.status, rule.name, response.data[:200])
+                return False
 
-            logger.info(f"Webhook notification sent for alert: {rule.name}")
+            logger.info("Webhook notification sent for alert: %s", rule.name)
             return True
 
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to send webhook notification for alert {rule.name}: {e}")
+        except self._urllib3.exceptions.HTTPError as e:
+            logger.error("Failed to send webhook notification for alert %s: %s", rule.name, e)
             return False
         except Exception as e:
-            logger.error(f"Error sending webhook notification: {e}")
+            logger.error("Error sending webhook notification: %s", e)
             return False
 
-    def _create_webhook_payload(self, rule, value: float, labels: Dict[str, str],
-                               message_content: Dict[str, str]) -> Dict:
-        """Create webhook payload"""
-        from datetime import datetime
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._http.clear()
 
-        payload = {
+    def _get_payload_template(self, rule) -> Dict:
+        """
+        Get the parts of a rule's payload that do not change between sends.
+
+        Built on first use and cached per rule; values are shared between
+        payloads, so they must not be mutated.
+        """
+        cached = self._payload_cache.get(id(rule))
+        if cached is not None and cached[0] is rule:
+            return cached[1]
+
+        template = {
             "alert": {
                 "name": rule.name,
                 "severity": rule.severity,
                 "status": "firing",
-                "timestamp": datetime.now().isoformat(),
             },
             "metric": {
                 "name": rule.metric_name,
-                "value": value,
                 "threshold": rule.threshold,
                 "operator": rule.operator,
             },
+        }
+        # Keep the rule itself so a recycled id() is never mistaken for it
+        self._payload_cache[id(rule)] = (rule, template)
+        return template
+
+    def _create_webhook_payload(self, rule, value: float, labels: Dict[str, str],
+                               message_content: Dict[str, str], count: int = 1) -> Dict:
+        """Create webhook payload"""
+        template = self._get_payload_template(rule)
+
+        payload = {
+            "alert": dict(
+                template["alert"],
+                count=count,
+                timestamp=datetime.now().isoformat(),
+            ),
+            "metric": dict(template["metric"], value=value),
             "labels": labels,
             "annotations": {
                 "summary": message_content['summary'],
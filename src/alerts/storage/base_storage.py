@@ -3,11 +3,16 @@ Base storage interface for alert history.
 """
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class AlertState:
     """Alert state constants"""
@@ -33,42 +38,142 @@ class Alert:
     last_notified_at: Optional[datetime] = None
     notification_count: int = 0
 
-    def to_dict(self) -> Dict:
-        """Convert to dictionary for storage"""
-        return {
-            'alert_id': self.alert_id,
-            'rule_name': self.rule_name,
-            'state': self.state,
-            'severity': self.severity,
-            'metric_name': self.metric_name,
-            'metric_value': self.metric_value,
-            'threshold': self.threshold,
-            'labels': json.dumps(self.labels),
-            'annotations': json.dumps(self.annotations),
-            'triggered_at': self.triggered_at.isoformat(),
-            'resolved_at': self.resolved_at.isoformat() if self.resolved_at else None,
-            'last_notified_at': self.last_notified_at.isoformat() if self.last_notified_at else None,
-            'notification_count': self.notification_count,
-        }
-
-    @classmethod
-    def from_dict(cls, data: Dict) -> 'Alert':
-        """Create Alert from dictionary"""
-        return cls(
-            alert_id=data['alert_id'],
-            rule_name=data['rule_name'],
-            state=data['state'],
-            severity=data['severity'],
-            metric_name=data['metric_name'],
-            metric_value=data['metric_value'],
-            threshold=data['threshold'],
-            labels=json.loads(data['labels']) if isinstance(data['labels'], str) else data['labels'],
-            annotations=json.loads(data['annotations']) if isinstance(data['annotations'], str) else data['annotations'],
-            triggered_at=datetime.fromisoformat(data['triggered_at']) if isinstance(data['triggered_at'], str) else data['triggered_at'],
-            resolved_at=datetime.fromisoformat(data['resolved_at']) if data.get('resolved_at') and isinstance(data['resolved_at'], str) else data.get('resolved_at'),
-            last_notified_at=datetime.fromisoformat(data['last_notified_at']) if data.get('last_notified_at') and isinstance(data['last_notified_at'], str) else data.get('last_notified_at'),
-            notification_count=data.get('notification_count', 0),
-        )
+    # JSON text of labels/annotations, cached on first serialization; both
+    # dicts are treated as immutable once an alert is built
+    _labels_json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _annotations_json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def labels_json(self) -> str:
+        """Labels encoded as JSON text (cached)"""
+        if self._labels_json is None:
+            self._labels_json = dumps_json(self.labels)
+        return self._labels_json
+
+    @property
+    def annotations_json(self) -> str:
+        """Annotations encoded as JSON text (cached)"""
+        if self._annotations_json is None:
+            self._annotations_json = dumps_json(self.annotations)
+        return self._annotations_json
+
+    # to_dict() and from_dict() are generated below the class; declared
+    # here for type checkers and readers
+    if TYPE_CHECKING:
+        def to_dict(self) -> Dict[str, Any]:
+            """Convert to dictionary for storage"""
+            ...
+
+        @classmethod
+        def from_dict(cls, data: Dict[str, Any]) -> "Alert":
+            """Create Alert from dictionary"""
+            ...
+
+
+def datetime_to_epoch_us(dt: datetime) -> int:
+    """Convert a naive local datetime to integer Unix epoch microseconds"""
+    return int(dt.timestamp()) * 1_000_000 + dt.microsecond
+
+
+_fromtimestamp = datetime.fromtimestamp
+
+
+def epoch_us_to_datetime(us: int) -> datetime:
+    """Convert integer Unix epoch microseconds to a naive local datetime"""
+    # fromtimestamp() rounds to the nearest microsecond, and the float
+    # quotient is off by less than half of one until the year 2242, so a
+    # single call is exact and skips the separate replace()
+    return _fromtimestamp(us / 1_000_000)
+
+
+# JSON codec for label/annotation columns: orjson when installed
+if orjson is not None:
+    def dumps_json(obj) -> str:
+        """Encode to JSON text (SQLite TEXT columns take str)"""
+        return orjson.dumps(obj).decode('utf-8')
+
+    loads_json = orjson.loads
+else:
+    dumps_json = json.dumps
+    loads_json = json.loads
+
+
+def _compile_alert_codecs(cls) -> Tuple[Callable[..., Any], Callable[..., Any]]:
+    """
+    Generate the row serializer and deserializer for an alert dataclass.
+
+    Fields are introspected once and each conversion is inlined into a
+    single dict/constructor expression, so materializing a row does no
+    per-field type checks. Datetimes are stored as integer epoch
+    microseconds and dicts as JSON text, which is also what SQLite hands
+    back.
+
+    Args:
+        cls: Dataclass to generate the functions for
+
+    Returns:
+        (to_dict, from_dict) functions; from_dict still needs classmethod()
+    """
+    to_items = []
+    from_items = []
+    cache_items = []
+    namespace: Dict[str, Any] = {'_dumps': dumps_json, '_loads': loads_json,
+                                 '_to_epoch': datetime_to_epoch_us, '_from_epoch': epoch_us_to_datetime}
+
+    for f in fields(cls):
+        name = f.name
+        if not f.init:
+            # Derived caches, not stored columns
+            continue
+        if f.type is datetime:
+            to_expr = f"_to_epoch(self.{name})"
+            from_expr = f"_from_epoch(data[{name!r}])"
+        elif f.type == Optional[datetime]:
+            to_expr = f"_to_epoch(self.{name}) if self.{name} else None"
+            from_expr = f"_from_epoch(data[{name!r}]) if data.get({name!r}) else None"
+        elif f.type == Dict[str, str]:
+            # Dicts with a cached JSON property reuse it, and a row's JSON
+            # text seeds the cache of the alert built from it
+            if isinstance(getattr(cls, f"{name}_json", None), property):
+                to_expr = f"self.{name}_json"
+                cache_items.append(f"    obj._{name}_json = data[{name!r}]")
+            else:
+                to_expr = f"_dumps(self.{name})"
+            from_expr = f"_loads(data[{name!r}])"
+        elif f.default is not MISSING:
+            namespace[f'_default_{name}'] = f.default
+            to_expr = f"self.{name}"
+            from_expr = f"data.get({name!r}, _default_{name})"
+        else:
+            to_expr = f"self.{name}"
+            from_expr = f"data[{name!r}]"
+        to_items.append(f"        {name!r}: {to_expr},")
+        from_items.append(f"        {name}={from_expr},")
+
+    source = "\n".join([
+        "def to_dict(self):",
+        '    """Convert to dictionary for storage"""',
+        "    return {",
+        *to_items,
+        "    }",
+        "",
+        "def from_dict(cls, data):",
+        f'    """Create {cls.__name__} from dictionary"""',
+        "    obj = cls(",
+        *from_items,
+        "    )",
+        *cache_items,
+        "    return obj",
+        "",
+    ])
+    exec(compile(source, f"<{cls.__name__} codecs>", 'exec'), namespace)
+    return namespace['to_dict'], namespace['from_dict']
+
+
+_alert_to_dict, _alert_from_dict = _compile_alert_codecs(Alert)
+# setattr, as type checkers see the declarations in the class body
+setattr(Alert, 'to_dict', _alert_to_dict)
+setattr(Alert, 'from_dict', classmethod(_alert_from_dict))
 
 
 class BaseStorage(ABC):
@@ -121,6 +226,50 @@ class BaseStorage(ABC):
         """
         pass
 
+    def save_alerts(self, alerts: List[Alert]) -> None:
+        """
+        Save several new alerts. Backends should override this with a
+        single batched write; the default saves them one by one.
+
+        Args:
+            alerts: Alert instances to save, in order
+        """
+        for alert in alerts:
+            self.save_alert(alert)
+
+    @abstractmethod
+    def upsert_alerts(self, alerts: List[Alert]) -> None:
+        """
+        Write the current state of several alerts.
+
+        An alert whose ID has an unresolved row updates that row's state,
+        metric value and notification info; otherwise a new row is inserted.
+
+        Args:
+            alerts: Alert snapshots to write, in order
+        """
+        pass
+
+    def update_states_bulk(self, updates: List[Tuple[str, str, Optional[datetime]]]) -> None:
+        """
+        Apply several state updates in order.
+
+        Args:
+            updates: (alert_id, state, resolved_at) tuples
+        """
+        for alert_id, state, resolved_at in updates:
+            self.update_alert_state(alert_id, state, resolved_at=resolved_at)
+
+    def update_notifications_bulk(self, updates: List[Tuple[str, datetime]]) -> None:
+        """
+        Apply several notification updates in order.
+
+        Args:
+            updates: (alert_id, notified_at) tuples
+        """
+        for alert_id, notified_at in updates:
+            self.update_notification_info(alert_id, notified_at)
+
     @abstractmethod
     def get_active_alerts(self) -> List[Alert]:
         """
@@ -131,6 +280,18 @@ class BaseStorage(ABC):
         """
         pass
 
+    def iter_active_alerts(self) -> Iterator[Alert]:
+        """
+        Iterate over alerts in triggered or active state, newest first.
+
+        Backends should override this to stream rows; the default wraps
+        get_active_alerts().
+
+        Returns:
+            Iterator of active Alert instances
+        """
+        return iter(self.get_active_alerts())
+
     @abstractmethod
     def get_alerts_by_rule(self, rule_name: str, limit: int = 100) -> List[Alert]:
         """
@@ -2,16 +2,84 @@
 SQLite storage backend for alert history.
 """
 
+import functools
 import sqlite3
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 
-from src.alerts.storage.base_storage import BaseStorage, Alert, AlertState
+from src.alerts.storage.base_storage import (
+    BaseStorage, Alert, AlertState, datetime_to_epoch_us,
+)
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming query results
+FETCH_BATCH_SIZE = 256
+
+# Rows deleted per transaction by retention cleanup
+CLEANUP_BATCH_SIZE = 1000
+
+# Statements used on every call, kept as constants so sqlite3's statement
+# cache (keyed by SQL text) always hits
+_SQL_INSERT = (
+    "INSERT INTO alert_history ("
+    "alert_id, rule_name, state, severity, metric_name, "
+    "metric_value, threshold, labels, annotations, "
+    "triggered_at, resolved_at, last_notified_at, notification_count"
+    ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Insert a new alert, or update the live row if the alert ID has one
+_SQL_UPSERT = _SQL_INSERT + (
+    " ON CONFLICT(alert_id) WHERE resolved_at IS NULL DO UPDATE SET "
+    "state = excluded.state, metric_value = excluded.metric_value, "
+    "last_notified_at = excluded.last_notified_at, "
+    "notification_count = excluded.notification_count, "
+    "updated_at = CURRENT_TIMESTAMP"
+)
+_SQL_GET_ALERT = (
+    "SELECT * FROM alert_history WHERE alert_id = ? "
+    "ORDER BY triggered_at DESC LIMIT 1"
+)
+_SQL_SET_STATE = (
+    "UPDATE alert_history SET state = ?, updated_at = CURRENT_TIMESTAMP "
+    "WHERE alert_id = ? AND resolved_at IS NULL"
+)
+_SQL_SET_STATE_RESOLVED = (
+    "UPDATE alert_history SET state = ?, resolved_at = ?, updated_at = CURRENT_TIMESTAMP "
+    "WHERE alert_id = ? AND resolved_at IS NULL"
+)
+_SQL_NOTIFIED = (
+    "UPDATE alert_history SET last_notified_at = ?, "
+    "notification_count = notification_count + 1, updated_at = CURRENT_TIMESTAMP "
+    "WHERE alert_id = ? AND resolved_at IS NULL"
+)
+_SQL_ACTIVE = (
+    "SELECT * FROM alert_history WHERE state IN (?, ?) AND resolved_at IS NULL "
+    "ORDER BY triggered_at DESC"
+)
+_SQL_BY_RULE = (
+    "SELECT * FROM alert_history WHERE rule_name = ? "
+    "ORDER BY triggered_at DESC LIMIT ?"
+)
+_SQL_CLEANUP = (
+    "DELETE FROM alert_history WHERE id IN ("
+    "SELECT id FROM alert_history WHERE triggered_at < ? AND state = ? LIMIT ?)"
+)
+
+
+def _serialized(method):
+    """Run a storage method under the connection lock when threads share one connection"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._shared_conn is None:
+            return method(self, *args, **kwargs)
+        with self._connections_lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class SQLiteStorage(BaseStorage):
     """SQLite implementation of alert storage"""
@@ -22,27 +90,84 @@ class SQLiteStorage(BaseStorage):
 
         Args:
             config: Storage configuration dict with 'sqlite_path' key
+                (':memory:' for a database that is not persisted) and
+                optional 'sqlite_wal' flag (default True)
         """
         self.db_path = config.get('sqlite_path', './data/alerts.db')
         self.retention_days = config.get('retention_days', 30)
-
-        # Ensure directory exists
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        # WAL can be turned off for filesystems without shared-memory
+        # support (e.g. some network mounts)
+        self.wal = config.get('sqlite_wal', True)
+
+        if self.db_path != ':memory:':
+            # Ensure directory exists
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection per thread, so readers aren't serialized behind a
+        # writer on a shared connection and WAL can serve them concurrently.
+        # All connections are tracked so close() can release them; the
+        # threads using storage are long-lived, so the list stays small.
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.RLock()
+        self._closed = False
+
+        # An in-memory database exists only within its connection, so all
+        # threads share that one and take turns on it under the lock
+        self._shared_conn: Optional[sqlite3.Connection] = None
+        if self.db_path == ':memory:':
+            self._shared_conn = self._connect()
 
         # Initialize database
-        self.conn = None
         self._init_db()
 
         logger.info(f"Initialized SQLite storage at {self.db_path}")
 
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """The calling thread's connection, opened on first use (one shared connection in memory)"""
+        if self._shared_conn is not None:
+            return self._shared_conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._connect()
+        return conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a connection for the calling thread"""
+        with self._connections_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+
+            # check_same_thread=False only so close() can close every thread's
+            # connection; each is otherwise used by its own thread alone (or,
+            # in memory, by one thread at a time under the lock)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                                   cached_statements=256)
+            conn.row_factory = sqlite3.Row
+
+            if self.wal:
+                # Enable WAL mode for better concurrency
+                conn.execute("PRAGMA journal_mode=WAL")
+
+                # NORMAL is durable across app crashes under WAL (only an OS
+                # crash can lose the last commits) and skips the fsync on
+                # every commit; rollback journals keep the FULL default
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA wal_autocheckpoint=10000")
+            # Sized per connection: every storage thread opens its own, and
+            # together they have to fit in the agent's memory budget. No
+            # mmap, as mapped pages count towards RSS once touched
+            conn.execute("PRAGMA cache_size=-8192")  # 8 MB page cache
+            conn.execute("PRAGMA temp_store=MEMORY")
+
+            self._connections.append(conn)
+
+        self._local.conn = conn
+        return conn
+
     def _init_db(self):
         """Create database tables and indexes"""
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
-
-        # Enable WAL mode for better concurrency
-        self.conn.execute("PRAGMA journal_mode=WAL")
-
         # Create alert_history table
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS alert_history (
@@ -56,75 +181,155 @@ class SQLiteStorage(BaseStorage):
                 threshold REAL,
                 labels TEXT,
                 annotations TEXT,
-                triggered_at TIMESTAMP NOT NULL,
-                resolved_at TIMESTAMP,
-                last_notified_at TIMESTAMP,
+                triggered_at INTEGER NOT NULL,
+                resolved_at INTEGER,
+                last_notified_at INTEGER,
                 notification_count INTEGER DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        self._migrate_timestamps()
+
         # Create indexes
         self.conn.execute(
             "CREATE INDEX IF NOT EXISTS idx_alert_id ON alert_history(alert_id)"
         )
+        # Retention cleanup seeks resolved rows below the cutoff; the rowid
+        # rides along in the index, so its subquery never reads the table
         self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_state ON alert_history(state)"
+            "CREATE INDEX IF NOT EXISTS idx_state_triggered "
+            "ON alert_history(state, triggered_at)"
         )
+        # Active-alert lookups only ever touch unresolved rows, so the
+        # partial index stays as small as the set of open alerts
         self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_triggered_at ON alert_history(triggered_at)"
+            "CREATE INDEX IF NOT EXISTS idx_state_resolved "
+            "ON alert_history(state, triggered_at DESC) WHERE resolved_at IS NULL"
         )
+        # Covers both the filter and the sort of per-rule history queries
         self.conn.execute(
-            "CREATE INDEX IF NOT EXISTS idx_rule_name ON alert_history(rule_name)"
+            "CREATE INDEX IF NOT EXISTS idx_rule_triggered "
+            "ON alert_history(rule_name, triggered_at DESC)"
         )
 
+        # At most one live (unresolved) row per alert ID, the conflict target
+        # of upserts. Databases from before this index may hold duplicate
+        # live rows; all but the newest are resolved first.
+        has_live_index = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_live_alert_id'"
+        ).fetchone()
+        if not has_live_index:
+            self.conn.execute("""
+                UPDATE alert_history SET state = ?, resolved_at = ?
+                WHERE resolved_at IS NULL AND id NOT IN (
+                    SELECT MAX(id) FROM alert_history
+                    WHERE resolved_at IS NULL GROUP BY alert_id
+                )
+            """, (AlertState.RESOLVED, datetime_to_epoch_us(datetime.now())))
+            self.conn.execute(
+                "CREATE UNIQUE INDEX idx_live_alert_id "
+                "ON alert_history(alert_id) WHERE resolved_at IS NULL"
+            )
+
+        # Superseded by the composite indexes above
+        self.conn.execute("DROP INDEX IF EXISTS idx_state")
+        self.conn.execute("DROP INDEX IF EXISTS idx_rule_name")
+        self.conn.execute("DROP INDEX IF EXISTS idx_triggered_at")
+
         self.conn.commit()
 
+    def _migrate_timestamps(self):
+        """
+        Rewrite ISO-8601 timestamp strings from older databases as integer
+        epoch microseconds. Tables created before the switch keep their
+        TIMESTAMP column type, whose numeric affinity stores integers as is.
+        """
+        rows = self.conn.execute("""
+            SELECT id, triggered_at, resolved_at, last_notified_at FROM alert_history
+            WHERE typeof(triggered_at) = 'text' OR typeof(resolved_at) = 'text'
+            OR typeof(last_notified_at) = 'text'
+        """).fetchall()
+        if not rows:
+            return
+
+        def convert(value):
+            if isinstance(value, str):
+                return datetime_to_epoch_us(datetime.fromisoformat(value))
+            return value
+
+        self.conn.executemany("""
+            UPDATE alert_history SET triggered_at = ?, resolved_at = ?, last_notified_at = ?
+            WHERE id = ?
+        """, [
+            (convert(row[1]), convert(row[2]), convert(row[3]), row[0]) for row in rows
+        ])
+        logger.info(f"Converted timestamps of {len(rows)} alerts to epoch microseconds")
+
+    @staticmethod
+    def _alert_row(alert: Alert) -> Tuple:
+        """Build an INSERT parameter tuple straight from an alert (no dict)"""
+        return (
+            alert.alert_id,
+            alert.rule_name,
+            alert.state,
+            alert.severity,
+            alert.metric_name,
+            alert.metric_value,
+            alert.threshold,
+            alert.labels_json,
+            alert.annotations_json,
+            datetime_to_epoch_us(alert.triggered_at),
+            datetime_to_epoch_us(alert.resolved_at) if alert.resolved_at else None,
+            datetime_to_epoch_us(alert.last_notified_at) if alert.last_notified_at else None,
+            alert.notification_count,
+        )
+
     def save_alert(self, alert: Alert) -> None:
         """Save a new alert"""
+        self.save_alerts([alert])
+
+    @_serialized
+    def save_alerts(self, alerts: List[Alert]) -> None:
+        """
+        Save several new alerts with one executemany in one transaction.
+
+        Prefer this over repeated save_alert() calls: each call commits,
+        so batching amortizes the journal sync over all rows.
+        """
         try:
-            data = alert.to_dict()
+            rows = [self._alert_row(alert) for alert in alerts]
 
-            self.conn.execute("""
-                INSERT INTO alert_history (
-                    alert_id, rule_name, state, severity, metric_name,
-                    metric_value, threshold, labels, annotations,
-                    triggered_at, resolved_at, last_notified_at, notification_count
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                data['alert_id'],
-                data['rule_name'],
-                data['state'],
-                data['severity'],
-                data['metric_name'],
-                data['metric_value'],
-                data['threshold'],
-                data['labels'],
-                data['annotations'],
-                data['triggered_at'],
-                data['resolved_at'],
-                data['last_notified_at'],
-                data['notification_count'],
-            ))
+            self.conn.executemany(_SQL_INSERT, rows)
+
+            self.conn.commit()
+            logger.debug(f"Saved {len(rows)} alerts")
+
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save {len(alerts)} alerts: {e}")
+            self.conn.rollback()
+            raise
+
+    @_serialized
+    def upsert_alerts(self, alerts: List[Alert]) -> None:
+        """Insert or update the live row of several alerts in one transaction"""
+        try:
+            self.conn.executemany(_SQL_UPSERT, [self._alert_row(alert) for alert in alerts])
 
             self.conn.commit()
-            logger.debug(f"Saved alert: {alert.alert_id}")
+            logger.debug(f"Upserted {len(alerts)} alerts")
 
         except sqlite3.Error as e:
-            logger.error(f"Failed to save alert {alert.alert_id}: {e}")
+            logger.error(f"Failed to upsert {len(alerts)} alerts: {e}")
             self.conn.rollback()
             raise
 
+    @_serialized
     def get_alert(self, alert_id: str) -> Optional[Alert]:
         """Retrieve alert by ID (most recent)"""
         try:
-            cursor = self.conn.execute("""
-                SELECT * FROM alert_history
-                WHERE alert_id = ?
-                ORDER BY triggered_at DESC
-                LIMIT 1
-            """, (alert_id,))
+            cursor = self.conn.execute(_SQL_GET_ALERT, (alert_id,))
 
             row = cursor.fetchone()
             if row:
@@ -135,22 +340,16 @@ class SQLiteStorage(BaseStorage):
             logger.error(f"Failed to get alert {alert_id}: {e}")
             return None
 
+    @_serialized
     def update_alert_state(self, alert_id: str, state: str,
                           resolved_at: Optional[datetime] = None) -> None:
         """Update alert state"""
         try:
             if resolved_at:
-                self.conn.execute("""
-                    UPDATE alert_history
-                    SET state = ?, resolved_at = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE alert_id = ? AND resolved_at IS NULL
-                """, (state, resolved_at.isoformat(), alert_id))
+                self.conn.execute(_SQL_SET_STATE_RESOLVED,
+                                  (state, datetime_to_epoch_us(resolved_at), alert_id))
             else:
-                self.conn.execute("""
-                    UPDATE alert_history
-                    SET state = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE alert_id = ? AND resolved_at IS NULL
-                """, (state, alert_id))
+                self.conn.execute(_SQL_SET_STATE, (state, alert_id))
 
             self.conn.commit()
             logger.debug(f"Updated alert {alert_id} state to {state}")
@@ -160,16 +359,11 @@ class SQLiteStorage(BaseStorage):
             self.conn.rollback()
             raise
 
+    @_serialized
     def update_notification_info(self, alert_id: str, notified_at: datetime) -> None:
         """Update notification information"""
         try:
-            self.conn.execute("""
-                UPDATE alert_history
-                SET last_notified_at = ?,
-                    notification_count = notification_count + 1,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE alert_id = ? AND resolved_at IS NULL
-            """, (notified_at.isoformat(), alert_id))
+            self.conn.execute(_SQL_NOTIFIED, (datetime_to_epoch_us(notified_at), alert_id))
 
             self.conn.commit()
             logger.debug(f"Updated notification info for {alert_id}")
@@ -179,75 +373,140 @@ class SQLiteStorage(BaseStorage):
             self.conn.rollback()
             raise
 
-    def get_active_alerts(self) -> List[Alert]:
-        """Get all active alerts"""
+    @_serialized
+    def update_states_bulk(self, updates: List[Tuple[str, str, Optional[datetime]]]) -> None:
+        """Apply several state updates in order in one transaction"""
+        try:
+            # Only unresolved rows are updated, so writing a NULL resolved_at
+            # for non-resolving updates leaves it unchanged
+            self.conn.executemany(_SQL_SET_STATE_RESOLVED, [
+                (state, datetime_to_epoch_us(resolved_at) if resolved_at else None, alert_id)
+                for alert_id, state, resolved_at in updates
+            ])
+
+            self.conn.commit()
+            logger.debug(f"Applied {len(updates)} alert state updates")
+
+        except sqlite3.Error as e:
+            logger.error(f"Failed to apply {len(updates)} alert state updates: {e}")
+            self.conn.rollback()
+            raise
+
+    @_serialized
+    def update_notifications_bulk(self, updates: List[Tuple[str, datetime]]) -> None:
+        """Apply several notification updates in order in one transaction"""
         try:
-            cursor = self.conn.execute("""
-                SELECT * FROM alert_history
-                WHERE state IN (?, ?)
-                AND resolved_at IS NULL
-                ORDER BY triggered_at DESC
-            """, (AlertState.TRIGGERED, AlertState.ACTIVE))
+            self.conn.executemany(_SQL_NOTIFIED, [
+                (datetime_to_epoch_us(notified_at), alert_id) for alert_id, notified_at in updates
+            ])
+
+            self.conn.commit()
+            logger.debug(f"Applied {len(updates)} notification updates")
 
-            alerts = []
-            for row in cursor.fetchall():
-                alerts.append(Alert.from_dict(dict(row)))
+        except sqlite3.Error as e:
+            logger.error(f"Failed to apply {len(updates)} notification updates: {e}")
+            self.conn.rollback()
+            raise
 
-            return alerts
+    def _iter_alerts(self, sql: str, params: Tuple) -> Iterator[Alert]:
+        """Run a query and yield alerts, fetching rows in batches"""
+        if self._shared_conn is not None:
+            # The lock can't be held across yields, so the rows are read
+            # in one go (in-memory databases are small anyway)
+            with self._connections_lock:
+                rows = self.conn.execute(sql, params).fetchall()
+            for row in rows:
+                yield Alert.from_dict(dict(row))
+            return
+
+        cursor = self.conn.execute(sql, params)
+        cursor.arraysize = FETCH_BATCH_SIZE
+        from_dict = Alert.from_dict
+
+        while True:
+            rows = cursor.fetchmany()
+            if not rows:
+                break
+            for row in rows:
+                yield from_dict(dict(row))
+
+    def iter_active_alerts(self) -> Iterator[Alert]:
+        """Yield active alerts, newest first, without building a list"""
+        try:
+            yield from self._iter_alerts(_SQL_ACTIVE, (AlertState.TRIGGERED, AlertState.ACTIVE))
 
         except sqlite3.Error as e:
             logger.error(f"Failed to get active alerts: {e}")
-            return []
 
+    def get_active_alerts(self) -> List[Alert]:
+        """Get all active alerts"""
+        return list(self.iter_active_alerts())
+
+    @_serialized
     def get_alerts_by_rule(self, rule_name: str, limit: int = 100) -> List[Alert]:
         """Get recent alerts for a specific rule"""
         try:
-            cursor = self.conn.execute("""
-                SELECT * FROM alert_history
-                WHERE rule_name = ?
-                ORDER BY triggered_at DESC
-                LIMIT ?
-            """, (rule_name, limit))
-
-            alerts = []
-            for row in cursor.fetchall():
-                alerts.append(Alert.from_dict(dict(row)))
-
-            return alerts
+            return list(self._iter_alerts(_SQL_BY_RULE, (rule_name, limit)))
 
         except sqlite3.Error as e:
             logger.error(f"Failed to get alerts for rule {rule_name}: {e}")
             return []
 
+    @_serialized
     def cleanup_old_alerts(self, days: int) -> int:
-        """Delete alerts older than specified days"""
+        """
+        Delete alerts older than specified days.
+
+        Rows are deleted in batches, each committed on its own, so the write
+        lock is released between batches and the WAL does not have to hold
+        the whole delete at once.
+        """
+        deleted_count = 0
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
+            params = (datetime_to_epoch_us(cutoff_date), AlertState.RESOLVED, CLEANUP_BATCH_SIZE)
 
-            cursor = self.conn.execute("""
-                DELETE FROM alert_history
-                WHERE triggered_at < ?
-                AND state = ?
-            """, (cutoff_date.isoformat(), AlertState.RESOLVED))
-
-            deleted_count = cursor.rowcount
-            self.conn.commit()
+            while True:
+                cursor = self.conn.execute(_SQL_CLEANUP, params)
+                self.conn.commit()
+                deleted_count += cursor.rowcount
+                if cursor.rowcount < CLEANUP_BATCH_SIZE:
+                    break
 
             if deleted_count > 0:
                 logger.info(f"Cleaned up {deleted_count} old alerts (>{days} days)")
 
+            self.checkpoint()
+
             return deleted_count
 
         except sqlite3.Error as e:
             logger.error(f"Failed to cleanup old alerts: {e}")
             self.conn.rollback()
-            return 0
+            return deleted_count
+
+    @_serialized
+    def checkpoint(self) -> None:
+        """
+        Checkpoint the WAL into the database and truncate it.
+
+        Autocheckpoints can be starved by the long-lived connection, letting
+        the WAL file grow without bound; this is run after each cleanup.
+        """
+        try:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to checkpoint WAL: {e}")
 
     def close(self) -> None:
-        """Close database connection"""
-        if self.conn:
+        """Close the database connections of all threads"""
+        with self._connections_lock:
+            self._closed = True
+            connections, self._connections = self._connections, []
+
+        for conn in connections:
             try:
-                self.conn.close()
-                logger.debug("Closed SQLite connection")
+                conn.close()
             except sqlite3.Error as e:
                 logger.error(f"Error closing SQLite connection: {e}")
+        logger.debug(f"Closed {len(connections)} SQLite connections")
@@ -9,6 +9,14 @@ from src.utils.logger import get_logger
 class BaseCollector(ABC):
     """Abstract base class for metric collectors"""
 
+    logger = get_logger('BaseCollector')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # One logger per collector class, resolved when the class is defined
+        # rather than looked up again for every instance
+        cls.logger = get_logger(cls.__name__)
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize collector
@@ -17,7 +25,6 @@ class BaseCollector(ABC):
             config: Collector configuration
         """
         self.config = config
-        self.logger = get_logger(self.__class__.__name__)
         self.error_count = 0
         self.last_success = None
         self.last_collection_duration = 0
@@ -59,27 +66,30 @@ class BaseCollector(ABC):
         Returns:
             True if collection succeeded, False otherwise
         """
-        start_time = time.time()
+        start = time.perf_counter()
 
         try:
             self.collect()
+            self.last_collection_duration = time.perf_counter() - start
+            # Wall clock on purpose: exported as a Unix timestamp gauge
             self.last_success = time.time()
-            self.last_collection_duration = time.time() - start_time
             self.error_count = 0
 
-            self.logger.debug(
-                f"Collection completed in {self.last_collection_duration:.3f}s"
-            )
+            self.logger.debug("Collection completed in %.3fs", self.last_collection_duration)
             return True
 
         except Exception as e:
             self.error_count += 1
             self.logger.error(
-                f"Collection failed (error #{self.error_count}): {e}",
+                "Collection failed (error #%s): %s", self.error_count, e,
                 exc_info=True
             )
             return False
 
+    def close(self):
+        """Release collector resources (no-op by default)"""
+        pass
+
     def is_healthy(self) -> bool:
         """
         Check if collector is healthy
@@ -9,6 +9,12 @@ from src.collectors.base import BaseCollector
 class CPUCollector(BaseCollector):
     """Collector for CPU metrics"""
 
+    def __init__(self, config):
+        super().__init__(config)
+        # Prime psutil's per-core baseline: later non-blocking calls report
+        # usage since the previous collection instead of sleeping for a sample
+        psutil.cpu_percent(interval=None, percpu=True)
+
     def register_metrics(self, registry):
         """Register Prometheus metrics"""
         # Overall CPU usage
@@ -42,37 +48,56 @@ class CPUCollector(BaseCollector):
             registry=registry
         )
 
+        # Labelled children resolved once; collect() sets them directly
+        self._per_core_gauges = []
+        if self.config.get('per_cpu', True):
+            self._per_core_gauges = [
+                self.cpu_usage_per_core.labels(core=str(i))
+                for i in range(psutil.cpu_count() or 0)
+            ]
+        self._load_gauges = None
+        if hasattr(psutil, 'getloadavg'):
+            self._load_gauges = tuple(
+                self.cpu_load_average.labels(period=period) for period in ('1m', '5m', '15m')
+            )
+        # Only modes this platform reports
+        cpu_time_fields = psutil.cpu_times()._fields
+        self._cpu_time_gauges = tuple(
+            (mode, self.cpu_time_seconds.labels(mode=mode))
+            for mode in ('user', 'system', 'idle', 'iowait')
+            if mode in cpu_time_fields
+        )
+
     def collect(self):
         """Collect CPU metrics"""
-        # Overall CPU usage
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        # One non-blocking per-core sample covering the collection interval;
+        # overall usage is the mean across cores
+        per_cpu = psutil.cpu_percent(interval=None, percpu=True)
+        cpu_percent = sum(per_cpu) / len(per_cpu) if per_cpu else 0.0
         self.cpu_usage_percent.set(cpu_percent)
 
         # Per-core usage (if enabled)
         if self.config.get('per_cpu', True):
-            per_cpu = psutil.cpu_percent(interval=0.1, percpu=True)
-            for i, percent in enumerate(per_cpu):
-                self.cpu_usage_per_core.labels(core=str(i)).set(percent)
+            gauges = self._per_core_gauges
+            if len(gauges) < len(per_cpu):
+                gauges.extend(
+                    self.cpu_usage_per_core.labels(core=str(i))
+                    for i in range(len(gauges), len(per_cpu))
+                )
+            for gauge, percent in zip(gauges, per_cpu):
+                gauge.set(percent)
 
         # Load averages (Unix-like systems only)
-        if hasattr(psutil, 'getloadavg'):
+        if self._load_gauges is not None:
             try:
-                load1, load5, load15 = psutil.getloadavg()
-                self.cpu_load_average.labels(period='1m').set(load1)
-                self.cpu_load_average.labels(period='5m').set(load5)
-                self.cpu_load_average.labels(period='15m').set(load15)
+                for gauge, load in zip(self._load_gauges, psutil.getloadavg()):
+                    gauge.set(load)
             except (AttributeError, OSError):
                 self.logger.debug("Load average not available on this platform")
 
         # CPU times breakdown
         cpu_times = psutil.cpu_times()
-        if hasattr(cpu_times, 'user'):
-            self.cpu_time_seconds.labels(mode='user').set(cpu_times.user)
-        if hasattr(cpu_times, 'system'):
-            self.cpu_time_seconds.labels(mode='system').set(cpu_times.system)
-        if hasattr(cpu_times, 'idle'):
-            self.cpu_time_seconds.labels(mode='idle').set(cpu_times.idle)
-        if hasattr(cpu_times, 'iowait'):
-            self.cpu_time_seconds.labels(mode='iowait').set(cpu_times.iowait)
+        for mode, gauge in self._cpu_time_gauges:
+            gauge.set(getattr(cpu_times, mode))
 
-        self.logger.debug(f"Collected CPU metrics: {cpu_percent:.1f}% used")
+        self.logger.debug("Collected CPU metrics: %.1f%% used", cpu_percent)
@@ -1,9 +1,18 @@
 """Disk metrics collector"""
 
+import array
 import psutil
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from prometheus_client import Gauge, Counter
 from src.collectors.base import BaseCollector
+from src.utils.helpers import calculate_deltas
+
+# How often the mounted partition list is re-read
+PARTITION_REFRESH_SECONDS = 60
+
+# How long one collection waits for disk_usage() calls (e.g. hung NFS mounts)
+USAGE_TIMEOUT_SECONDS = 2
 
 
 class DiskCollector(BaseCollector):
@@ -11,10 +20,28 @@ class DiskCollector(BaseCollector):
 
     def __init__(self, config):
         super().__init__(config)
-        # State for rate calculation
-        self.prev_io_counters = {}
+        # State for rate calculation, as one flat array: device i's previous
+        # read_bytes, write_bytes, read_count, write_count are at 4*i..4*i+3
+        self._device_idx = {}
+        self._prev_io = array.array('Q')
         self.prev_io_time = None
 
+        # statvfs calls run in parallel so one slow mount doesn't serialize
+        # the rest; threads are only started when first needed
+        self._usage_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='disk-usage')
+        self._pending_usage = {}  # mount point -> future that outlived its collection
+        self._mount_points = []
+        self._mount_points_read_at = None
+
+        # Exclusions resolved once: set lookup for filesystems, and a tuple
+        # so str.startswith checks all mount prefixes in one call
+        self._exclude_fs = frozenset(config.get('exclude_filesystems', []))
+        self._exclude_mount_prefixes = tuple(config.get('exclude_mount_points', []))
+
+        # Labelled metric children, resolved on first sight of a mount/device
+        self._usage_children = {}  # mount point -> (total, used, free, percent)
+        self._io_children = {}  # device -> (read_bytes, write_bytes, read_ops, write_ops)
+
     def register_metrics(self, registry):
         """Register Prometheus metrics"""
         # Disk usage metrics
@@ -62,44 +89,67 @@ class DiskCollector(BaseCollector):
         self._collect_usage()
         self._collect_io()
 
+    def _get_mount_points(self):
+        """Get mount points to check, re-reading partitions at most once a minute"""
+        now = time.monotonic()
+        if (self._mount_points_read_at is None
+                or now - self._mount_points_read_at > PARTITION_REFRESH_SECONDS):
+            exclude_fs = self._exclude_fs
+            exclude_mount_prefixes = self._exclude_mount_prefixes
+
+            self._mount_points = [
+                partition.mountpoint
+                for partition in psutil.disk_partitions(all=False)
+                # Filter out excluded filesystems and mount points
+                if partition.fstype not in exclude_fs
+                and not partition.mountpoint.startswith(exclude_mount_prefixes)
+            ]
+            self._mount_points_read_at = now
+
+        return self._mount_points
+
     def _collect_usage(self):
         """Collect disk usage metrics"""
-        exclude_fs = self.config.get('exclude_filesystems', [])
-        exclude_mounts = self.config.get('exclude_mount_points', [])
-
-        for partition in psutil.disk_partitions(all=False):
-            # Filter out excluded filesystems
-            if partition.fstype in exclude_fs:
-                continue
-
-            # Filter out excluded mount points
-            if any(partition.mountpoint.startswith(mp) for mp in exclude_mounts):
-                continue
-
+        futures = {}
+        for mount_point in self._get_mount_points():
+            # Don't pile more calls onto a mount that is still hanging
+            pending = self._pending_usage.get(mount_point)
+            if pending is not None:
+                if not pending.done():
+                    self.logger.debug("Skipping %s: previous usage check still running", mount_point)
+                    continue
+                del self._pending_usage[mount_point]
+
+            futures[self._usage_pool.submit(psutil.disk_usage, mount_point)] = mount_point
+
+        done, not_done = wait(futures, timeout=USAGE_TIMEOUT_SECONDS)
+
+        for future in not_done:
+            mount_point = futures[future]
+            self._pending_usage[mount_point] = future
+            self.logger.warning("Timed out reading disk usage for %s", mount_point)
+
+        for future in done:
+            mount_point = futures[future]
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
-
-                self.disk_usage_bytes.labels(
-                    mount_point=partition.mountpoint,
-                    type='total'
-                ).set(usage.total)
-
-                self.disk_usage_bytes.labels(
-                    mount_point=partition.mountpoint,
-                    type='used'
-                ).set(usage.used)
-
-                self.disk_usage_bytes.labels(
-                    mount_point=partition.mountpoint,
-                    type='free'
-                ).set(usage.free)
+                usage = future.result()
+            except (PermissionError, OSError) as e:
+                self.logger.debug("Cannot access %s: %s", mount_point, e)
+                continue
 
-                self.disk_usage_percent.labels(
-                    mount_point=partition.mountpoint
-                ).set(usage.percent)
+            children = self._usage_children.get(mount_point)
+            if children is None:
+                children = self._usage_children[mount_point] = (
+                    self.disk_usage_bytes.labels(mount_point=mount_point, type='total'),
+                    self.disk_usage_bytes.labels(mount_point=mount_point, type='used'),
+                    self.disk_usage_bytes.labels(mount_point=mount_point, type='free'),
+                    self.disk_usage_percent.labels(mount_point=mount_point),
+                )
 
-            except (PermissionError, OSError) as e:
-                self.logger.debug(f"Cannot access {partition.mountpoint}: {e}")
+            children[0].set(usage.total)
+            children[1].set(usage.used)
+            children[2].set(usage.free)
+            children[3].set(usage.percent)
 
     def _collect_io(self):
         """Collect disk I/O metrics"""
@@ -107,39 +157,49 @@ class DiskCollector(BaseCollector):
             io_counters = psutil.disk_io_counters(perdisk=True)
             current_time = time.time()
 
-            for device, counters in io_counters.items():
-                # Update counters (Prometheus will calculate rates)
-                self.disk_io_read_bytes.labels(device=device).inc(
-                    counters.read_bytes - self.prev_io_counters.get(device, {}).get('read_bytes', 0)
-                    if device in self.prev_io_counters else 0
-                )
-
-                self.disk_io_write_bytes.labels(device=device).inc(
-                    counters.write_bytes - self.prev_io_counters.get(device, {}).get('write_bytes', 0)
-                    if device in self.prev_io_counters else 0
-                )
-
-                self.disk_io_read_operations.labels(device=device).inc(
-                    counters.read_count - self.prev_io_counters.get(device, {}).get('read_count', 0)
-                    if device in self.prev_io_counters else 0
-                )
+            device_idx = self._device_idx
+            prev_io = self._prev_io
 
-                self.disk_io_write_operations.labels(device=device).inc(
-                    counters.write_count - self.prev_io_counters.get(device, {}).get('write_count', 0)
-                    if device in self.prev_io_counters else 0
-                )
+            for device, counters in io_counters.items():
+                current = (counters.read_bytes, counters.write_bytes,
+                           counters.read_count, counters.write_count)
+                idx = device_idx.get(device)
+
+                # A new device only establishes its baseline
+                if idx is None:
+                    device_idx[device] = len(prev_io) // 4
+                    prev_io.extend(current)
+                    dr = dw = dro = dwo = 0
+                else:
+                    # A reset counter (e.g. a re-attached device) counts
+                    # from zero; a negative inc() would raise and skip the
+                    # remaining devices
+                    base = idx * 4
+                    dr, dw, dro, dwo = calculate_deltas(current, prev_io[base:base + 4])
+                    prev_io[base:base + 4] = array.array('Q', current)
+
+                children = self._io_children.get(device)
+                if children is None:
+                    children = self._io_children[device] = (
+                        self.disk_io_read_bytes.labels(device=device),
+                        self.disk_io_write_bytes.labels(device=device),
+                        self.disk_io_read_operations.labels(device=device),
+                        self.disk_io_write_operations.labels(device=device),
+                    )
 
-                # Store current counters for next iteration
-                self.prev_io_counters[device] = {
-                    'read_bytes': counters.read_bytes,
-                    'write_bytes': counters.write_bytes,
-                    'read_count': counters.read_count,
-                    'write_count': counters.write_count,
-                }
+                # Update counters (Prometheus will calculate rates)
+                children[0].inc(dr)
+                children[1].inc(dw)
+                children[2].inc(dro)
+                children[3].inc(dwo)
 
             self.prev_io_time = current_time
 
         except Exception as e:
-            self.logger.warning(f"Failed to collect disk I/O metrics: {e}")
+            self.logger.warning("Failed to collect disk I/O metrics: %s", e)
 
         self.logger.debug("Collected disk metrics")
+
+    def close(self):
+        """Stop the disk usage worker threads"""
+        self._usage_pool.shutdown(wait=False, cancel_futures=True)
@@ -76,6 +76,6 @@ class MemoryCollector(BaseCollector):
         self.swap_usage_percent.set(swap.percent)
 
         self.logger.debug(
-            f"Collected memory metrics: {vm.percent:.1f}% used, "
-            f"swap {swap.percent:.1f}% used"
+            "Collected memory metrics: %.1f%% used, swap %.1f%% used",
+            vm.percent, swap.percent
         )
@@ -1,19 +1,121 @@
 """Network metrics collector"""
 
+import operator
 import psutil
+import re
+import sys
+import threading
 import time
-from prometheus_client import Counter, Gauge
+from collections import Counter as TallyCounter
+from prometheus_client import Counter
+from prometheus_client.core import GaugeMetricFamily
 from src.collectors.base import BaseCollector
 
+# /proc/net/dev rows: "iface: <8 receive fields> <8 transmit fields>". Only
+# the first field may follow the colon unseparated (wide byte counts fill
+# the padding); matching stays within one line, so a truncated row is
+# skipped instead of borrowing numbers from the next
+_PROC_NET_DEV_RE = re.compile(
+    rb'^[ \t]*([^:\s]+):[ \t]*(\d+)' + rb'[ \t]+(\d+)' * 15 + rb'[ \t]*$', re.M
+)
+
+# psutil's sconn is (fd, family, type, laddr, raddr, status, pid); indexing
+# through itemgetter counts faster than the namedtuple's .status property
+_CONN_STATUS = operator.itemgetter(5)
+
+# How often interfaces that have disappeared are pruned
+INTERFACE_REFRESH_SECONDS = 60
+
+
+def _read_proc_net_dev():
+    """
+    Read per-interface counters straight from /proc/net/dev (Linux)
+
+    Returns:
+        Dict of interface -> counters in psutil's snetio field order
+    """
+    with open('/proc/net/dev', 'rb') as f:
+        data = f.read()
+
+    return {
+        fields[0].decode(): (
+            int(fields[9]), int(fields[1]),  # bytes sent/received
+            int(fields[10]), int(fields[2]),  # packets sent/received
+            int(fields[3]), int(fields[11]),  # errors in/out
+            int(fields[4]), int(fields[12]),  # drops in/out
+        )
+        for fields in _PROC_NET_DEV_RE.findall(data)
+    }
+
+
+# Connection states psutil reports; always exported so series don't vanish
+# while a state has no connections
+KNOWN_CONNECTION_STATES = (
+    psutil.CONN_ESTABLISHED, psutil.CONN_SYN_SENT, psutil.CONN_SYN_RECV,
+    psutil.CONN_FIN_WAIT1, psutil.CONN_FIN_WAIT2, psutil.CONN_TIME_WAIT,
+    psutil.CONN_CLOSE, psutil.CONN_CLOSE_WAIT, psutil.CONN_LAST_ACK,
+    psutil.CONN_LISTEN, psutil.CONN_CLOSING, psutil.CONN_NONE,
+)
+
+
+class _ConnectionStateCollector:
+    """Registry collector building network_connections when it is scraped"""
+
+    def __init__(self, network_collector):
+        self._network_collector = network_collector
+        # Family built from the last counts; reused while the counts are
+        # served from the network collector's TTL cache
+        self._counts = None
+        self._snapshot = None
+
+    def _family(self):
+        return GaugeMetricFamily(
+            'network_connections',
+            'Number of network connections by state',
+            labels=['state']
+        )
+
+    def describe(self):
+        yield self._family()
+
+    def collect(self):
+        counts = self._network_collector._collect_connections()
+        if counts is not self._counts:
+            family = self._family()
+            # Nothing is exported when connections can't be read at all
+            if counts:
+                for state in KNOWN_CONNECTION_STATES:
+                    family.add_metric([state], counts.get(state, 0))
+                for state, count in counts.items():
+                    if state not in KNOWN_CONNECTION_STATES:
+                        family.add_metric([state], count)
+            self._counts = counts
+            self._snapshot = family
+        yield self._snapshot
+
 
 class NetworkCollector(BaseCollector):
     """Collector for network metrics"""
 
     def __init__(self, config):
         super().__init__(config)
-        # State for rate calculation
-        self.prev_net_counters = {}
+        # State for rate calculation: interface -> previous counters, kept
+        # as the (immutable) tuple read, so storing them copies nothing
+        self._prev_net = {}
         self.prev_net_time = None
+        self._iface_list_read_at = time.monotonic()
+
+        # Exclusions resolved once into a set lookup
+        self._exclude_interfaces = frozenset(config.get('exclude_interfaces', []))
+
+        # net_connections() walks every process's fds, so its per-state
+        # counts are reused for connections_cache_ttl seconds
+        self._conn_cache = None
+        self._conn_cache_ts = 0.0
+        self._conn_lock = threading.Lock()
+
+        # Labelled metric children, resolved on first sight of an interface
+        self._children = {}  # interface -> counters in the same order as snetio
 
     def register_metrics(self, registry):
         """Register Prometheus metrics"""
@@ -67,91 +169,129 @@ class NetworkCollector(BaseCollector):
             registry=registry
         )
 
-        # Connection states
-        self.network_connections = Gauge(
-            'network_connections',
-            'Number of network connections by state',
-            ['state'],
-            registry=registry
-        )
+        # Connection states are only counted when the registry is collected
+        # (a scrape or alert evaluation), not on every collection interval
+        if self.config.get('collect_connections', True):
+            registry.register(_ConnectionStateCollector(self))
 
     def collect(self):
         """Collect network metrics"""
         self._collect_io()
 
-        if self.config.get('collect_connections', True):
-            self._collect_connections()
-
     def _collect_io(self):
         """Collect network I/O metrics"""
-        exclude_interfaces = self.config.get('exclude_interfaces', [])
+        exclude_interfaces = self._exclude_interfaces
 
         try:
-            net_io = psutil.net_io_counters(pernic=True)
+            # One read and regex pass on Linux instead of psutil building
+            # a namedtuple per interface
+            if sys.platform.startswith('linux'):
+                net_io = _read_proc_net_dev()
+            else:
+                net_io = psutil.net_io_counters(pernic=True)
             current_time = time.time()
 
+            prev_net = self._prev_net
+
             for interface, counters in net_io.items():
                 # Filter out excluded interfaces
                 if interface in exclude_interfaces:
                     continue
 
-                # Calculate deltas and update counters
-                if interface in self.prev_net_counters:
-                    prev = self.prev_net_counters[interface]
-
-                    bytes_recv_delta = max(0, counters.bytes_recv - prev['bytes_recv'])
-                    bytes_sent_delta = max(0, counters.bytes_sent - prev['bytes_sent'])
-                    packets_recv_delta = max(0, counters.packets_recv - prev['packets_recv'])
-                    packets_sent_delta = max(0, counters.packets_sent - prev['packets_sent'])
-                    errin_delta = max(0, counters.errin - prev['errin'])
-                    errout_delta = max(0, counters.errout - prev['errout'])
-                    dropin_delta = max(0, counters.dropin - prev['dropin'])
-                    dropout_delta = max(0, counters.dropout - prev['dropout'])
-
-                    self.network_receive_bytes.labels(interface=interface).inc(bytes_recv_delta)
-                    self.network_transmit_bytes.labels(interface=interface).inc(bytes_sent_delta)
-                    self.network_receive_packets.labels(interface=interface).inc(packets_recv_delta)
-                    self.network_transmit_packets.labels(interface=interface).inc(packets_sent_delta)
-                    self.network_receive_errors.labels(interface=interface).inc(errin_delta)
-                    self.network_transmit_errors.labels(interface=interface).inc(errout_delta)
-                    self.network_receive_drop.labels(interface=interface).inc(dropin_delta)
-                    self.network_transmit_drop.labels(interface=interface).inc(dropout_delta)
-
-                # Store current counters
-                self.prev_net_counters[interface] = {
-                    'bytes_recv': counters.bytes_recv,
-                    'bytes_sent': counters.bytes_sent,
-                    'packets_recv': counters.packets_recv,
-                    'packets_sent': counters.packets_sent,
-                    'errin': counters.errin,
-                    'errout': counters.errout,
-                    'dropin': counters.dropin,
-                    'dropout': counters.dropout,
-                }
+                # The first eight (snetio) fields are the counters we export
+                current = counters[:8]
+                previous = prev_net.get(interface)
+                prev_net[interface] = current
+
+                # A new interface only establishes its baseline
+                if previous is None:
+                    self._children[interface] = tuple(
+                        metric.labels(interface=interface) for metric in self._io_metrics()
+                    )
+                    continue
+
+                # Calculate deltas and update counters; eight compares per
+                # interface cost less inline than a call into a compiled kernel
+                for child, cur, prev in zip(self._children[interface], current, previous):
+                    # A counter that went backwards (interface reset) counts
+                    # from zero, as calculate_deltas does for disks; unchanged
+                    # ones (mostly errors and drops) skip the locked inc()
+                    if cur > prev:
+                        child.inc(cur - prev)
+                    elif cur < prev:
+                        child.inc(cur)
 
             self.prev_net_time = current_time
 
+            # Short-lived interfaces (container veths) would otherwise keep
+            # their state and series forever
+            now = time.monotonic()
+            if now - self._iface_list_read_at > INTERFACE_REFRESH_SECONDS:
+                self._prune_interfaces(net_io)
+                self._iface_list_read_at = now
+
         except Exception as e:
-            self.logger.warning(f"Failed to collect network I/O metrics: {e}")
+            self.logger.warning("Failed to collect network I/O metrics: %s", e)
+
+    def _io_metrics(self):
+        """Per-interface counters in the same order as snetio fields"""
+        return (
+            self.network_transmit_bytes,
+            self.network_receive_bytes,
+            self.network_transmit_packets,
+            self.network_receive_packets,
+            self.network_receive_errors,
+            self.network_transmit_errors,
+            self.network_receive_drop,
+            self.network_transmit_drop,
+        )
+
+    def _prune_interfaces(self, present):
+        """
+        Drop state and series of interfaces that no longer exist
+
+        Args:
+            present: Interfaces in the latest counter read
+        """
+        gone = [interface for interface in self._prev_net if interface not in present]
+        if not gone:
+            return
+
+        for interface in gone:
+            del self._prev_net[interface]
+            del self._children[interface]
+            for metric in self._io_metrics():
+                metric.remove(interface)
+
+        self.logger.debug("Pruned %s vanished interfaces", len(gone))
 
     def _collect_connections(self):
-        """Collect network connection state metrics"""
-        try:
-            connections = psutil.net_connections(kind='inet')
+        """
+        Count network connections by state
 
-            # Count connections by state
-            state_counts = {}
-            for conn in connections:
-                state = conn.status
-                state_counts[state] = state_counts.get(state, 0) + 1
+        Returns:
+            Mapping of connection state to count; empty if unavailable
+        """
+        # Concurrent scrapes share one scan rather than each walking /proc
+        with self._conn_lock:
+            try:
+                now = time.monotonic()
+                ttl = self.config.get('connections_cache_ttl', 15)
 
-            # Update metrics
-            for state, count in state_counts.items():
-                self.network_connections.labels(state=state).set(count)
+                if self._conn_cache is None or now - self._conn_cache_ts >= ttl:
+                    connections = psutil.net_connections(kind='inet')
 
-            self.logger.debug(f"Collected {len(connections)} network connections")
+                    # Count connections by state
+                    self._conn_cache = TallyCounter(map(_CONN_STATUS, connections))
+                    self._conn_cache_ts = now
 
-        except (psutil.AccessDenied, PermissionError) as e:
-            self.logger.debug(f"Cannot access network connections (requires elevated privileges): {e}")
-        except Exception as e:
-            self.logger.warning(f"Failed to collect network connection metrics: {e}")
+                    self.logger.debug("Collected %s network connections", len(connections))
+
+                return self._conn_cache
+
+            except (psutil.AccessDenied, PermissionError) as e:
+                self.logger.debug("Cannot access network connections (requires elevated privileges): %s", e)
+            except Exception as e:
+                self.logger.warning("Failed to collect network connection metrics: %s", e)
+
+            return {}
@@ -1,6 +1,9 @@
 """Process metrics collector"""
 
+import heapq
 import psutil
+import sys
+import time
 from prometheus_client import Gauge
 from src.collectors.base import BaseCollector
 
@@ -8,24 +11,29 @@ from src.collectors.base import BaseCollector
 class ProcessCollector(BaseCollector):
     """Collector for process metrics"""
 
+    def __init__(self, config):
+        super().__init__(config)
+        # (name, user) label sets exported by the last collection
+        self._active_labels = set()
+
     def register_metrics(self, registry):
         """Register Prometheus metrics"""
         self.process_cpu_percent = Gauge(
             'process_cpu_percent',
             'Process CPU usage percentage',
-            ['pid', 'name', 'user'],
+            ['name', 'user'],
             registry=registry
         )
         self.process_memory_bytes = Gauge(
             'process_memory_bytes',
             'Process memory usage in bytes (RSS)',
-            ['pid', 'name', 'user'],
+            ['name', 'user'],
             registry=registry
         )
         self.process_runtime_seconds = Gauge(
             'process_runtime_seconds',
             'Process runtime in seconds',
-            ['pid', 'name', 'user'],
+            ['name', 'user'],
             registry=registry
         )
 
@@ -34,32 +42,32 @@ class ProcessCollector(BaseCollector):
         top_n = self.config.get('top_n', 20)
 
         try:
-            # Get all processes with required attributes
+            # Only what ranking needs is read for every process; oneshot()
+            # serves both values from a single pass over procfs
             processes = []
 
-            for proc in psutil.process_iter(['pid', 'name', 'username', 'cpu_percent', 'memory_info', 'create_time']):
+            for proc in psutil.process_iter():
                 try:
-                    info = proc.info
+                    with proc.oneshot():
+                        info = proc.as_dict(attrs=['cpu_percent', 'memory_info'])
                     processes.append({
-                        'pid': info['pid'],
-                        'name': info['name'] or 'unknown',
-                        'user': info['username'] or 'unknown',
+                        'pid': proc.pid,
+                        'proc': proc,
                         'cpu_percent': info['cpu_percent'] or 0.0,
                         'memory_bytes': info['memory_info'].rss if info['memory_info'] else 0,
-                        'create_time': info['create_time'] or 0,
                     })
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     # Process terminated or access denied, skip it
                     continue
                 except Exception as e:
-                    self.logger.debug(f"Error getting process info: {e}")
+                    self.logger.debug("Error getting process info: %s", e)
                     continue
 
-            # Sort by CPU usage
-            processes_by_cpu = sorted(processes, key=lambda p: p['cpu_percent'], reverse=True)[:top_n]
+            # Top processes by CPU usage
+            processes_by_cpu = heapq.nlargest(top_n, processes, key=lambda p: p['cpu_percent'])
 
-            # Sort by memory usage
-            processes_by_mem = sorted(processes, key=lambda p: p['memory_bytes'], reverse=True)[:top_n]
+            # Top processes by memory usage
+            processes_by_mem = heapq.nlargest(top_n, processes, key=lambda p: p['memory_bytes'])
 
             # Combine and deduplicate
             top_processes = {p['pid']: p for p in processes_by_cpu}
@@ -67,36 +75,53 @@ class ProcessCollector(BaseCollector):
                 if p['pid'] not in top_processes:
                     top_processes[p['pid']] = p
 
+            # Identity attributes (the username needs a passwd lookup) are
+            # only read for the processes that are exported
+            for pid, p in list(top_processes.items()):
+                try:
+                    info = p['proc'].as_dict(attrs=['name', 'username', 'create_time'])
+                except psutil.NoSuchProcess:
+                    del top_processes[pid]
+                    continue
+                # Truncated once and interned: the same names come back
+                # every cycle and end up as label keys, so repeats share one
+                # string and compare by identity in the label dicts
+                p['name'] = sys.intern(info['name'][:50]) if info['name'] else 'unknown'
+                p['user'] = sys.intern(info['username'][:30]) if info['username'] else 'unknown'
+                p['create_time'] = info['create_time'] or 0
+
             # Update metrics
-            import time
             current_time = time.time()
 
+            # Processes sharing a name and user (e.g. worker pools) are
+            # exported as one series, so series don't churn with pids
+            groups = {}
             for proc_info in top_processes.values():
-                pid_str = str(proc_info['pid'])
-                name = proc_info['name'][:50]  # Limit name length
-                user = proc_info['user'][:30]  # Limit user length
-
-                self.process_cpu_percent.labels(
-                    pid=pid_str,
-                    name=name,
-                    user=user
-                ).set(proc_info['cpu_percent'])
-
-                self.process_memory_bytes.labels(
-                    pid=pid_str,
-                    name=name,
-                    user=user
-                ).set(proc_info['memory_bytes'])
-
+                key = (proc_info['name'], proc_info['user'])
                 runtime = current_time - proc_info['create_time']
-                self.process_runtime_seconds.labels(
-                    pid=pid_str,
-                    name=name,
-                    user=user
-                ).set(runtime)
-
-            self.logger.debug(f"Collected metrics for {len(top_processes)} top processes")
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [proc_info['cpu_percent'], proc_info['memory_bytes'], runtime]
+                else:
+                    group[0] += proc_info['cpu_percent']
+                    group[1] += proc_info['memory_bytes']
+                    group[2] = max(group[2], runtime)
+
+            for (name, user), (cpu_percent, memory_bytes, runtime) in groups.items():
+                self.process_cpu_percent.labels(name=name, user=user).set(cpu_percent)
+                self.process_memory_bytes.labels(name=name, user=user).set(memory_bytes)
+                self.process_runtime_seconds.labels(name=name, user=user).set(runtime)
+
+            # Drop series for processes that left the top set
+            active_labels = set(groups)
+            for name, user in self._active_labels - active_labels:
+                self.process_cpu_percent.remove(name, user)
+                self.process_memory_bytes.remove(name, user)
+                self.process_runtime_seconds.remove(name, user)
+            self._active_labels = active_labels
+
+            self.logger.debug("Collected metrics for %s top processes", len(top_processes))
 
         except Exception as e:
-            self.logger.error(f"Failed to collect process metrics: {e}")
+            self.logger.error("Failed to collect process metrics: %s", e)
             raise
@@ -1,13 +1,30 @@
 """Configuration management"""
 
+import copy
 import os
+import warnings
 import yaml
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Callable, Dict, Tuple
+
+# Prefer the libyaml-backed C parser when pyyaml was built with it
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# Defaults merged with the last YAML file read, keyed by (path, st_mtime_ns)
+_CONFIG_CACHE: Dict[tuple, Dict[str, Any]] = {}
 
 
 def get_default_config() -> Dict[str, Any]:
-    """Get default configuration"""
+    """
+    Get default configuration
+
+    Built from the literal on every call rather than cached: callers modify
+    the tree they get, and building it is several times cheaper than
+    deep-copying a cached template would be.
+    """
     return {
         'agent': {
             'hostname': 'auto',
@@ -18,6 +35,8 @@ def get_default_config() -> Dict[str, Any]:
         'prometheus': {
             'port': 9100,
             'host': '0.0.0.0',
+            'reuse_port': False,
+            'max_threads': 4,
         },
         'collectors': {
             'cpu': {
@@ -41,6 +60,7 @@ def get_default_config() -> Dict[str, Any]:
                 'interval': 5,
                 'exclude_interfaces': ['lo'],
                 'collect_connections': True,
+                'connections_cache_ttl': 15,
             },
             'process': {
                 'enabled': True,
@@ -89,6 +109,7 @@ def get_default_config() -> Dict[str, Any]:
             'storage': {
                 'type': 'sqlite',
                 'sqlite_path': './data/alerts.db',
+                'sqlite_wal': True,
                 'retention_days': 30,
             }
         },
@@ -105,18 +126,31 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
     Returns:
         Configuration dictionary
     """
-    # Start with defaults
-    config = get_default_config()
-
     # Load from YAML file if provided
     if config_path and Path(config_path).exists():
-        try:
-            with open(config_path, 'r') as f:
-                yaml_config = yaml.safe_load(f)
-                if yaml_config:
-                    config = merge_configs(config, yaml_config)
-        except Exception as e:
-            raise ValueError(f"Failed to load config from {config_path}: {e}")
+        key = (config_path, Path(config_path).stat().st_mtime_ns)
+        cached = _CONFIG_CACHE.get(key)
+        if cached is None:
+            try:
+                with open(config_path, 'r') as f:
+                    yaml_config = yaml.load(f, Loader=_Loader)
+            except Exception as e:
+                raise ValueError(f"Failed to load config from {config_path}: {e}")
+
+            # Start with defaults
+            cached = get_default_config()
+            if yaml_config:
+                _merge_into(cached, yaml_config)
+
+            # Only the latest version of a file is worth keeping
+            _CONFIG_CACHE.clear()
+            _CONFIG_CACHE[key] = cached
+
+        # Callers may modify their copy, and env overrides are applied below
+        config = copy.deepcopy(cached)
+    else:
+        # Start with defaults
+        config = get_default_config()
 
     # Override with environment variables
     config = override_from_env(config)
@@ -129,51 +163,113 @@ def load_config(config_path: str = None) -> Dict[str, Any]:
 
 def merge_configs(base: Dict, override: Dict) -> Dict:
     """Recursively merge two configuration dictionaries"""
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = merge_configs(result[key], value)
-        else:
-            result[key] = value
+    result = copy.deepcopy(base)
+    _merge_into(result, override)
     return result
 
 
-def override_from_env(config: Dict) -> Dict:
-    """Override configuration from environment variables"""
+def _merge_into(dst: Dict, src: Dict):
+    """Merge src into dst in place, descending into nested dicts"""
+    stack = [(dst, src)]
+    while stack:
+        d, s = stack.pop()
+        for key, value in s.items():
+            if isinstance(value, dict) and isinstance(d.get(key), dict):
+                stack.append((d[key], value))
+            else:
+                d[key] = value
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse an environment flag; only 'true' (any case) is true"""
+    return value.lower() == 'true'
+
+
+# Per-collector settings as (config key, parser); the variable is COLLECTOR_<NAME>_<KEY>
+_COLLECTOR_ENV_FIELDS: Tuple[Tuple[str, Callable[[str], Any]], ...] = (
+    ('enabled', _parse_bool),
+    ('interval', int),
+)
 
+# Environment variable -> (config path, parser), built once at import
+_ENV_MAP: Tuple[Tuple[str, Tuple[str, ...], Callable[[str], Any]], ...] = (
     # Agent settings
-    if 'AGENT_HOSTNAME' in os.environ:
-        config['agent']['hostname'] = os.environ['AGENT_HOSTNAME']
-    if 'LOG_LEVEL' in os.environ:
-        config['agent']['log_level'] = os.environ['LOG_LEVEL'].upper()
-    if 'LOG_FILE' in os.environ:
-        config['agent']['log_file'] = os.environ['LOG_FILE']
-    if 'LOG_FORMAT' in os.environ:
-        config['agent']['log_format'] = os.environ['LOG_FORMAT'].lower()
+    ('AGENT_HOSTNAME', ('agent', 'hostname'), str),
+    ('LOG_LEVEL', ('agent', 'log_level'), str.upper),
+    ('LOG_FILE', ('agent', 'log_file'), str),
+    ('LOG_FORMAT', ('agent', 'log_format'), str.lower),
 
     # Prometheus settings
-    if 'PROMETHEUS_PORT' in os.environ:
-        config['prometheus']['port'] = int(os.environ['PROMETHEUS_PORT'])
-    if 'PROMETHEUS_HOST' in os.environ:
-        config['prometheus']['host'] = os.environ['PROMETHEUS_HOST']
+    ('PROMETHEUS_PORT', ('prometheus', 'port'), int),
+    ('PROMETHEUS_HOST', ('prometheus', 'host'), str),
 
     # Collector settings
-    for collector in ['cpu', 'memory', 'disk', 'network', 'process']:
-        env_prefix = f'COLLECTOR_{collector.upper()}'
+    *(
+        (f'COLLECTOR_{collector.upper()}_{key.upper()}', ('collectors', collector, key), parse)
+        for collector in ('cpu', 'memory', 'disk', 'network', 'process')
+        for key, parse in _COLLECTOR_ENV_FIELDS
+    ),
+)
 
-        # Enabled flag
-        enabled_key = f'{env_prefix}_ENABLED'
-        if enabled_key in os.environ:
-            config['collectors'][collector]['enabled'] = os.environ[enabled_key].lower() == 'true'
 
-        # Interval
-        interval_key = f'{env_prefix}_INTERVAL'
-        if interval_key in os.environ:
-            config['collectors'][collector]['interval'] = int(os.environ[interval_key])
+def override_from_env(config: Dict) -> Dict:
+    """Override configuration from environment variables"""
+    env = os.environ
+    for env_key, path, parse in _ENV_MAP:
+        if env_key in env:
+            section = config
+            for key in path[:-1]:
+                section = section[key]
+            section[path[-1]] = parse(env[env_key])
 
     return config
 
 
+_VALID_LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+_VALID_ACTIONS = ('log', 'disable_collectors', 'stop')
+
+# Unconditional checks as (getter, predicate, message); {v} is the value read
+_VALIDATORS = (
+    (lambda c: c['prometheus']['port'], lambda v: 1 <= v <= 65535,
+     "Invalid Prometheus port: {v}. Must be between 1 and 65535"),
+    (lambda c: c['prometheus'].get('max_threads', 4), lambda v: v >= 1,
+     "Invalid max_threads: {v}. Must be >= 1"),
+    (lambda c: c['agent']['log_level'].upper(), lambda v: v in _VALID_LOG_LEVELS,
+     f"Invalid log level: {{v}}. Must be one of {list(_VALID_LOG_LEVELS)}"),
+    (lambda c: c['resource_limits']['max_cpu_percent'], lambda v: v > 0,
+     "Invalid max_cpu_percent: {v}. Must be > 0"),
+    (lambda c: c['resource_limits']['max_memory_mb'], lambda v: v > 0,
+     "Invalid max_memory_mb: {v}. Must be > 0"),
+    (lambda c: c['resource_limits']['action_on_exceed'], lambda v: v in _VALID_ACTIONS,
+     f"Invalid action_on_exceed: {{v}}. Must be one of {list(_VALID_ACTIONS)}"),
+)
+
+# Checks on the alerting section, applied only when alerting is enabled
+_ALERTING_VALIDATORS = (
+    (lambda a: a.get('evaluation_interval', 30), lambda v: v > 0,
+     "Invalid evaluation_interval: {v}. Must be > 0"),
+    (lambda a: a['storage'].get('type', 'sqlite'), lambda v: v == 'sqlite',
+     "Unsupported storage type: {v}. Only 'sqlite' is currently supported"),
+    (lambda a: a['storage'].get('retention_days', 30), lambda v: v >= 1,
+     "Invalid retention_days: {v}. Must be >= 1"),
+)
+
+# Channel -> fields that must be set when the channel is enabled
+_REQUIRED_CHANNEL_FIELDS = (
+    ('email', ('smtp_host', 'smtp_user', 'smtp_password', 'from_address', 'to_addresses')),
+    ('slack', ('webhook_url',)),
+    ('webhook', ('url',)),
+)
+
+
+def _run_validators(validators, section: Dict):
+    """Apply (getter, predicate, message) checks to a config section"""
+    for getter, ok, message in validators:
+        value = getter(section)
+        if not ok(value):
+            raise ValueError(message.format(v=value))
+
+
 def validate_config(config: Dict):
     """
     Validate configuration values
@@ -181,16 +277,7 @@ def validate_config(config: Dict):
     Raises:
         ValueError: If configuration is invalid
     """
-    # Validate Prometheus port
-    port = config['prometheus']['port']
-    if not (1 <= port <= 65535):
-        raise ValueError(f"Invalid Prometheus port: {port}. Must be between 1 and 65535")
-
-    # Validate log level
-    valid_log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-    log_level = config['agent']['log_level'].upper()
-    if log_level not in valid_log_levels:
-        raise ValueError(f"Invalid log level: {log_level}. Must be one of {valid_log_levels}")
+    _run_validators(_VALIDATORS, config)
 
     # Validate collector intervals
     for collector_name, collector_config in config['collectors'].items():
@@ -201,7 +288,6 @@ def validate_config(config: Dict):
 
             # Warn if interval is too aggressive
             if interval < 1:
-                import warnings
                 warnings.warn(f"Collection interval for {collector_name} is very aggressive: {interval}s")
 
     # Validate process collector top_n
@@ -210,63 +296,25 @@ def validate_config(config: Dict):
         if not (0 < top_n < 1000):
             raise ValueError(f"Invalid top_n for process collector: {top_n}. Must be between 1 and 999")
 
-    # Validate resource limits
-    max_cpu = config['resource_limits']['max_cpu_percent']
-    if max_cpu <= 0:
-        raise ValueError(f"Invalid max_cpu_percent: {max_cpu}. Must be > 0")
-
-    max_memory = config['resource_limits']['max_memory_mb']
-    if max_memory <= 0:
-        raise ValueError(f"Invalid max_memory_mb: {max_memory}. Must be > 0")
-
-    valid_actions = ['log', 'disable_collectors', 'stop']
-    action = config['resource_limits']['action_on_exceed']
-    if action not in valid_actions:
-        raise ValueError(f"Invalid action_on_exceed: {action}. Must be one of {valid_actions}")
-
     # Validate alerting config (if enabled)
     if config.get('alerting', {}).get('enabled', False):
         alerting = config['alerting']
-
-        # Check evaluation interval
-        eval_interval = alerting.get('evaluation_interval', 30)
-        if eval_interval <= 0:
-            raise ValueError(f"Invalid evaluation_interval: {eval_interval}. Must be > 0")
+        channels = alerting['channels']
 
         # Check at least one channel enabled
-        channels_enabled = any(
-            ch.get('enabled', False)
-            for ch in alerting['channels'].values()
-        )
-        if not channels_enabled:
-            import warnings
+        if not any(ch.get('enabled', False) for ch in channels.values()):
             warnings.warn("Alerting enabled but no channels configured")
 
-        # Validate email channel
-        if alerting['channels']['email'].get('enabled'):
-            email = alerting['channels']['email']
-            required_email_fields = ['smtp_host', 'smtp_user', 'smtp_password', 'from_address', 'to_addresses']
-            for field in required_email_fields:
-                if not email.get(field):
-                    raise ValueError(f"Email channel enabled but {field} not set")
-            if not isinstance(email['to_addresses'], list) or len(email['to_addresses']) == 0:
-                raise ValueError("Email channel: to_addresses must be a non-empty list")
-
-        # Validate Slack channel
-        if alerting['channels']['slack'].get('enabled'):
-            if not alerting['channels']['slack'].get('webhook_url'):
-                raise ValueError("Slack channel enabled but webhook_url not set")
-
-        # Validate webhook channel
-        if alerting['channels']['webhook'].get('enabled'):
-            if not alerting['channels']['webhook'].get('url'):
-                raise ValueError("Webhook channel enabled but url not set")
-
-        # Validate storage
-        storage_type = alerting['storage'].get('type', 'sqlite')
-        if storage_type != 'sqlite':
-            raise ValueError(f"Unsupported storage type: {storage_type}. Only 'sqlite' is currently supported")
-
-        retention_days = alerting['storage'].get('retention_days', 30)
-        if retention_days < 1:
-            raise ValueError(f"Invalid retention_days: {retention_days}. Must be >= 1")
+        # Validate enabled channels
+        for channel, fields in _REQUIRED_CHANNEL_FIELDS:
+            channel_config = channels[channel]
+            if channel_config.get('enabled'):
+                for field in fields:
+                    if not channel_config.get(field):
+                        raise ValueError(f"{channel.capitalize()} channel enabled but {field} not set")
+
+        to_addresses = channels['email'].get('to_addresses')
+        if channels['email'].get('enabled') and not isinstance(to_addresses, list):
+            raise ValueError("Email channel: to_addresses must be a non-empty list")
+
+        _run_validators(_ALERTING_VALIDATORS, alerting)
@@ -1,11 +1,79 @@
 """Prometheus HTTP exporter"""
 
-from prometheus_client import start_http_server, REGISTRY, Gauge, Counter, generate_latest
+from prometheus_client import REGISTRY, Gauge, Counter, generate_latest, make_wsgi_app
 from prometheus_client.core import CollectorRegistry
+from prometheus_client.exposition import ThreadingWSGIServer
+from wsgiref.simple_server import WSGIRequestHandler, make_server
+import socket
+import sys
 import threading
+from src.collectors.base import BaseCollector
 from src.utils.logger import get_logger
 
 
+# Seconds a scrape connection may stall before its handler thread gives up
+REQUEST_TIMEOUT_SECONDS = 10
+
+# Seconds the accept loop waits for a free request slot before dropping a
+# connection; kept short so shutdown() is never held up for long
+SLOT_WAIT_SECONDS = 1
+
+
+class _QuietHandler(WSGIRequestHandler):
+    """WSGI request handler that does not log every scrape"""
+
+    # Idle or slow clients would otherwise hold a request slot forever
+    timeout = REQUEST_TIMEOUT_SECONDS
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _BoundedWSGIServer(ThreadingWSGIServer):
+    """Threaded WSGI server running at most max_threads requests at once"""
+
+    max_threads = 4
+
+    def server_activate(self):
+        super().server_activate()
+        self._slots = threading.BoundedSemaphore(self.max_threads)
+
+    def process_request(self, request, client_address):
+        # While every slot is busy, connections are dropped rather than
+        # each getting a thread; the wait is bounded so stalled clients
+        # can't block the accept loop (and with it shutdown())
+        if not self._slots.acquire(timeout=SLOT_WAIT_SECONDS):
+            self.shutdown_request(request)
+            return
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._slots.release()
+
+    def handle_error(self, request, client_address):
+        # Clients stalling past the handler timeout are expected, not bugs
+        if isinstance(sys.exc_info()[1], socket.timeout):
+            return
+        super().handle_error(request, client_address)
+
+
+class _ReusePortWSGIServer(_BoundedWSGIServer):
+    """Bounded WSGI server that binds with SO_REUSEPORT"""
+
+    def server_bind(self):
+        # Lets several agent processes share the port; the kernel then
+        # load-balances incoming scrape connections between them
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
 class PrometheusExporter:
     """Prometheus HTTP server for exposing metrics"""
 
@@ -23,11 +91,20 @@ class PrometheusExporter:
 
         self.host = config.get('prometheus', {}).get('host', '0.0.0.0')
         self.port = config.get('prometheus', {}).get('port', 9100)
+        self.reuse_port = config.get('prometheus', {}).get('reuse_port', False)
+        self.max_threads = config.get('prometheus', {}).get('max_threads', 4)
 
         self.registry = CollectorRegistry()
         self.server_thread = None
+        self._httpd = None
         self.running = False
 
+        # Collector name -> (last_success, duration, status, errors) children
+        self._child_cache = {}
+        # Collector name -> [last_success, duration, status, error_count]
+        # as of the last update
+        self._last_written = {}
+
         # Register agent self-monitoring metrics
         self._setup_agent_metrics()
 
@@ -39,7 +116,16 @@ class PrometheusExporter:
         self.agent_info = Gauge(
             'agent_info',
             'Agent information',
-            ['version', 'hostname'],
+            ['version'],
+            registry=self.registry
+        )
+
+        # Hostname is constant per agent, so it is published once here
+        # rather than stamped onto other series
+        self.agent_hostname_info = Gauge(
+            'agent_hostname_info',
+            'Hostname the agent reports for this host',
+            ['hostname'],
             registry=self.registry
         )
 
@@ -76,25 +162,60 @@ class PrometheusExporter:
         for collector in self.collectors:
             try:
                 collector.register_metrics(self.registry)
-                self.logger.info(f"Registered metrics for {collector.get_name()}")
+                self.logger.info("Registered metrics for %s", collector.get_name())
             except Exception as e:
-                self.logger.error(f"Failed to register metrics for {collector.get_name()}: {e}")
+                self.logger.exception("Failed to register metrics for %s: %s", collector.get_name(), e)
 
     def start(self):
         """Start HTTP server"""
         try:
-            self.logger.info(f"Starting Prometheus HTTP server on {self.host}:{self.port}")
-            start_http_server(self.port, addr=self.host, registry=self.registry)
+            self.logger.info("Starting Prometheus HTTP server on %s:%s", self.host, self.port)
+            server_class = _BoundedWSGIServer
+            if self.reuse_port and hasattr(socket, 'SO_REUSEPORT'):
+                server_class = _ReusePortWSGIServer
+            elif self.reuse_port:
+                self.logger.warning("SO_REUSEPORT not supported on this platform, ignoring reuse_port")
+            self._start_server(server_class)
             self.running = True
-            self.logger.info(f"Prometheus HTTP server started successfully")
-            self.logger.info(f"Metrics available at http://{self.host}:{self.port}/metrics")
+            self.logger.info("Prometheus HTTP server started successfully")
+            self.logger.info("Metrics available at http://%s:%s/metrics", self.host, self.port)
         except Exception as e:
-            self.logger.error(f"Failed to start Prometheus HTTP server: {e}")
+            self.logger.exception("Failed to start Prometheus HTTP server: %s", e)
             raise
 
+    def _start_server(self, server_class):
+        """
+        Start the metrics HTTP server on its own thread
+
+        Args:
+            server_class: _BoundedWSGIServer subclass to serve with
+        """
+        family = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)[0][0]
+
+        class _Server(server_class):
+            address_family = family
+            max_threads = self.max_threads
+
+        self._httpd = make_server(
+            self.host, self.port, make_wsgi_app(self.registry),
+            _Server, handler_class=_QuietHandler
+        )
+        self.server_thread = threading.Thread(
+            target=self._httpd.serve_forever, daemon=True, name="prometheus-http"
+        )
+        self.server_thread.start()
+
     def stop(self):
         """Stop HTTP server"""
         self.running = False
+        if self._httpd:
+            # Stops the accept loop, then closes the listening socket
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        if self.server_thread:
+            self.server_thread.join(timeout=5)
+            self.server_thread = None
         self.logger.info("Prometheus HTTP server stopped")
 
     def update_agent_metrics(self, collectors):
@@ -102,30 +223,62 @@ class PrometheusExporter:
         Update agent self-monitoring metrics
 
         Args:
-            collectors: List of collectors to update metrics for
+            collectors: A single collector, or an iterable of collectors
+                to update metrics for
         """
+        # Fast path for the per-tick single collector update
+        if isinstance(collectors, BaseCollector):
+            self._update_collector_metrics(collectors)
+            return
+
         for collector in collectors:
-            collector_name = collector.get_name()
-
-            # Update last success timestamp
-            if collector.last_success:
-                self.agent_collector_last_success.labels(
-                    collector=collector_name
-                ).set(collector.last_success)
-
-            # Update collection duration
-            self.agent_collector_duration.labels(
-                collector=collector_name
-            ).set(collector.last_collection_duration)
-
-            # Update collector status
-            status = 1 if collector.is_healthy() else 0
-            self.agent_collector_status.labels(
-                collector=collector_name
-            ).set(status)
-
-            # Update error count (if there were new errors)
-            if collector.error_count > 0:
-                self.agent_collector_errors.labels(
-                    collector=collector_name
-                ).inc()
+            self._update_collector_metrics(collector)
+
+    def _update_collector_metrics(self, collector):
+        """
+        Update self-monitoring metrics for one collector
+
+        Args:
+            collector: Collector to update metrics for
+        """
+        collector_name = collector.get_name()
+
+        children = self._child_cache.get(collector_name)
+        if children is None:
+            children = self._child_cache[collector_name] = (
+                self.agent_collector_last_success.labels(collector=collector_name),
+                self.agent_collector_duration.labels(collector=collector_name),
+                self.agent_collector_status.labels(collector=collector_name),
+                self.agent_collector_errors.labels(collector=collector_name),
+            )
+            self._last_written[collector_name] = [None, None, None, 0]
+
+        # Gauges are only written when their value changed since last tick;
+        # status in particular stays the same almost always
+        written = self._last_written[collector_name]
+
+        # Update last success timestamp
+        last_success = collector.last_success
+        if last_success and last_success != written[0]:
+            children[0].set(last_success)
+            written[0] = last_success
+
+        # Update collection duration
+        duration = collector.last_collection_duration
+        if duration != written[1]:
+            children[1].set(duration)
+            written[1] = duration
+
+        # Update collector status
+        status = 1 if collector.is_healthy() else 0
+        if status != written[2]:
+            children[2].set(status)
+            written[2] = status
+
+        # Count errors since the last update; error_count is consecutive
+        # failures, so it drops back to 0 after a success
+        error_count = collector.error_count
+        new_errors = error_count - written[3] if error_count >= written[3] else error_count
+        if new_errors > 0:
+            children[3].inc(new_errors)
+        written[3] = error_count
@@ -5,7 +5,7 @@ import argparse
 from pathlib import Path
 
 from src.config.settings import load_config
-from src.utils.logger import setup_logger
+from src.utils.logger import setup_logger, stop_logger
 from src.agent import Agent
 
 
@@ -61,7 +61,7 @@ def main():
         logger.info("=" * 60)
 
         if args.config:
-            logger.info(f"Loaded configuration from: {args.config}")
+            logger.info("Loaded configuration from: %s", args.config)
         else:
             logger.info("Using default configuration")
 
@@ -79,6 +79,9 @@ def main():
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        # Flush records still queued for the listener thread
+        stop_logger()
 
 
 if __name__ == '__main__':
@@ -1,24 +1,27 @@
 """Utility helper functions"""
 
+import functools
 import socket
 import platform
 
 
+@functools.lru_cache(maxsize=1)
 def get_hostname():
-    """Get system hostname"""
+    """Get system hostname (looked up once; it doesn't change while running)"""
     try:
         return socket.gethostname()
     except Exception:
         return platform.node() or "unknown"
 
 
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+
 def format_bytes(bytes_value):
     """Format bytes to human-readable format"""
-    for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-        if bytes_value < 1024.0:
-            return f"{bytes_value:.2f} {unit}"
-        bytes_value /= 1024.0
-    return f"{bytes_value:.2f} PB"
+    # Each unit is 10 more bits, so the unit follows from the bit length
+    idx = min(max(int(bytes_value).bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{bytes_value / (1 << (idx * 10)):.2f} {_BYTE_UNITS[idx]}"
 
 
 def safe_divide(a, b, default=0.0):
@@ -42,3 +45,8 @@ def calculate_rate(current, previous, interval):
         delta = current
 
     return safe_divide(delta, interval)
+
+
+def calculate_deltas(current, previous):
+    """Calculate the increase of several counters at once (a counter that went backwards was reset)"""
+    return [cur - prev if cur >= prev else cur for cur, prev in zip(current, previous)]
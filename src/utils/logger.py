@@ -1,10 +1,73 @@
 """Logging configuration"""
 
+import atexit
+import copy
 import logging
+import queue
 import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from pythonjsonlogger import jsonlogger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DATE_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+
+class _CachedTimeMixin:
+    """Formatter mixin re-running strftime only when the second changes"""
+
+    # (second, formatted time) swapped as one tuple so threads never pair
+    # one second with another's text
+    _cached_time = (None, '')
+
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached = self._cached_time
+        if cached[0] != second:
+            cached = (second, time.strftime(datefmt or DATE_FORMAT, self.converter(second)))
+            self._cached_time = cached
+        return cached[1]
+
+
+class _TextFormatter(_CachedTimeMixin, logging.Formatter):
+    """Plain text formatter with cached timestamps"""
+
+
+class _JsonLoggerFormatter(_CachedTimeMixin, jsonlogger.JsonFormatter):
+    """python-json-logger formatter with cached timestamps"""
+
+
+class OrjsonFormatter(_CachedTimeMixin, logging.Formatter):
+    """JSON log formatter serializing each record with orjson"""
+
+    def format(self, record):
+        payload = {
+            'timestamp': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return orjson.dumps(payload).decode('utf-8')
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """Queue handler leaving all formatting to the listener thread"""
+
+    def prepare(self, record):
+        # Merge args now, while they hold their logged values, but keep
+        # exc_info so the listener's formatter renders the traceback itself
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 
 def setup_logger(config):
     """
@@ -22,21 +85,25 @@ def setup_logger(config):
     logger.setLevel(getattr(logging, log_level, logging.INFO))
 
     # Remove existing handlers
+    stop_logger()
     logger.handlers.clear()
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(getattr(logging, log_level, logging.INFO))
 
-    if log_format == 'json':
-        formatter = jsonlogger.JsonFormatter(
-            '%(timestamp)s %(level)s %(name)s %(message)s',
+    if log_format == 'json' and orjson is not None:
+        formatter = OrjsonFormatter(datefmt=DATE_FORMAT)
+    elif log_format == 'json':
+        formatter = _JsonLoggerFormatter(
+            '%(asctime)s %(levelname)s %(name)s %(message)s',
+            datefmt=DATE_FORMAT,
             rename_fields={'levelname': 'level', 'name': 'logger', 'asctime': 'timestamp'}
         )
     else:
-        formatter = logging.Formatter(
+        formatter = _TextFormatter(
             '%(asctime)s [%(levelname)s] %(name)s - %(message)s',
-            datefmt='%Y-%m-%dT%H:%M:%S'
+            datefmt=DATE_FORMAT
         )
 
     console_handler.setFormatter(formatter)
@@ -55,9 +122,38 @@ def setup_logger(config):
         except Exception as e:
             logger.warning(f"Failed to setup file logging: {e}")
 
+    # Formatting and I/O move to a listener thread, so logging threads only
+    # enqueue records instead of holding a handler lock while writing
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers[:] = [_DeferredQueueHandler(log_queue)]
+    logger._listener = listener
+    listener.start()
+
+    # The listener thread is a daemon, so records still queued when the
+    # interpreter exits would be lost without a final flush
+    atexit.unregister(stop_logger)
+    atexit.register(stop_logger)
+
     return logger
 
 
+def stop_logger():
+    """
+    Flush queued records and stop the listener thread started by setup_logger
+
+    Later records are written synchronously by the same handlers.
+    """
+    logger = logging.getLogger('agent')
+    listener = getattr(logger, '_listener', None)
+    if listener is None:
+        return
+
+    listener.stop()
+    logger._listener = None
+    logger.handlers[:] = list(listener.handlers)
+
+
 def get_logger(name):
     """Get logger instance"""
     return logging.getLogger(f'agent.{name}')
@@ -3,6 +3,7 @@ Utility for reading metrics from Prometheus registry.
 """
 
 import logging
+import time
 from typing import Dict, List, Tuple, Optional
 from prometheus_client import CollectorRegistry
 
@@ -12,15 +13,23 @@ logger = logging.getLogger(__name__)
 class MetricReader:
     """Reads current metric values from Prometheus registry"""
 
-    def __init__(self, registry: CollectorRegistry):
+    def __init__(self, registry: CollectorRegistry, snapshot_ttl: float = 0.5):
         """
         Initialize metric reader.
 
         Args:
             registry: Prometheus CollectorRegistry instance
+            snapshot_ttl: Seconds one registry.collect() is reused across reads
         """
         self.registry = registry
 
+        # Samples by metric family name, filled per owning collector as
+        # metrics are read; complete once the whole registry was collected
+        self._snapshot: Dict[str, list] = {}
+        self._snapshot_complete = False
+        self._snapshot_ts: Optional[float] = None
+        self._ttl = snapshot_ttl
+
     def get_metric_value(self, metric_name: str,
                         label_selector: Optional[Dict[str, str]] = None) -> List[Tuple[float, Dict[str, str]]]:
         """
@@ -40,56 +49,100 @@ class MetricReader:
             >>> reader.get_metric_value('disk_usage_percent', {'mount_point': '/'})
             [(78.5, {'mount_point': '/', 'device': '/dev/sda1'})]
         """
-        results = []
+        results = self.get_all_series(metric_name)
 
-        try:
-            # Collect all metrics from registry
-            for metric_family in self.registry.collect():
-                if metric_family.name != metric_name:
-                    continue
+        # Apply label selector filter
+        if label_selector:
+            selector_items = label_selector.items()
+            results = [
+                (value, labels) for value, labels in results
+                if selector_items <= labels.items()
+            ]
+
+        if not results:
+            logger.debug(f"No values found for metric {metric_name} with selector {label_selector}")
 
-                # Iterate through samples
-                for sample in metric_family.samples:
-                    # Sample format: (name, labels_dict, value)
-                    sample_name = sample.name
-                    sample_labels = sample.labels
-                    sample_value = sample.value
+        return results
 
-                    # Apply label selector filter
-                    if label_selector:
-                        if not self._match_labels(sample_labels, label_selector):
-                            continue
+    def get_all_series(self, metric_name: str) -> List[Tuple[float, Dict[str, str]]]:
+        """
+        Get current values for every label combination of a metric.
 
-                    results.append((sample_value, dict(sample_labels)))
+        Callers evaluating several selectors against the same metric can
+        read it once with this method and filter the result themselves.
 
-                # Found the metric family, no need to continue
-                break
+        Args:
+            metric_name: Name of the metric to read
 
-            if not results:
-                logger.debug(f"No values found for metric {metric_name} with selector {label_selector}")
+        Returns:
+            List of (value, labels) tuples for all metric samples; labels
+            are the registry's own dicts and must not be modified
+        """
+        try:
+            samples = self._get_samples(metric_name)
 
-            return results
+            # Sample format: (name, labels_dict, value)
+            return [(sample.value, sample.labels) for sample in samples]
 
         except Exception as e:
             logger.error(f"Error reading metric {metric_name}: {e}")
             return []
 
-    def _match_labels(self, sample_labels: Dict[str, str],
-                     selector: Dict[str, str]) -> bool:
+    def _expire_snapshot(self) -> None:
+        """Start a new, empty snapshot once the current one is older than the TTL"""
+        now = time.monotonic()
+        if self._snapshot_ts is None or now - self._snapshot_ts > self._ttl:
+            self._snapshot = {}
+            self._snapshot_complete = False
+            self._snapshot_ts = now
+
+    def _add_to_snapshot(self, families) -> None:
+        """Record collected metric families in the snapshot"""
+        for metric_family in families:
+            self._snapshot[metric_family.name] = metric_family.samples
+
+    def _get_samples(self, metric_name: str) -> list:
         """
-        Check if sample labels match selector.
+        Get a metric's samples, collecting only the collector that owns it.
 
         Args:
-            sample_labels: Labels from metric sample
-            selector: Required label key-value pairs
+            metric_name: Metric family name
 
         Returns:
-            True if all selector labels match sample labels
+            Samples of the metric (empty if it isn't registered)
         """
-        for key, value in selector.items():
-            if sample_labels.get(key) != value:
-                return False
-        return True
+        self._expire_snapshot()
+
+        samples = self._snapshot.get(metric_name)
+        if samples is None and not self._snapshot_complete:
+            # Private in prometheus_client, hence the full-scan fallback
+            names_to_collectors = getattr(self.registry, '_names_to_collectors', None)
+            collector = names_to_collectors.get(metric_name) if names_to_collectors else None
+
+            if collector is not None:
+                self._add_to_snapshot(collector.collect())
+            else:
+                self._get_snapshot()
+            samples = self._snapshot.get(metric_name)
+
+        return samples or []
+
+    def _get_snapshot(self) -> Dict[str, list]:
+        """
+        Get samples by metric family name for the whole registry.
+
+        Returns:
+            Dict of metric family name -> samples
+        """
+        self._expire_snapshot()
+        if not self._snapshot_complete:
+            self._add_to_snapshot(self.registry.collect())
+            self._snapshot_complete = True
+        return self._snapshot
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot so the next read collects the registry"""
+        self._snapshot_ts = None
 
     def get_all_metric_names(self) -> List[str]:
         """
@@ -98,12 +151,8 @@ class MetricReader:
         Returns:
             List of metric names
         """
-        metric_names = set()
-
         try:
-            for metric_family in self.registry.collect():
-                metric_names.add(metric_family.name)
+            return sorted(self._get_snapshot())
         except Exception as e:
             logger.error(f"Error getting metric names: {e}")
-
-        return sorted(metric_names)
+            return []
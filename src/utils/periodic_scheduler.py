@@ -0,0 +1,139 @@
+"""
+Heap-based scheduler for periodic tasks.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import Executor, Future, wait
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+
+class PeriodicScheduler:
+    """Runs periodic tasks from one thread using a min-heap of due times"""
+
+    def __init__(self, stop_event: threading.Event, name: str = "scheduler",
+                 executor: Optional[Executor] = None):
+        """
+        Initialize scheduler.
+
+        Args:
+            stop_event: Event that stops the scheduler thread when set
+            name: Name of the scheduler thread
+            executor: Optional executor that runs non-inline tasks so slow
+                tasks do not delay others; without one every task runs
+                on the scheduler thread
+        """
+        self.stop_event = stop_event
+        self.name = name
+        self.executor = executor
+        self.logger = get_logger(self.__class__.__name__)
+        self.thread: Optional[threading.Thread] = None
+
+        # Heap entries: (next_run, seq, interval, task_name, func, inline);
+        # seq breaks ties so callables are never compared
+        self._heap: List[Tuple[float, int, float, str, Callable[[], None], bool]] = []
+        self._seq = itertools.count()
+
+        # Last (task_name, executor future) per task (keyed by seq), used to
+        # avoid running the same task concurrently with itself
+        self._inflight: Dict[int, Tuple[str, Future]] = {}
+
+    def add_task(self, name: str, func: Callable[[], None], interval: float,
+                 delay: float = 0.0, inline: bool = False) -> None:
+        """
+        Register a periodic task. Tasks must be added before start().
+
+        Args:
+            name: Task name used in log messages
+            func: Callable run once per interval
+            interval: Seconds between runs
+            delay: Seconds before the first run
+            inline: Run on the scheduler thread even if an executor is set
+        """
+        heapq.heappush(
+            self._heap,
+            (time.monotonic() + delay, next(self._seq), interval, name, func, inline)
+        )
+
+    def start(self) -> None:
+        """Start the scheduler thread"""
+        self.thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+        self.thread.start()
+
+    def join(self, timeout: Optional[float] = None) -> List[str]:
+        """
+        Wait for the scheduler thread and any in-flight tasks to finish.
+
+        Both waits share one deadline, so the total wait is bounded by
+        timeout rather than accumulating per task.
+
+        Args:
+            timeout: Maximum seconds to wait in total
+
+        Returns:
+            Names of the scheduler thread and tasks still running at the deadline
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        def remaining() -> Optional[float]:
+            return None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        # A task may call stop() from the scheduler thread itself
+        current = threading.current_thread()
+        if self.thread and self.thread is not current:
+            self.thread.join(timeout=remaining())
+
+        still_running = []
+        if self.thread and self.thread.is_alive() and self.thread is not current:
+            still_running.append(self.name)
+
+        names = {future: name for name, future in self._inflight.values()}
+        _, not_done = wait(names, timeout=remaining())
+        still_running.extend(names[future] for future in not_done)
+        return still_running
+
+    def _run(self) -> None:
+        """Scheduler loop: sleep until the earliest task is due, run it, reschedule"""
+        while self._heap:
+            next_run, seq, interval, name, func, inline = self._heap[0]
+
+            delay = next_run - time.monotonic()
+            if delay > 0 and self.stop_event.wait(timeout=delay):
+                break
+            if self.stop_event.is_set():
+                break
+
+            heapq.heappop(self._heap)
+            if self.executor is None or inline:
+                self._run_task(name, func)
+            else:
+                previous = self._inflight.get(seq)
+                if previous is not None and not previous[1].done():
+                    # Previous run has not finished; never overlap a task
+                    # with itself (collector state is single-threaded)
+                    self.logger.warning("Scheduled task %s still running, skipping this run", name)
+                else:
+                    try:
+                        self._inflight[seq] = (name, self.executor.submit(self._run_task, name, func))
+                    except RuntimeError:
+                        # Executor was shut down by stop()
+                        break
+
+            # Keep a fixed cadence; if a run overran, skip missed slots
+            # instead of running back-to-back to catch up
+            next_run += interval
+            now = time.monotonic()
+            if next_run < now:
+                next_run = now + interval
+            heapq.heappush(self._heap, (next_run, seq, interval, name, func, inline))
+
+    def _run_task(self, name: str, func: Callable[[], None]) -> None:
+        """Run a task, logging any exception it raises"""
+        try:
+            func()
+        except Exception as e:
+            self.logger.error("Error in scheduled task %s: %s", name, e, exc_info=True)
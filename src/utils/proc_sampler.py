@@ -0,0 +1,51 @@
+"""
+Rate-limited sampling of process CPU and memory usage.
+"""
+
+import os
+import threading
+import time
+from typing import Optional, Tuple
+
+import psutil
+
+
+class ProcSampler:
+    """Samples CPU and RSS of a process, caching results for a minimum interval"""
+
+    def __init__(self, pid: Optional[int] = None, min_interval: float = 0.5):
+        """
+        Initialize process sampler.
+
+        Args:
+            pid: Process ID to sample (defaults to the current process)
+            min_interval: Minimum seconds between psutil queries; callers
+                polling more often get the cached sample
+        """
+        self.process = psutil.Process(pid if pid is not None else os.getpid())
+        self.min_interval = min_interval
+
+        self._lock = threading.Lock()
+        self.last_ts: Optional[float] = None
+        self.last_cpu = 0.0
+        self.last_rss = 0
+
+        # Prime the non-blocking CPU counter; the first real sample then
+        # covers the time since construction
+        self.process.cpu_percent(interval=None)
+
+    def sample(self) -> Tuple[float, int]:
+        """
+        Get CPU percent and RSS bytes, re-querying psutil only when stale.
+
+        Returns:
+            Tuple of (cpu_percent, rss_bytes)
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.last_ts is None or now - self.last_ts >= self.min_interval:
+                self.last_cpu = self.process.cpu_percent(interval=None)
+                self.last_rss = self.process.memory_info().rss
+                self.last_ts = now
+
+            return self.last_cpu, self.last_rss
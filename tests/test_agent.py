@@ -0,0 +1,88 @@
+"""Tests for agent lifecycle"""
+
+import signal
+import threading
+
+import pytest
+
+from src.agent import Agent
+from src.config.settings import get_default_config
+
+
+@pytest.fixture
+def config():
+    """Default config with one cheap collector and an ephemeral metrics port"""
+    config = get_default_config()
+    for name, collector_config in config['collectors'].items():
+        collector_config['enabled'] = name == 'memory'
+    config['prometheus'].update({'host': '127.0.0.1', 'port': 0})
+    return config
+
+
+def run_in_thread(target):
+    """Run target on a worker thread, returning (thread, result dict)"""
+    result = {}
+
+    def run():
+        try:
+            result['value'] = target()
+        except Exception as e:
+            result['error'] = e
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread, result
+
+
+class TestAgentLifecycle:
+    """Test running the agent embedded in another application"""
+
+    def test_construct_off_main_thread(self, config):
+        """Test an agent built on a worker thread installs no signal handlers"""
+        handler = signal.getsignal(signal.SIGTERM)
+        stop_event = threading.Event()
+
+        thread, result = run_in_thread(lambda: Agent(config, stop_event))
+        thread.join(timeout=5)
+
+        assert 'error' not in result
+        assert not result['value'].running
+        assert signal.getsignal(signal.SIGTERM) is handler
+        # The embedder's event is left alone
+        assert not stop_event.is_set()
+
+    def test_external_stop_event_stops_agent(self, config):
+        """Test setting the embedder's event stops an agent running on a worker thread"""
+        stop_event = threading.Event()
+        thread, result = run_in_thread(lambda: Agent(config, stop_event))
+        thread.join(timeout=5)
+        agent = result['value']
+
+        thread, result = run_in_thread(agent.start)
+        thread.join(timeout=1)
+        assert thread.is_alive()
+        assert agent.running
+
+        stop_event.set()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert 'error' not in result
+        assert not agent.running
+        assert agent.exporter._httpd is None
+        # Never cleared by the agent
+        assert stop_event.is_set()
+
+    def test_stop_requested_before_start(self, config):
+        """Test start() returns at once if the external event is already set"""
+        stop_event = threading.Event()
+        thread, result = run_in_thread(lambda: Agent(config, stop_event))
+        thread.join(timeout=5)
+        agent = result['value']
+
+        stop_event.set()
+        agent.start()
+
+        assert not agent.running
+        assert agent.exporter._httpd is None
+        assert stop_event.is_set()
@@ -0,0 +1,23 @@
+"""Shared fixtures for alerting tests"""
+
+import pytest
+
+from src.alerts.alert_rule import AlertRule
+
+
+@pytest.fixture
+def make_rule():
+    """Factory for alert rules that fire immediately; any field can be overridden"""
+    def _make_rule(name="cpu_high", **overrides):
+        fields = {
+            'metric_name': "cpu_usage_percent",
+            'operator': ">",
+            'threshold': 80.0,
+            'for_duration_minutes': 0,
+            'severity': "warning",
+            'channels': ["email"],
+        }
+        fields.update(overrides)
+        return AlertRule(name=name, **fields)
+
+    return _make_rule
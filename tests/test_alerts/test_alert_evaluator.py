@@ -0,0 +1,160 @@
+"""Tests for AlertEvaluator rule evaluation"""
+
+import pytest
+from prometheus_client import CollectorRegistry, Gauge
+
+from src.alerts.alert_evaluator import AlertEvaluator
+
+
+class FakeAlertManager:
+    """Records process/resolve calls instead of tracking alerts"""
+
+    def __init__(self):
+        self.processed = []
+        self.resolved = []
+
+    def process_alert(self, rule, value, labels):
+        self.processed.append((rule.name, value, labels))
+
+    def resolve_alert(self, rule, labels):
+        self.resolved.append((rule.name, labels))
+
+
+class TestAlertEvaluator:
+    """Test AlertEvaluator"""
+
+    @pytest.fixture
+    def registry(self):
+        """Registry with a CPU gauge and a labelled disk gauge"""
+        registry = CollectorRegistry()
+        cpu = Gauge('cpu_usage_percent', 'CPU usage', registry=registry)
+        cpu.set(90.0)
+        disk = Gauge('disk_usage_percent', 'Disk usage', ['mount_point'], registry=registry)
+        disk.labels(mount_point='/').set(95.0)
+        disk.labels(mount_point='/home').set(50.0)
+        return registry
+
+    @pytest.fixture
+    def manager(self):
+        return FakeAlertManager()
+
+    def test_condition_met_and_not_met(self, registry, manager, make_rule):
+        """Test rules dispatch to process_alert or resolve_alert"""
+        rules = [
+            make_rule("cpu_high", threshold=80.0),
+            make_rule("cpu_very_high", threshold=95.0),
+        ]
+        evaluator = AlertEvaluator(rules, registry, manager)
+
+        evaluator.evaluate_all_rules()
+
+        assert manager.processed == [("cpu_high", 90.0, {})]
+        assert manager.resolved == [("cpu_very_high", {})]
+
+    def test_label_selector(self, registry, manager, make_rule):
+        """Test label selector restricts evaluated series"""
+        rule = make_rule("disk_root", metric_name="disk_usage_percent",
+                         threshold=90.0, label_selector={'mount_point': '/'})
+        evaluator = AlertEvaluator([rule], registry, manager)
+
+        evaluator.evaluate_all_rules()
+
+        assert manager.processed == [("disk_root", 95.0, {'mount_point': '/'})]
+        assert manager.resolved == []
+
+    def test_disabled_rules_skipped(self, registry, manager, make_rule):
+        """Test disabled rules are not evaluated"""
+        rules = [
+            make_rule("enabled_rule"),
+            make_rule("disabled_rule", enabled=False),
+        ]
+        evaluator = AlertEvaluator(rules, registry, manager)
+
+        evaluator.evaluate_all_rules()
+
+        assert [name for name, _, _ in manager.processed] == ["enabled_rule"]
+        assert evaluator.get_rule_count() == 2
+        assert evaluator.get_enabled_rule_count() == 1
+
+    def test_add_remove_and_toggle_rules(self, registry, manager, make_rule):
+        """Test rule mutations keep the enabled set consistent"""
+        evaluator = AlertEvaluator([], registry, manager)
+
+        evaluator.add_rule(make_rule("rule1"))
+        evaluator.add_rule(make_rule("rule2", enabled=False))
+        assert evaluator.get_enabled_rule_count() == 1
+
+        assert evaluator.set_rule_enabled("rule2", True)
+        assert evaluator.get_enabled_rule_count() == 2
+
+        assert evaluator.remove_rule("rule1")
+        assert not evaluator.remove_rule("rule1")
+        assert not evaluator.set_rule_enabled("missing", True)
+
+        evaluator.evaluate_all_rules()
+        assert [name for name, _, _ in manager.processed] == ["rule2"]
+
+    def test_metric_read_once_per_tick(self, registry, manager, mocker, make_rule):
+        """Test rules sharing a metric share a single registry read"""
+        rules = [
+            make_rule("disk_root", metric_name="disk_usage_percent",
+                      label_selector={'mount_point': '/'}),
+            make_rule("disk_home", metric_name="disk_usage_percent",
+                      label_selector={'mount_point': '/home'}),
+            make_rule("cpu_high"),
+        ]
+        evaluator = AlertEvaluator(rules, registry, manager)
+        spy = mocker.spy(evaluator.metric_reader, 'get_all_series')
+
+        evaluator.evaluate_all_rules()
+
+        assert sorted(call.args[0] for call in spy.call_args_list) == [
+            'cpu_usage_percent', 'disk_usage_percent'
+        ]
+        assert ("disk_root", 95.0, {'mount_point': '/'}) in manager.processed
+        assert ("disk_home", {'mount_point': '/home'}) in manager.resolved
+
+    def test_shared_selector_filtered_once_per_tick(self, registry, manager, mocker, make_rule):
+        """Test rules with the same metric and selector share one filtered view"""
+        rules = [
+            make_rule("disk_root_warn", metric_name="disk_usage_percent",
+                      threshold=90.0, label_selector={'mount_point': '/'}),
+            make_rule("disk_root_crit", metric_name="disk_usage_percent",
+                      threshold=99.0, label_selector={'mount_point': '/'}),
+        ]
+        evaluator = AlertEvaluator(rules, registry, manager)
+        spy = mocker.spy(AlertEvaluator, '_filter_series')
+
+        evaluator.evaluate_all_rules()
+
+        assert spy.call_count == 1
+        assert manager.processed == [("disk_root_warn", 95.0, {'mount_point': '/'})]
+        assert manager.resolved == [("disk_root_crit", {'mount_point': '/'})]
+
+    def test_run_once_returns_firings_without_notifying(self, registry, manager, make_rule):
+        """Test run_once reports firing samples and leaves the manager untouched"""
+        rules = [
+            make_rule("cpu_high", threshold=80.0),
+            make_rule("disk_high", metric_name="disk_usage_percent", threshold=90.0),
+        ]
+        evaluator = AlertEvaluator(rules, registry, manager)
+
+        firings = evaluator.run_once()
+
+        assert [(f.rule.name, f.value, f.labels) for f in firings] == [
+            ("cpu_high", 90.0, {}),
+            ("disk_high", 95.0, {'mount_point': '/'}),
+        ]
+        assert manager.processed == []
+        assert manager.resolved == []
+
+    @pytest.mark.parametrize("operator", ['>', '<', '>=', '<=', '==', '!='])
+    def test_codegen_matches_generic_evaluation(self, registry, manager, operator, make_rule):
+        """Test compiled conditions give the same results as the generic path"""
+        rules = [make_rule("disk", metric_name="disk_usage_percent",
+                           operator=operator, threshold=95.0)]
+
+        generic = AlertEvaluator(rules, registry, manager).run_once()
+        compiled = AlertEvaluator(rules, registry, manager, codegen=True).run_once()
+
+        assert compiled == generic
@@ -0,0 +1,237 @@
+"""Tests for AlertManager notification handling"""
+
+import functools
+import json
+import os
+import tempfile
+import time
+
+import pytest
+
+from src.alerts.alert_manager import AlertManager, AlertTracker
+from src.alerts.storage.sqlite_storage import SQLiteStorage
+from src.alerts.storage.base_storage import AlertState
+
+
+class FakeChannel:
+    """Records sends, optionally sleeping to simulate network latency"""
+
+    def __init__(self, delay=0.0, result=True):
+        self.delay = delay
+        self.result = result
+        self.sent = []
+        self.counts = []
+
+    def send(self, rule, value, labels, count=1):
+        time.sleep(self.delay)
+        self.sent.append((rule.name, value, labels))
+        self.counts.append(count)
+        return self.result
+
+
+@pytest.fixture
+def make_rule(make_rule):
+    """Rules notify channel "a", where the tests install their FakeChannel"""
+    return functools.partial(make_rule, channels=["a"])
+
+
+class TestAlertManager:
+    """Test AlertManager"""
+
+    @pytest.fixture
+    def storage(self):
+        """Create temporary SQLite storage"""
+        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
+        temp_db.close()
+
+        storage = SQLiteStorage({'sqlite_path': temp_db.name, 'retention_days': 30})
+
+        yield storage
+
+        storage.close()
+        os.unlink(temp_db.name)
+
+    @pytest.fixture
+    def manager(self, storage):
+        """Alert manager with no configured channels"""
+        manager = AlertManager({'channels': {}}, storage)
+        yield manager
+        manager.shutdown()
+
+    def test_channels_sent_concurrently(self, manager, make_rule):
+        """Test a notification waits for the slowest channel, not the sum"""
+        channels = {name: FakeChannel(delay=0.2) for name in ("a", "b", "c")}
+        manager.channels = channels
+        rule = make_rule(channels=list(channels))
+
+        start = time.monotonic()
+        manager.process_alert(rule, 90.0, {})
+        manager._notif_q.join()
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        for channel in channels.values():
+            assert channel.sent == [("cpu_high", 90.0, {})]
+        assert manager.alert_trackers["cpu_high"].notification_count == 1
+
+    def test_failing_channel_does_not_block_others(self, manager, make_rule):
+        """Test a raising channel is logged and other channels still send"""
+        class BrokenChannel(FakeChannel):
+            def send(self, rule, value, labels, count=1):
+                raise RuntimeError("boom")
+
+        good = FakeChannel()
+        manager.channels = {"bad": BrokenChannel(), "good": good}
+        rule = make_rule(channels=["bad", "good", "missing"])
+
+        manager.process_alert(rule, 90.0, {})
+        manager._notif_q.join()
+
+        assert good.sent == [("cpu_high", 90.0, {})]
+        assert manager.alert_trackers["cpu_high"].notification_count == 1
+
+    def test_repeated_sample_in_cooldown_short_circuits(self, manager, mocker, make_rule):
+        """Test unchanged samples inside cooldown only bump the count"""
+        channel = FakeChannel()
+        manager.channels = {"a": channel}
+        rule = make_rule()
+        manager.process_alert(rule, 90.0, {})
+
+        tracker = manager.alert_trackers["cpu_high"]
+        should_notify = mocker.spy(AlertTracker, 'should_notify')
+        manager.process_alert(rule, 90.001, {})
+        manager.process_alert(rule, 90.0, {})
+        manager._notif_q.join()
+
+        assert tracker.count == 3
+        assert should_notify.call_count == 0
+        assert len(channel.sent) == 1
+
+        # A changed value goes through the normal path again
+        manager.process_alert(rule, 95.0, {})
+        assert should_notify.call_count == 1
+        assert tracker.count == 4
+        assert tracker.last_value == 95.0
+
+    def test_storage_writes_buffered_until_flush(self, manager, storage, make_rule):
+        """Test alert writes reach storage only when the buffer is flushed"""
+        manager.channels = {"a": FakeChannel()}
+        manager.process_alert(make_rule(), 90.0, {})
+
+        assert storage.get_alert("cpu_high") is None
+
+        manager._flush_buffer()
+
+        alert = storage.get_alert("cpu_high")
+        assert alert.state == AlertState.ACTIVE
+        assert alert.notification_count == 1
+
+    def test_flush_keeps_retriggered_alert_separate(self, manager, storage, make_rule):
+        """Test a resolve followed by a re-trigger is not merged into one batch"""
+        manager.channels = {"a": FakeChannel()}
+        rule = make_rule()
+
+        manager.process_alert(rule, 90.0, {})
+        manager.resolve_alert(rule, {})
+        manager.process_alert(rule, 91.0, {})
+        manager._flush_buffer()
+
+        alerts = storage.get_alerts_by_rule("cpu_high")
+        assert len(alerts) == 2
+        assert sorted(a.state for a in alerts) == [AlertState.ACTIVE, AlertState.RESOLVED]
+        assert len(storage.get_active_alerts()) == 1
+
+    def test_alerts_by_severity_tracks_trigger_and_resolve(self, manager, make_rule):
+        """Test severity counts follow alerts being triggered and resolved"""
+        manager.channels = {"a": FakeChannel()}
+        warning = make_rule("warn_rule")
+        critical = make_rule("crit_rule", severity="critical")
+
+        manager.process_alert(warning, 90.0, {'host': 'a'})
+        manager.process_alert(warning, 90.0, {'host': 'b'})
+        manager.process_alert(critical, 99.0, {})
+        assert manager.get_alerts_by_severity() == {'warning': 2, 'critical': 1}
+
+        assert manager.get_alerts_by_rule() == {'warn_rule': 2, 'crit_rule': 1}
+
+        manager.resolve_alert(critical, {})
+        assert manager.get_alerts_by_severity() == {'warning': 2}
+        assert manager.get_alerts_by_rule() == {'warn_rule': 2}
+
+    def test_slow_channel_does_not_block_processing(self, manager, make_rule):
+        """Test process_alert returns before a slow channel finishes"""
+        channel = FakeChannel(delay=0.3)
+        manager.channels = {"a": channel}
+
+        start = time.monotonic()
+        manager.process_alert(make_rule(), 90.0, {})
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.2
+        assert manager.alert_trackers["cpu_high"].notification_count == 1
+
+        manager._notif_q.join()
+        assert channel.sent == [("cpu_high", 90.0, {})]
+
+    def test_restore_active_alerts(self, storage, make_rule):
+        """Test active alerts in storage are restored as trackers for loaded rules"""
+        rule = make_rule("disk_full", severity="critical")
+        first = AlertManager({'channels': {}}, storage)
+        first.channels = {"a": FakeChannel()}
+        first.process_alert(rule, 95.0, {'mount_point': '/'})
+        first._notif_q.join()
+        first._flush_buffer()
+
+        # A stored alert of a rule that is no longer loaded is skipped
+        orphan = make_rule("removed_rule")
+        first.process_alert(orphan, 95.0, {})
+        first._flush_buffer()
+
+        channel = FakeChannel()
+        restored = AlertManager({'channels': {}}, storage, [rule])
+        restored.channels = {"a": channel}
+        try:
+            tracker = restored.alert_trackers["disk_full_mount_point=/"]
+            assert tracker.state == AlertState.ACTIVE
+            assert tracker.notification_count == 1
+            assert list(restored.alert_trackers) == ["disk_full_mount_point=/"]
+            assert restored.get_alerts_by_severity() == {'critical': 1}
+
+            # Still inside the restored cooldown: no new notification
+            restored.process_alert(rule, 96.0, {'mount_point': '/'})
+            restored._notif_q.join()
+            assert channel.sent == []
+        finally:
+            restored.shutdown()
+            first.shutdown()
+
+
+class TestAlertTracker:
+    """Test AlertTracker duration and cooldown checks"""
+
+    def test_duration_and_cooldown_use_monotonic_seconds(self, mocker, make_rule):
+        """Test notification timing follows the monotonic clock"""
+        clock = mocker.patch('src.alerts.alert_manager.time.monotonic', return_value=1000.0)
+        rule = make_rule(for_duration_minutes=1, cooldown_minutes=5)
+        tracker = AlertTracker("cpu_high", rule, 90.0, {})
+
+        assert not tracker.should_notify(1059.0)
+        assert tracker.should_notify(1060.0)
+
+        clock.return_value = 1060.0
+        tracker.mark_notified()
+        assert tracker.last_notified_at is not None
+        assert not tracker.should_notify(1359.0)
+        assert tracker.should_notify(1360.0)
+
+    def test_snapshots_reuse_labels_json(self, make_rule):
+        """Test later storage snapshots reuse the labels JSON of earlier ones"""
+        tracker = AlertTracker("cpu_high_host=a", make_rule(), 90.0, {'host': 'a'})
+
+        first = tracker.to_alert()
+        assert json.loads(first.labels_json) == {'host': 'a'}
+
+        tracker.mark_notified()
+        second = tracker.to_alert()
+        assert second.labels_json is first.labels_json
+        assert second.notification_count == 1
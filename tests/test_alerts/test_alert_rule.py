@@ -3,8 +3,10 @@
 import pytest
 import tempfile
 import os
+import yaml
 from pathlib import Path
 
+from src.alerts import alert_rule
 from src.alerts.alert_rule import AlertRule, load_alert_rules
 
 
@@ -42,6 +44,35 @@ class TestAlertRule:
                 channels=["email"],
             )
 
+    def test_threshold_coerced_to_float(self):
+        """Test that numeric string thresholds are converted to float"""
+        rule = AlertRule(
+            name="test",
+            metric_name="test",
+            operator=">",
+            threshold="80",
+            for_duration_minutes=5,
+            severity="warning",
+            channels=["email"],
+        )
+        assert rule.threshold == 80.0
+        assert isinstance(rule.threshold, float)
+        assert rule._threshold_str == "> 80.0"
+        assert rule._severity_upper == "WARNING"
+
+    def test_invalid_threshold(self):
+        """Test that non-numeric threshold raises error"""
+        with pytest.raises(ValueError, match="Invalid threshold"):
+            AlertRule(
+                name="test",
+                metric_name="test",
+                operator=">",
+                threshold="high",
+                for_duration_minutes=5,
+                severity="warning",
+                channels=["email"],
+            )
+
     def test_invalid_severity(self):
         """Test that invalid severity raises error"""
         with pytest.raises(ValueError, match="Invalid severity"):
@@ -136,6 +167,11 @@ alert_rules:
         finally:
             os.unlink(temp_file)
 
+    @pytest.mark.skipif(not yaml.__with_libyaml__, reason="libyaml not available")
+    def test_uses_libyaml_loader(self):
+        """Test rule files are parsed with the C loader when libyaml is present"""
+        assert alert_rule._Loader is yaml.CSafeLoader
+
     def test_load_empty_file(self):
         """Test loading empty YAML file"""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
@@ -197,3 +233,50 @@ alert_rules:
             assert rules[1].name == "rule2"
         finally:
             os.unlink(temp_file)
+
+    def test_repeated_load_uses_cache(self, mocker):
+        """Test an unchanged file is parsed once and callers get separate rules"""
+        yaml_content = """
+alert_rules:
+  - name: "cached_rule"
+    metric_name: "cpu"
+    condition:
+      operator: ">"
+      threshold: 80
+    channels: [email]
+"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write(yaml_content)
+            temp_file = f.name
+
+        try:
+            parse_spy = mocker.spy(alert_rule, '_parse_rules_file')
+            first = load_alert_rules(temp_file)
+            first[0].enabled = False
+            second = load_alert_rules(temp_file)
+
+            assert parse_spy.call_count == 1
+            assert second[0].name == "cached_rule"
+            assert second[0].enabled is True
+        finally:
+            os.unlink(temp_file)
+
+    def test_modified_file_reloaded(self):
+        """Test rules are re-parsed once the file changes"""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+            f.write("alert_rules: []\n")
+            temp_file = f.name
+
+        try:
+            assert load_alert_rules(temp_file) == []
+
+            Path(temp_file).write_text(
+                "alert_rules:\n"
+                "  - name: added\n"
+                "    metric_name: cpu\n"
+                "    channels: [email]\n"
+            )
+            rules = load_alert_rules(temp_file)
+            assert [rule.name for rule in rules] == ["added"]
+        finally:
+            os.unlink(temp_file)
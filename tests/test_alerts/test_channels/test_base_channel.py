@@ -0,0 +1,43 @@
+"""Tests for BaseChannel message formatting"""
+
+from src.alerts.alert_rule import AlertRule
+from src.alerts.channels.base_channel import BaseChannel
+
+
+class DummyChannel(BaseChannel):
+    """Channel that only formats messages"""
+
+    def send(self, rule, value, labels, count=1):
+        return True
+
+
+class TestBaseChannel:
+    """Test BaseChannel template substitution"""
+
+    def test_substitute_template(self):
+        """Test value, threshold and label placeholders are replaced"""
+        channel = DummyChannel()
+        result = channel._substitute_template(
+            "{{ value }} > {{threshold}} on {{ labels.mount_point }} ({{ labels.missing }})",
+            95.123, 90, {'mount_point': '/home'}
+        )
+        assert result == "95.12 > 90.00 on /home ({{ labels.missing }})"
+
+    def test_format_message_defaults(self):
+        """Test summary and description fall back to rule fields"""
+        rule = AlertRule(
+            name="disk_full",
+            metric_name="disk_usage_percent",
+            operator=">",
+            threshold=90.0,
+            for_duration_minutes=0,
+            severity="critical",
+            channels=["email"],
+            annotations={'summary': "Disk {{ labels.mount_point }} at {{ value }}%"},
+        )
+        message = DummyChannel().format_message(rule, 95.0, {'mount_point': '/'})
+
+        assert message == {
+            'summary': "Disk / at 95.00%",
+            'description': "disk_usage_percent > 90.0",
+        }
@@ -0,0 +1,39 @@
+"""Tests for shared HTTP channel helpers"""
+
+import json
+
+import pytest
+
+from src.alerts.channels import http_session
+
+
+class TestDumpsPayload:
+    """Test JSON payload serialization"""
+
+    PAYLOAD = {"alert": {"name": "cpu_high", "count": 2}, "value": 91.5, "labels": {"host": "é"}}
+
+    def test_dumps_payload_returns_json_bytes(self):
+        """Test payload is encoded as UTF-8 JSON bytes"""
+        body = http_session.dumps_payload(self.PAYLOAD)
+        assert isinstance(body, bytes)
+        assert json.loads(body) == self.PAYLOAD
+
+    def test_dumps_payload_without_orjson(self, monkeypatch):
+        """Test stdlib json fallback when orjson is unavailable"""
+        monkeypatch.setattr(http_session, 'orjson', None)
+        body = http_session.dumps_payload(self.PAYLOAD)
+        assert isinstance(body, bytes)
+        assert json.loads(body) == self.PAYLOAD
+
+
+class TestCreatePoolManager:
+    """Test the shared pool manager's retry policy"""
+
+    def test_only_connection_errors_retried(self):
+        """Test sent requests are never retried, so notifications aren't duplicated"""
+        pytest.importorskip('urllib3')
+        retries = http_session.create_pool_manager().connection_pool_kw['retries']
+
+        assert retries.connect == 3
+        assert retries.read == 0
+        assert retries.status == 0
@@ -0,0 +1,38 @@
+"""Tests for Slack notification channel"""
+
+from src.alerts.channels.slack_channel import SlackChannel
+
+
+def make_channel():
+    """Create a Slack channel without building a real connection pool"""
+    channel = SlackChannel.__new__(SlackChannel)
+    channel.webhook_url = "http://example.invalid/hook"
+    channel.channel = '#alerts'
+    channel.username = 'Metrics Agent'
+    channel.icon_emoji = ':rotating_light:'
+    channel._payload_cache = {}
+    return channel
+
+
+class TestSlackChannel:
+    """Test SlackChannel payload building"""
+
+    def test_labels_appended_to_description(self, make_rule):
+        """Test each label is rendered on its own bullet line"""
+        channel = make_channel()
+        message = {'summary': "CPU high", 'description': "CPU is high"}
+
+        payload = channel._create_slack_payload(
+            make_rule(), 91.0, {'host': 'a', 'cpu': '0'}, message)
+
+        text = payload['attachments'][0]['text']
+        assert text == "CPU is high\n• *host:* a\n• *cpu:* 0"
+
+    def test_no_labels(self, make_rule):
+        """Test the description is used unchanged without labels"""
+        channel = make_channel()
+        message = {'summary': "CPU high", 'description': "CPU is high"}
+
+        payload = channel._create_slack_payload(make_rule(), 91.0, {}, message)
+
+        assert payload['attachments'][0]['text'] == "CPU is high"
@@ -0,0 +1,79 @@
+"""Tests for webhook notification channel"""
+
+import json
+from types import SimpleNamespace
+
+from src.alerts.channels.webhook_channel import WebhookChannel
+
+
+class FakeResponse:
+    """Minimal urllib3-style HTTP response"""
+
+    def __init__(self, status, data=b""):
+        self.status = status
+        self.data = data
+
+
+class FakeTransportError(Exception):
+    """Stands in for urllib3.exceptions.HTTPError"""
+
+
+# Stand-in for the urllib3 module the channel imports on init
+FAKE_URLLIB3 = SimpleNamespace(exceptions=SimpleNamespace(HTTPError=FakeTransportError))
+
+
+class FakePoolManager:
+    """Records request bodies and returns a fixed response"""
+
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def request(self, method, url, body, headers, timeout):
+        self.requests.append((method, body))
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def make_channel(response):
+    """Create a webhook channel without building a real connection pool"""
+    channel = WebhookChannel.__new__(WebhookChannel)
+    channel.url = "http://example.invalid/hook"
+    channel.method = 'POST'
+    channel.headers = {'Content-Type': 'application/json'}
+    channel.timeout = 10
+    channel._http = FakePoolManager(response)
+    channel._urllib3 = FAKE_URLLIB3
+    channel._payload_cache = {}
+    return channel
+
+
+class TestWebhookChannel:
+    """Test WebhookChannel"""
+
+    def test_send_success(self, make_rule):
+        """Test 2xx responses count as sent and the payload is JSON"""
+        channel = make_channel(FakeResponse(204))
+
+        assert channel.send(make_rule(), 91.0, {'host': 'a'}, count=3) is True
+
+        method, body = channel._http.requests[0]
+        assert method == 'POST'
+        payload = json.loads(body)
+        assert payload['alert']['name'] == "cpu_high"
+        assert payload['alert']['count'] == 3
+        assert payload['metric']['value'] == 91.0
+        assert payload['labels'] == {'host': 'a'}
+
+    def test_send_error_status(self, make_rule):
+        """Test non-2xx responses are reported as failures"""
+        channel = make_channel(FakeResponse(503, b"unavailable"))
+
+        assert channel.send(make_rule(), 91.0, {}) is False
+
+    def test_send_transport_error(self, make_rule):
+        """Test connection-level errors are reported as failures"""
+        channel = make_channel(FakeTransportError("connection refused"))
+
+        assert channel.send(make_rule(), 91.0, {}) is False
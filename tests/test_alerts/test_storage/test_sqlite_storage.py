@@ -1,11 +1,11 @@
 """Tests for SQLite storage backend"""
 
 import pytest
-import tempfile
-import os
+import sqlite3
+import threading
 from datetime import datetime, timedelta
 
-from src.alerts.storage.sqlite_storage import SQLiteStorage
+from src.alerts.storage.sqlite_storage import SQLiteStorage, _SQL_CLEANUP
 from src.alerts.storage.base_storage import Alert, AlertState
 
 
@@ -14,12 +14,9 @@ class TestSQLiteStorage:
 
     @pytest.fixture
     def storage(self):
-        """Create temporary SQLite storage"""
-        temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.db')
-        temp_db.close()
-
+        """Create in-memory SQLite storage"""
         config = {
-            'sqlite_path': temp_db.name,
+            'sqlite_path': ':memory:',
             'retention_days': 30,
         }
         storage = SQLiteStorage(config)
@@ -27,7 +24,15 @@ class TestSQLiteStorage:
         yield storage
 
         storage.close()
-        os.unlink(temp_db.name)
+
+    @pytest.fixture
+    def file_storage(self, tmp_path):
+        """Create SQLite storage backed by a database file"""
+        storage = SQLiteStorage({'sqlite_path': str(tmp_path / 'alerts.db')})
+
+        yield storage
+
+        storage.close()
 
     def test_save_and_get_alert(self, storage):
         """Test saving and retrieving an alert"""
@@ -53,6 +58,26 @@ class TestSQLiteStorage:
         assert retrieved.state == AlertState.TRIGGERED
         assert retrieved.metric_value == 85.0
 
+    def test_timestamps_round_trip_exactly(self, storage):
+        """Test datetimes come back from storage to the microsecond"""
+        triggered_at = datetime(2026, 3, 29, 1, 59, 59, 999999)
+        resolved_at = datetime(2031, 12, 31, 23, 0, 0, 1)
+        storage.save_alert(Alert(
+            alert_id="precise",
+            rule_name="precise_rule",
+            state=AlertState.RESOLVED,
+            severity="warning",
+            metric_name="cpu",
+            metric_value=85.0,
+            threshold=80.0,
+            triggered_at=triggered_at,
+            resolved_at=resolved_at,
+        ))
+
+        alert = storage.get_alert("precise")
+        assert alert.triggered_at == triggered_at
+        assert alert.resolved_at == resolved_at
+
     def test_update_alert_state(self, storage):
         """Test updating alert state"""
         alert = Alert(
@@ -141,9 +166,7 @@ class TestSQLiteStorage:
             resolved_at=datetime.now(),
         )
 
-        storage.save_alert(alert1)
-        storage.save_alert(alert2)
-        storage.save_alert(alert3)
+        storage.save_alerts([alert1, alert2, alert3])
 
         active = storage.get_active_alerts()
         assert len(active) == 2
@@ -152,8 +175,8 @@ class TestSQLiteStorage:
 
     def test_get_alerts_by_rule(self, storage):
         """Test retrieving alerts by rule name"""
-        for i in range(3):
-            alert = Alert(
+        storage.save_alerts([
+            Alert(
                 alert_id=f"alert{i}",
                 rule_name="test_rule",
                 state=AlertState.TRIGGERED,
@@ -163,7 +186,8 @@ class TestSQLiteStorage:
                 threshold=80.0,
                 triggered_at=datetime.now(),
             )
-            storage.save_alert(alert)
+            for i in range(3)
+        ])
 
         alerts = storage.get_alerts_by_rule("test_rule")
         assert len(alerts) == 3
@@ -196,8 +220,7 @@ class TestSQLiteStorage:
             resolved_at=datetime.now() - timedelta(days=4),
         )
 
-        storage.save_alert(old_alert)
-        storage.save_alert(recent_alert)
+        storage.save_alerts([old_alert, recent_alert])
 
         # Cleanup alerts older than 30 days
         deleted = storage.cleanup_old_alerts(30)
@@ -207,3 +230,223 @@ class TestSQLiteStorage:
         assert storage.get_alert("old_alert") is None
         # Verify recent alert still exists
         assert storage.get_alert("recent_alert") is not None
+
+    def test_cleanup_uses_covering_index(self, storage):
+        """Test retention cleanup finds old resolved rows from the index alone"""
+        plan = " ".join(
+            row[3] for row in storage.conn.execute(
+                "EXPLAIN QUERY PLAN " + _SQL_CLEANUP, (0, AlertState.RESOLVED, 1))
+        )
+        assert "COVERING INDEX idx_state_triggered" in plan
+
+    def test_connection_pragmas(self, tmp_path):
+        """Test the connection is tuned for WAL writes"""
+        # WAL needs a database file, so this one isn't in memory
+        storage = SQLiteStorage({'sqlite_path': str(tmp_path / 'alerts.db')})
+        try:
+            assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+            # 1 == NORMAL
+            assert storage.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+            assert storage.conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 10000
+        finally:
+            storage.close()
+
+    def test_wal_disabled(self, tmp_path):
+        """Test sqlite_wal: false keeps the rollback journal"""
+        storage = SQLiteStorage({'sqlite_path': str(tmp_path / 'alerts.db'), 'sqlite_wal': False})
+        try:
+            assert storage.conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+            # 2 == FULL
+            assert storage.conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+        finally:
+            storage.close()
+
+    def test_memory_databases_are_separate(self, storage):
+        """Test in-memory storages don't share data with each other"""
+        other = SQLiteStorage({'sqlite_path': ':memory:'})
+        try:
+            storage.save_alert(Alert(
+                alert_id="mine",
+                rule_name="memory_rule",
+                state=AlertState.ACTIVE,
+                severity="warning",
+                metric_name="cpu",
+                metric_value=85.0,
+                threshold=80.0,
+                triggered_at=datetime.now(),
+            ))
+            assert other.get_alert("mine") is None
+        finally:
+            other.close()
+
+    def test_bulk_writes(self, storage):
+        """Test bulk save, notification and state updates"""
+        alerts = [
+            Alert(
+                alert_id=f"alert_{i}",
+                rule_name="bulk_rule",
+                state=AlertState.TRIGGERED,
+                severity="warning",
+                metric_name="cpu",
+                metric_value=85.0,
+                threshold=80.0,
+                triggered_at=datetime.now(),
+            )
+            for i in range(3)
+        ]
+        storage.save_alerts(alerts)
+
+        notified_at = datetime.now()
+        storage.update_notifications_bulk([("alert_0", notified_at), ("alert_1", notified_at)])
+        storage.update_states_bulk([
+            ("alert_0", AlertState.ACTIVE, None),
+            ("alert_1", AlertState.RESOLVED, datetime.now()),
+        ])
+
+        assert len(storage.get_alerts_by_rule("bulk_rule")) == 3
+
+        alert_0 = storage.get_alert("alert_0")
+        assert alert_0.state == AlertState.ACTIVE
+        assert alert_0.notification_count == 1
+        assert alert_0.resolved_at is None
+
+        alert_1 = storage.get_alert("alert_1")
+        assert alert_1.state == AlertState.RESOLVED
+        assert alert_1.resolved_at is not None
+
+        assert storage.get_alert("alert_2").state == AlertState.TRIGGERED
+
+    def test_upsert_updates_live_row(self, storage):
+        """Test upserts update an unresolved row and insert after a resolve"""
+        alert = Alert(
+            alert_id="upsert_alert",
+            rule_name="upsert_rule",
+            state=AlertState.TRIGGERED,
+            severity="warning",
+            metric_name="cpu",
+            metric_value=85.0,
+            threshold=80.0,
+            triggered_at=datetime.now(),
+        )
+        storage.upsert_alerts([alert])
+
+        alert.state = AlertState.ACTIVE
+        alert.metric_value = 90.0
+        alert.last_notified_at = datetime.now()
+        alert.notification_count = 1
+        storage.upsert_alerts([alert])
+
+        stored = storage.get_alerts_by_rule("upsert_rule")
+        assert len(stored) == 1
+        assert stored[0].state == AlertState.ACTIVE
+        assert stored[0].metric_value == 90.0
+        assert stored[0].notification_count == 1
+
+        # Once resolved, the same alert ID starts a new row
+        storage.update_alert_state("upsert_alert", AlertState.RESOLVED, datetime.now())
+        storage.upsert_alerts([alert])
+        assert len(storage.get_alerts_by_rule("upsert_rule")) == 2
+        assert len(storage.get_active_alerts()) == 1
+
+    def test_iso_timestamps_migrated_to_epoch(self, tmp_path):
+        """Test ISO timestamp strings from older databases are converted on open"""
+        db_path = str(tmp_path / "old.db")
+        triggered_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE alert_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                alert_id VARCHAR(255) NOT NULL,
+                rule_name VARCHAR(255) NOT NULL,
+                state VARCHAR(20) NOT NULL,
+                severity VARCHAR(20),
+                metric_name VARCHAR(255),
+                metric_value REAL,
+                threshold REAL,
+                labels TEXT,
+                annotations TEXT,
+                triggered_at TIMESTAMP NOT NULL,
+                resolved_at TIMESTAMP,
+                last_notified_at TIMESTAMP,
+                notification_count INTEGER DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            INSERT INTO alert_history (alert_id, rule_name, state, labels, annotations,
+                                       triggered_at, last_notified_at)
+            VALUES ('old', 'old_rule', 'active', '{}', '{}', ?, ?)
+        """, (triggered_at.isoformat(), triggered_at.isoformat()))
+        conn.commit()
+        conn.close()
+
+        storage = SQLiteStorage({'sqlite_path': db_path})
+        try:
+            alert = storage.get_alert("old")
+            assert alert.triggered_at == triggered_at
+            assert alert.last_notified_at == triggered_at
+            assert alert.resolved_at is None
+            column_type = storage.conn.execute(
+                "SELECT typeof(triggered_at) FROM alert_history").fetchone()[0]
+            assert column_type == 'integer'
+        finally:
+            storage.close()
+
+    def test_connection_per_thread(self, file_storage):
+        """Test each thread gets its own connection and sees committed writes"""
+        storage = file_storage
+        storage.save_alert(Alert(
+            alert_id="threaded",
+            rule_name="thread_rule",
+            state=AlertState.ACTIVE,
+            severity="warning",
+            metric_name="cpu",
+            metric_value=85.0,
+            threshold=80.0,
+            triggered_at=datetime.now(),
+        ))
+
+        result = {}
+
+        def read():
+            result['conn'] = storage.conn
+            result['alert'] = storage.get_alert("threaded")
+
+        thread = threading.Thread(target=read)
+        thread.start()
+        thread.join()
+
+        assert result['conn'] is not storage.conn
+        assert result['alert'].rule_name == "thread_rule"
+
+    def test_memory_database_shared_across_threads(self, storage):
+        """Test concurrent writers and readers on an in-memory database don't fail"""
+        errors = []
+
+        def write(worker):
+            try:
+                for i in range(50):
+                    storage.save_alert(Alert(
+                        alert_id=f"alert_{worker}_{i}",
+                        rule_name="shared_rule",
+                        state=AlertState.ACTIVE,
+                        severity="warning",
+                        metric_name="cpu",
+                        metric_value=85.0,
+                        threshold=80.0,
+                        triggered_at=datetime.now(),
+                    ))
+                    storage.get_active_alerts()
+            except sqlite3.Error as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(storage.get_alerts_by_rule("shared_rule", limit=1000)) == 200
@@ -0,0 +1,113 @@
+"""Tests for disk metrics collector"""
+
+import threading
+from collections import namedtuple
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from src.collectors import disk_collector
+from src.collectors.disk_collector import DiskCollector
+
+Partition = namedtuple('Partition', ['mountpoint', 'fstype'])
+Usage = namedtuple('Usage', ['total', 'used', 'free', 'percent'])
+
+
+class TestDiskCollector:
+    """Test DiskCollector usage collection"""
+
+    @pytest.fixture
+    def collector(self):
+        """Disk collector with metrics registered on a fresh registry"""
+        collector = DiskCollector({'interval': 5})
+        self.registry = CollectorRegistry()
+        collector.register_metrics(self.registry)
+        yield collector
+        collector.close()
+
+    def test_hung_mount_does_not_block_others(self, collector, mocker):
+        """Test a mount that doesn't answer is skipped until its call returns"""
+        release = threading.Event()
+        calls = []
+
+        def disk_usage(mount_point):
+            calls.append(mount_point)
+            if mount_point == '/nfs':
+                release.wait(5)
+            return Usage(100, 40, 60, 40.0)
+
+        mocker.patch.object(disk_collector, 'USAGE_TIMEOUT_SECONDS', 0.1)
+        mocker.patch('psutil.disk_partitions',
+                     return_value=[Partition('/', 'ext4'), Partition('/nfs', 'nfs')])
+        mocker.patch('psutil.disk_usage', side_effect=disk_usage)
+
+        collector._collect_usage()
+        assert self.registry.get_sample_value('disk_usage_percent', {'mount_point': '/'}) == 40.0
+        assert self.registry.get_sample_value('disk_usage_percent', {'mount_point': '/nfs'}) is None
+
+        # The hung mount is not queried again while its call is outstanding
+        collector._collect_usage()
+        assert calls.count('/nfs') == 1
+        release.set()
+
+    def test_partitions_cached(self, collector, mocker):
+        """Test partitions are enumerated once within the refresh window"""
+        partitions = mocker.patch('psutil.disk_partitions', return_value=[Partition('/', 'ext4')])
+        mocker.patch('psutil.disk_usage', return_value=Usage(100, 40, 60, 40.0))
+
+        collector._collect_usage()
+        collector._collect_usage()
+
+        assert partitions.call_count == 1
+
+    def test_io_counters_increment_by_delta(self, collector, mocker):
+        """Test I/O counters grow by the change between collections"""
+        IO = namedtuple('IO', ['read_bytes', 'write_bytes', 'read_count', 'write_count'])
+        io_counters = mocker.patch('psutil.disk_io_counters')
+
+        io_counters.return_value = {'sda': IO(1000, 500, 10, 5)}
+        collector._collect_io()
+        io_counters.return_value = {'sda': IO(1600, 700, 16, 7), 'sdb': IO(50, 50, 1, 1)}
+        collector._collect_io()
+
+        sample = self.registry.get_sample_value
+        assert sample('disk_io_read_bytes_total', {'device': 'sda'}) == 600
+        assert sample('disk_io_write_bytes_total', {'device': 'sda'}) == 200
+        assert sample('disk_io_read_operations_total', {'device': 'sda'}) == 6
+        assert sample('disk_io_write_operations_total', {'device': 'sda'}) == 2
+        # First sight of a device only sets its baseline
+        assert sample('disk_io_read_bytes_total', {'device': 'sdb'}) == 0
+
+    def test_io_counter_reset_counts_from_zero(self, collector, mocker):
+        """Test a device whose counters reset doesn't stop other devices updating"""
+        IO = namedtuple('IO', ['read_bytes', 'write_bytes', 'read_count', 'write_count'])
+        io_counters = mocker.patch('psutil.disk_io_counters')
+
+        io_counters.return_value = {'sda': IO(1000, 500, 10, 5), 'sdb': IO(100, 100, 1, 1)}
+        collector._collect_io()
+        io_counters.return_value = {'sda': IO(300, 600, 3, 6), 'sdb': IO(150, 100, 2, 1)}
+        collector._collect_io()
+
+        sample = self.registry.get_sample_value
+        assert sample('disk_io_read_bytes_total', {'device': 'sda'}) == 300
+        assert sample('disk_io_write_bytes_total', {'device': 'sda'}) == 100
+        assert sample('disk_io_read_bytes_total', {'device': 'sdb'}) == 50
+
+    def test_excluded_filesystems_and_mount_points(self, mocker):
+        """Test excluded filesystem types and mount point prefixes are skipped"""
+        collector = DiskCollector({
+            'interval': 5,
+            'exclude_filesystems': ['tmpfs'],
+            'exclude_mount_points': ['/snap', '/boot'],
+        })
+        mocker.patch('psutil.disk_partitions', return_value=[
+            Partition('/', 'ext4'),
+            Partition('/run', 'tmpfs'),
+            Partition('/snap/core/1', 'squashfs'),
+            Partition('/boot/efi', 'vfat'),
+            Partition('/data', 'xfs'),
+        ])
+        try:
+            assert collector._get_mount_points() == ['/', '/data']
+        finally:
+            collector.close()
@@ -0,0 +1,156 @@
+"""Tests for network metrics collector"""
+
+from collections import namedtuple
+from unittest.mock import mock_open
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from src.collectors import network_collector
+from src.collectors.network_collector import NetworkCollector
+
+Connection = namedtuple('Connection', ['fd', 'family', 'type', 'laddr', 'raddr', 'status', 'pid'],
+                        defaults=(-1, 2, 1, (), (), 'NONE', None))
+NetIO = namedtuple('NetIO', ['bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv',
+                             'errin', 'errout', 'dropin', 'dropout'])
+
+
+class TestNetworkCollector:
+    """Test NetworkCollector connection collection"""
+
+    @pytest.fixture
+    def collector(self):
+        """Network collector with metrics registered on a fresh registry"""
+        collector = NetworkCollector({'interval': 5, 'exclude_interfaces': ['lo']})
+        self.registry = CollectorRegistry()
+        collector.register_metrics(self.registry)
+        return collector
+
+    def test_connections_counted_on_scrape(self, collector, mocker):
+        """Test connections are counted when scraped, not when collected"""
+        connections = mocker.patch('psutil.net_connections', return_value=[
+            Connection(status='ESTABLISHED'), Connection(status='ESTABLISHED'), Connection(status='LISTEN'),
+        ])
+        mocker.patch.object(network_collector, '_read_proc_net_dev', return_value={})
+        mocker.patch('psutil.net_io_counters', return_value={})
+
+        collector.collect()
+        assert connections.call_count == 0
+
+        assert self.registry.get_sample_value(
+            'network_connections', {'state': 'ESTABLISHED'}) == 2
+        assert self.registry.get_sample_value(
+            'network_connections', {'state': 'LISTEN'}) == 1
+        # Both scrapes fall within the cache TTL
+        assert connections.call_count == 1
+
+        collector.config['connections_cache_ttl'] = 0
+        self.registry.get_sample_value('network_connections', {'state': 'LISTEN'})
+        assert connections.call_count == 2
+
+    def test_connections_disabled(self, mocker):
+        """Test no connection gauge is registered when disabled"""
+        connections = mocker.patch('psutil.net_connections', return_value=[])
+        collector = NetworkCollector({'interval': 5, 'collect_connections': False})
+        registry = CollectorRegistry()
+        collector.register_metrics(registry)
+
+        assert [f.name for f in registry.collect() if f.name == 'network_connections'] == []
+        assert connections.call_count == 0
+
+    def test_io_deltas(self, collector, mocker):
+        """Test counters advance by per-interface deltas and never go backwards"""
+        first = {'eth0': NetIO(100, 200, 1, 2, 0, 0, 0, 0), 'lo': NetIO(1, 1, 1, 1, 0, 0, 0, 0)}
+        second = {'eth0': NetIO(150, 260, 2, 4, 1, 0, 0, 0), 'lo': NetIO(9, 9, 9, 9, 0, 0, 0, 0)}
+        reset = {'eth0': NetIO(10, 10, 1, 1, 0, 0, 0, 0)}
+        mocker.patch.object(network_collector, '_read_proc_net_dev', side_effect=[first, second, reset])
+        mocker.patch('psutil.net_io_counters', side_effect=[first, second, reset])
+
+        collector._collect_io()
+        assert self.registry.get_sample_value(
+            'network_transmit_bytes_total', {'interface': 'eth0'}) == 0
+
+        collector._collect_io()
+        assert self.registry.get_sample_value(
+            'network_transmit_bytes_total', {'interface': 'eth0'}) == 50
+        assert self.registry.get_sample_value(
+            'network_receive_bytes_total', {'interface': 'eth0'}) == 60
+        assert self.registry.get_sample_value(
+            'network_receive_errors_total', {'interface': 'eth0'}) == 1
+        assert self.registry.get_sample_value(
+            'network_receive_bytes_total', {'interface': 'lo'}) is None
+
+        # A reset counter counts from zero rather than adding a negative delta
+        collector._collect_io()
+        assert self.registry.get_sample_value(
+            'network_receive_bytes_total', {'interface': 'eth0'}) == 70
+
+
+PROC_NET_DEV = b"""\
+Inter-|   Receive                                                |  Transmit
+ face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed
+    lo:    1200      12    0    0    0     0          0         0     1200      12    0    0    0     0       0          0
+  eth0:12345678901  900    1    2    0     0          0         0    83910     802    3    4    0     0       0          0
+"""
+
+
+def test_read_proc_net_dev(mocker):
+    """Test /proc/net/dev rows map onto psutil's snetio field order"""
+    mocker.patch('builtins.open', mock_open(read_data=PROC_NET_DEV))
+
+    counters = network_collector._read_proc_net_dev()
+
+    assert counters['lo'] == (1200, 1200, 12, 12, 0, 0, 0, 0)
+    assert counters['eth0'] == NetIO(bytes_sent=83910, bytes_recv=12345678901, packets_sent=802,
+                                     packets_recv=900, errin=1, errout=3, dropin=2, dropout=4)
+
+
+def test_read_proc_net_dev_skips_truncated_rows(mocker):
+    """Test a malformed row is skipped without consuming its neighbours"""
+    data = PROC_NET_DEV + (
+        b"  eth1: 1234567890 123456\n"
+        b"  eth2:    7000      70    0    0    0     0          0         0"
+        b"     9000      90    0    0    0     0       0          0\n"
+    )
+    mocker.patch('builtins.open', mock_open(read_data=data))
+
+    counters = network_collector._read_proc_net_dev()
+
+    assert 'eth1' not in counters
+    assert counters['eth2'] == (9000, 7000, 90, 70, 0, 0, 0, 0)
+    assert counters['lo'] == (1200, 1200, 12, 12, 0, 0, 0, 0)
+
+
+def test_vanished_interfaces_pruned(mocker):
+    """Test interfaces that disappear lose their series at the next refresh"""
+    collector = NetworkCollector({'interval': 5})
+    registry = CollectorRegistry()
+    collector.register_metrics(registry)
+
+    both = {'eth0': NetIO(10, 10, 1, 1, 0, 0, 0, 0), 'veth1': NetIO(5, 5, 1, 1, 0, 0, 0, 0)}
+    eth0_only = {'eth0': NetIO(30, 20, 2, 2, 0, 0, 0, 0)}
+    mocker.patch.object(network_collector, '_read_proc_net_dev', side_effect=[both, eth0_only, eth0_only])
+    mocker.patch('psutil.net_io_counters', side_effect=[both, eth0_only, eth0_only])
+    mocker.patch.object(network_collector, 'INTERFACE_REFRESH_SECONDS', -1)
+
+    collector._collect_io()
+    assert registry.get_sample_value('network_receive_bytes_total', {'interface': 'veth1'}) == 0
+
+    collector._collect_io()
+    assert registry.get_sample_value('network_receive_bytes_total', {'interface': 'veth1'}) is None
+    assert registry.get_sample_value('network_transmit_bytes_total', {'interface': 'eth0'}) == 20
+
+    # eth0 keeps its baseline across the compaction
+    collector._collect_io()
+    assert registry.get_sample_value('network_transmit_bytes_total', {'interface': 'eth0'}) == 20
+
+
+def test_known_states_exported_at_zero(mocker):
+    """Test known states without connections are exported as 0"""
+    mocker.patch('psutil.net_connections', return_value=[Connection(status='ESTABLISHED')])
+    collector = NetworkCollector({'interval': 5})
+    registry = CollectorRegistry()
+    collector.register_metrics(registry)
+
+    assert registry.get_sample_value('network_connections', {'state': 'ESTABLISHED'}) == 1
+    assert registry.get_sample_value('network_connections', {'state': 'TIME_WAIT'}) == 0
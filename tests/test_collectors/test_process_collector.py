@@ -0,0 +1,83 @@
+"""Tests for process metrics collector"""
+
+import contextlib
+from collections import namedtuple
+
+import pytest
+from prometheus_client import CollectorRegistry
+
+from src.collectors.process_collector import ProcessCollector
+
+MemoryInfo = namedtuple('MemoryInfo', ['rss'])
+
+
+class FakeProcess:
+    """psutil.Process stand-in serving fixed attributes"""
+
+    def __init__(self, pid, name, user, cpu_percent, rss, create_time=0.0):
+        self.pid = pid
+        self._info = {
+            'name': name,
+            'username': user,
+            'cpu_percent': cpu_percent,
+            'memory_info': MemoryInfo(rss),
+            'create_time': create_time,
+        }
+
+    def oneshot(self):
+        return contextlib.nullcontext()
+
+    def as_dict(self, attrs):
+        return {attr: self._info[attr] for attr in attrs}
+
+
+class TestProcessCollector:
+    """Test ProcessCollector series handling"""
+
+    @pytest.fixture
+    def collector(self):
+        """Process collector with metrics registered on a fresh registry"""
+        collector = ProcessCollector({'interval': 10, 'top_n': 5})
+        self.registry = CollectorRegistry()
+        collector.register_metrics(self.registry)
+        return collector
+
+    def test_processes_grouped_by_name_and_user(self, collector, mocker):
+        """Test processes sharing a name and user are exported as one series"""
+        mocker.patch('psutil.process_iter', return_value=[
+            FakeProcess(10, 'worker', 'app', 5.0, 100),
+            FakeProcess(11, 'worker', 'app', 7.0, 200),
+            FakeProcess(12, 'db', 'postgres', 1.0, 500),
+        ])
+
+        collector.collect()
+
+        labels = {'name': 'worker', 'user': 'app'}
+        assert self.registry.get_sample_value('process_cpu_percent', labels) == 12.0
+        assert self.registry.get_sample_value('process_memory_bytes', labels) == 300
+
+    def test_stale_series_removed(self, collector, mocker):
+        """Test series for processes that left the top set are removed"""
+        mocker.patch('psutil.process_iter', side_effect=[
+            [FakeProcess(10, 'build', 'ci', 90.0, 100)],
+            [FakeProcess(12, 'db', 'postgres', 1.0, 500)],
+        ])
+
+        collector.collect()
+        collector.collect()
+
+        assert self.registry.get_sample_value(
+            'process_cpu_percent', {'name': 'build', 'user': 'ci'}) is None
+        assert self.registry.get_sample_value(
+            'process_cpu_percent', {'name': 'db', 'user': 'postgres'}) == 1.0
+
+    def test_labels_truncated(self, collector, mocker):
+        """Test long names and users are truncated for labels"""
+        mocker.patch('psutil.process_iter', return_value=[
+            FakeProcess(10, 'n' * 80, 'u' * 40, 5.0, 100),
+        ])
+
+        collector.collect()
+
+        labels = {'name': 'n' * 50, 'user': 'u' * 30}
+        assert self.registry.get_sample_value('process_cpu_percent', labels) == 5.0
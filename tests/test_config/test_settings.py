@@ -0,0 +1,123 @@
+"""Tests for configuration loading"""
+
+import os
+
+import pytest
+
+from src.config import settings
+from src.config.settings import (
+    get_default_config, load_config, merge_configs, override_from_env, validate_config
+)
+
+
+class TestLoadConfig:
+    """Test load_config file handling"""
+
+    @pytest.fixture
+    def config_file(self, tmp_path, monkeypatch):
+        """Config file setting a disk interval so defaults validate"""
+        monkeypatch.setattr(settings, '_CONFIG_CACHE', {})
+        path = tmp_path / 'agent.yaml'
+        path.write_text("collectors:\n  disk:\n    interval: 5\n")
+        return path
+
+    def test_unchanged_file_parsed_once(self, config_file, mocker):
+        """Test an unchanged file is served from the cache"""
+        parse = mocker.spy(settings.yaml, 'load')
+
+        first = load_config(str(config_file))
+        first['collectors']['disk']['interval'] = 99
+        second = load_config(str(config_file))
+
+        assert parse.call_count == 1
+        # Each caller gets its own copy
+        assert second['collectors']['disk']['interval'] == 5
+
+    def test_modified_file_reparsed(self, config_file):
+        """Test a file is re-read once its mtime changes"""
+        load_config(str(config_file))
+
+        config_file.write_text("collectors:\n  disk:\n    interval: 7\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert load_config(str(config_file))['collectors']['disk']['interval'] == 7
+
+    def test_env_overrides_applied_to_cached_config(self, config_file, monkeypatch):
+        """Test environment overrides still apply when the file is cached"""
+        load_config(str(config_file))
+        monkeypatch.setenv('PROMETHEUS_PORT', '9200')
+
+        assert load_config(str(config_file))['prometheus']['port'] == 9200
+
+
+class TestMergeConfigs:
+    """Test merge_configs"""
+
+    def test_nested_merge_leaves_base_untouched(self):
+        """Test nested keys merge without modifying the base dict"""
+        base = {'a': {'b': 1, 'c': {'d': 2}}, 'e': 3}
+        merged = merge_configs(base, {'a': {'c': {'d': 4}, 'f': 5}, 'e': {'g': 6}})
+
+        assert merged == {'a': {'b': 1, 'c': {'d': 4}, 'f': 5}, 'e': {'g': 6}}
+        assert base == {'a': {'b': 1, 'c': {'d': 2}}, 'e': 3}
+
+
+class TestOverrideFromEnv:
+    """Test override_from_env"""
+
+    def test_env_values_parsed(self, monkeypatch):
+        """Test environment values are parsed into their config types"""
+        monkeypatch.setenv('LOG_LEVEL', 'debug')
+        monkeypatch.setenv('PROMETHEUS_PORT', '9200')
+        monkeypatch.setenv('COLLECTOR_PROCESS_ENABLED', 'False')
+        monkeypatch.setenv('COLLECTOR_DISK_INTERVAL', '15')
+
+        config = override_from_env(get_default_config())
+
+        assert config['agent']['log_level'] == 'DEBUG'
+        assert config['prometheus']['port'] == 9200
+        assert config['collectors']['process']['enabled'] is False
+        assert config['collectors']['disk']['interval'] == 15
+
+
+def test_default_config_not_shared():
+    """Test each call returns a tree the caller may modify"""
+    config = get_default_config()
+    config['collectors']['network']['exclude_interfaces'].append('eth9')
+
+    assert get_default_config()['collectors']['network']['exclude_interfaces'] == ['lo']
+
+
+class TestValidateConfig:
+    """Test validate_config"""
+
+    @pytest.fixture
+    def config(self):
+        config = get_default_config()
+        config['collectors']['disk']['interval'] = 5
+        return config
+
+    def test_defaults_valid(self, config):
+        """Test the default configuration validates"""
+        validate_config(config)
+
+    @pytest.mark.parametrize('section, key, value, message', [
+        ('prometheus', 'port', 70000, 'Invalid Prometheus port: 70000'),
+        ('agent', 'log_level', 'loud', 'Invalid log level: LOUD'),
+        ('resource_limits', 'action_on_exceed', 'panic', 'Invalid action_on_exceed: panic'),
+    ])
+    def test_invalid_value_rejected(self, config, section, key, value, message):
+        """Test out-of-range values raise with the offending value"""
+        config[section][key] = value
+
+        with pytest.raises(ValueError, match=message):
+            validate_config(config)
+
+    def test_enabled_channel_requires_fields(self, config):
+        """Test an enabled channel without its required fields is rejected"""
+        config['alerting']['enabled'] = True
+        config['alerting']['channels']['slack']['enabled'] = True
+
+        with pytest.raises(ValueError, match='Slack channel enabled but webhook_url not set'):
+            validate_config(config)
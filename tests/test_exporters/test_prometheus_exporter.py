@@ -0,0 +1,120 @@
+"""Tests for Prometheus exporter self-monitoring metrics"""
+
+import socket
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from src.exporters import prometheus_exporter
+from src.exporters.prometheus_exporter import PrometheusExporter
+
+
+class FakeCollector:
+    """Collector stand-in exposing the state update_agent_metrics reads"""
+
+    def __init__(self):
+        self.last_success = 1000.0
+        self.last_collection_duration = 0.25
+        self.error_count = 0
+
+    def get_name(self):
+        return 'fake'
+
+    def is_healthy(self):
+        return self.error_count < 3
+
+
+class TestAgentMetrics:
+    """Test PrometheusExporter.update_agent_metrics"""
+
+    @pytest.fixture
+    def exporter(self):
+        return PrometheusExporter({'prometheus': {'port': 9100}}, [])
+
+    def sample(self, exporter, name):
+        return exporter.registry.get_sample_value(name, {'collector': 'fake'})
+
+    def test_unchanged_values_not_rewritten(self, exporter, mocker):
+        """Test gauges are only written when their value changes"""
+        collector = FakeCollector()
+        exporter.update_agent_metrics([collector])
+        status = exporter._child_cache['fake'][2]
+        status_set = mocker.spy(status, 'set')
+
+        collector.last_success = 1005.0
+        exporter.update_agent_metrics([collector])
+
+        assert self.sample(exporter, 'agent_collector_last_success_timestamp') == 1005.0
+        assert self.sample(exporter, 'agent_collector_status') == 1
+        assert status_set.call_count == 0
+
+    def test_errors_counted_once(self, exporter):
+        """Test each collection error is counted once, across success resets"""
+        collector = FakeCollector()
+
+        # Two consecutive failures, each followed by an update
+        for error_count in (1, 2, 2):
+            collector.error_count = error_count
+            exporter.update_agent_metrics([collector])
+        assert self.sample(exporter, 'agent_collector_errors_total') == 2
+
+        # A success resets the consecutive count, then one more failure
+        for error_count in (0, 1):
+            collector.error_count = error_count
+            exporter.update_agent_metrics([collector])
+        assert self.sample(exporter, 'agent_collector_errors_total') == 3
+
+
+class TestHTTPServer:
+    """Test the metrics HTTP server lifecycle"""
+
+    def test_stop_releases_port(self):
+        """Test stop() shuts the server down so the port can be bound again"""
+        config = {'prometheus': {'host': '127.0.0.1', 'port': 0, 'max_threads': 2}}
+        exporter = PrometheusExporter(config, [])
+        exporter.start()
+        port = exporter._httpd.server_address[1]
+
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5).read()
+        assert b'agent_info' in body
+
+        exporter.stop()
+        assert not exporter.running
+
+        # The scrape leaves the port in TIME_WAIT, hence SO_REUSEADDR; binding
+        # still fails if the listening socket were left open
+        with socket.socket() as sock:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(('127.0.0.1', port))
+
+    def test_stalled_clients_do_not_block_stop(self, mocker):
+        """Test idle connections holding every slot neither hang scrapes nor stop()"""
+        mocker.patch.object(prometheus_exporter, 'SLOT_WAIT_SECONDS', 0.2)
+        config = {'prometheus': {'host': '127.0.0.1', 'port': 0, 'max_threads': 2}}
+        exporter = PrometheusExporter(config, [])
+        exporter.start()
+        port = exporter._httpd.server_address[1]
+
+        # Connect and never send a request, occupying both slots
+        idle = [socket.create_connection(('127.0.0.1', port)) for _ in range(2)]
+        try:
+            time.sleep(0.2)
+
+            # A further connection is closed instead of waiting for a slot
+            with socket.create_connection(('127.0.0.1', port), timeout=5) as sock:
+                sock.sendall(b"GET /metrics HTTP/1.0\r\n\r\n")
+                try:
+                    reply = sock.recv(1024)
+                except ConnectionResetError:
+                    reply = b''
+                assert reply == b''
+
+            stopper = threading.Thread(target=exporter.stop)
+            stopper.start()
+            stopper.join(timeout=5)
+            assert not stopper.is_alive()
+        finally:
+            for sock in idle:
+                sock.close()
@@ -0,0 +1,41 @@
+"""Tests for the command-line entry point"""
+
+import argparse
+import logging
+
+import pytest
+
+from src import main as main_module
+from src.utils.logger import get_logger
+
+
+@pytest.fixture(autouse=True)
+def agent_handlers():
+    """Restore the agent logger's handlers after each test"""
+    agent = logging.getLogger('agent')
+    handlers = list(agent.handlers)
+    yield
+    for handler in agent.handlers:
+        if handler not in handlers:
+            handler.close()
+    agent.handlers[:] = handlers
+
+
+def test_records_before_fatal_error_are_written(tmp_path, mocker):
+    """Test a record logged just before a startup failure reaches the log"""
+    log_file = tmp_path / 'agent.log'
+    config = {'agent': {'log_level': 'INFO', 'log_format': 'text', 'log_file': str(log_file)}}
+
+    def failing_agent(config):
+        get_logger('agent').error("No collectors enabled")
+        raise ValueError("No collectors enabled")
+
+    mocker.patch.object(main_module, 'parse_args',
+                        return_value=argparse.Namespace(config=None, log_level=None))
+    mocker.patch.object(main_module, 'load_config', return_value=config)
+    mocker.patch.object(main_module, 'Agent', side_effect=failing_agent)
+
+    assert main_module.main() == 1
+    # The listener was stopped (and drained) before main() returned
+    assert getattr(logging.getLogger('agent'), '_listener', None) is None
+    assert "[ERROR] agent.agent - No collectors enabled" in log_file.read_text()
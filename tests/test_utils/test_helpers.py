@@ -0,0 +1,32 @@
+"""Tests for helper functions"""
+
+import pytest
+
+from src.utils import helpers
+from src.utils.helpers import format_bytes, get_hostname
+
+
+def test_hostname_looked_up_once(mocker):
+    """Test the hostname is resolved once per process"""
+    get_hostname.cache_clear()
+    gethostname = mocker.patch.object(helpers.socket, 'gethostname', return_value='node-1')
+
+    assert get_hostname() == 'node-1'
+    assert get_hostname() == 'node-1'
+    assert gethostname.call_count == 1
+    get_hostname.cache_clear()
+
+
+@pytest.mark.parametrize('value, expected', [
+    (0, '0.00 B'),
+    (512, '512.00 B'),
+    (1023.5, '1023.50 B'),
+    (1024, '1.00 KB'),
+    (1536, '1.50 KB'),
+    (5 * 1024 ** 3, '5.00 GB'),
+    (3 * 1024 ** 6, '3072.00 PB'),
+])
+def test_format_bytes(value, expected):
+    """Test values are scaled to the largest unit below them"""
+    assert format_bytes(value) == expected
+
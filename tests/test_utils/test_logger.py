@@ -0,0 +1,98 @@
+"""Tests for logging setup"""
+
+import json
+import logging
+import logging.handlers
+import time
+
+import pytest
+
+from src.utils import logger as logger_module
+from src.utils.logger import get_logger, setup_logger, stop_logger
+
+
+@pytest.fixture
+def agent_logger():
+    """Restore the agent logger's handlers after each test"""
+    agent = logging.getLogger('agent')
+    handlers = list(agent.handlers)
+    yield agent
+    stop_logger()
+    agent.handlers[:] = handlers
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_json_format(agent_logger, capsys, monkeypatch, use_orjson):
+    """Test JSON logs carry the same fields with and without orjson"""
+    if not use_orjson:
+        monkeypatch.setattr(logger_module, 'orjson', None)
+    elif logger_module.orjson is None:
+        pytest.skip("orjson not installed")
+
+    setup_logger({'agent': {'log_format': 'json'}})
+    get_logger('test').warning("disk %s full", '/data')
+    stop_logger()
+
+    record = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    assert record['level'] == 'WARNING'
+    assert record['logger'] == 'agent.test'
+    assert record['message'] == 'disk /data full'
+    assert 'timestamp' in record
+
+
+def test_records_written_by_listener_thread(agent_logger, capsys):
+    """Test records are queued, formatted off-thread, and flushed on stop"""
+    setup_logger({'agent': {'log_format': 'text'}})
+    assert len(agent_logger.handlers) == 1
+    assert isinstance(agent_logger.handlers[0], logging.handlers.QueueHandler)
+
+    args = ['/data']
+    get_logger('test').info("mount %s", args)
+    args.append('/mutated')
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        get_logger('test').exception("failed")
+    stop_logger()
+
+    out = capsys.readouterr().out
+    assert "mount ['/data']" in out
+    assert "RuntimeError: boom" in out
+
+    # After stop, the real handlers write directly again
+    assert isinstance(agent_logger.handlers[0], logging.StreamHandler)
+
+
+def test_timestamp_formatted_once_per_second(mocker):
+    """Test records within the same second reuse the formatted timestamp"""
+    formatter = logger_module.OrjsonFormatter(datefmt=logger_module.DATE_FORMAT)
+    expected_later = time.strftime(logger_module.DATE_FORMAT, time.localtime(1001))
+    strftime = mocker.spy(logger_module.time, 'strftime')
+
+    first = logging.makeLogRecord({'msg': 'a', 'created': 1000.1})
+    second = logging.makeLogRecord({'msg': 'b', 'created': 1000.9})
+    later = logging.makeLogRecord({'msg': 'c', 'created': 1001.0})
+
+    assert formatter.formatTime(first, formatter.datefmt) == formatter.formatTime(second, formatter.datefmt)
+    assert formatter.formatTime(later, formatter.datefmt) == expected_later
+    assert strftime.call_count == 2
+
+
+def test_queued_records_flushed_at_exit(agent_logger, tmp_path, mocker):
+    """Test the listener is flushed at interpreter exit, keeping the last records"""
+    register = mocker.spy(logger_module.atexit, 'register')
+    log_file = tmp_path / 'agent.log'
+    setup_logger({'agent': {'log_format': 'text', 'log_file': str(log_file)}})
+    register.assert_called_with(stop_logger)
+
+    log = get_logger('test')
+    for i in range(2000):
+        log.info("line %d", i)
+    log.error("last words")
+
+    # What the atexit hook runs on shutdown
+    stop_logger()
+
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 2001
+    assert lines[-1].endswith("last words")
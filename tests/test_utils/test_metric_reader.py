@@ -0,0 +1,49 @@
+"""Tests for MetricReader"""
+
+import pytest
+from prometheus_client import CollectorRegistry, Gauge
+
+from src.utils.metric_reader import MetricReader
+
+
+class TestMetricReader:
+    """Test MetricReader snapshot handling"""
+
+    @pytest.fixture
+    def registry(self):
+        registry = CollectorRegistry()
+        self.gauge = Gauge('disk_usage_percent', 'Disk usage', ['mount_point'], registry=registry)
+        self.gauge.labels(mount_point='/').set(40.0)
+        self.gauge.labels(mount_point='/data').set(90.0)
+        return registry
+
+    def test_reads_share_one_collect(self, registry, mocker):
+        """Test reads within the TTL are served from one registry collect"""
+        reader = MetricReader(registry, snapshot_ttl=60)
+        collect = mocker.spy(registry, 'collect')
+
+        assert reader.get_metric_value('disk_usage_percent', {'mount_point': '/data'}) == [
+            (90.0, {'mount_point': '/data'})
+        ]
+        assert 'disk_usage_percent' in reader.get_all_metric_names()
+        assert reader.get_metric_value('missing_metric') == []
+        assert collect.call_count == 1
+
+    def test_invalidate_forces_fresh_read(self, registry):
+        """Test invalidate() makes the next read see current values"""
+        reader = MetricReader(registry, snapshot_ttl=60)
+        reader.get_all_series('disk_usage_percent')
+
+        self.gauge.labels(mount_point='/').set(55.0)
+        reader.invalidate()
+
+        assert (55.0, {'mount_point': '/'}) in reader.get_all_series('disk_usage_percent')
+
+    def test_reads_collect_only_owning_collector(self, registry, mocker):
+        """Test reading one metric doesn't collect unrelated collectors"""
+        other = Gauge('memory_usage_percent', 'Memory usage', registry=registry)
+        other_collect = mocker.spy(other, 'collect')
+        reader = MetricReader(registry, snapshot_ttl=60)
+
+        assert len(reader.get_all_series('disk_usage_percent')) == 2
+        assert other_collect.call_count == 0
@@ -0,0 +1,99 @@
+"""Tests for PeriodicScheduler"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.periodic_scheduler import PeriodicScheduler
+
+
+class TestPeriodicScheduler:
+    """Test PeriodicScheduler"""
+
+    def test_runs_tasks_until_stopped(self):
+        """Test tasks run repeatedly and stop promptly"""
+        stop_event = threading.Event()
+        scheduler = PeriodicScheduler(stop_event)
+        runs = []
+        scheduler.add_task("fast", lambda: runs.append("fast"), 0.01)
+        scheduler.add_task("slow", lambda: runs.append("slow"), 10)
+
+        scheduler.start()
+        time.sleep(0.1)
+        stop_event.set()
+        scheduler.join(timeout=1)
+
+        assert not scheduler.thread.is_alive()
+        assert runs.count("fast") >= 3
+        assert runs.count("slow") == 1
+
+    def test_task_errors_do_not_stop_scheduler(self):
+        """Test a failing task is logged and rescheduled"""
+        stop_event = threading.Event()
+        scheduler = PeriodicScheduler(stop_event)
+        calls = []
+
+        def failing():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        scheduler.add_task("failing", failing, 0.01)
+        scheduler.start()
+        time.sleep(0.1)
+        stop_event.set()
+        scheduler.join(timeout=1)
+
+        assert len(calls) >= 2
+
+    def test_executor_never_overlaps_task(self):
+        """Test a task still running in the executor is not resubmitted"""
+        stop_event = threading.Event()
+        pool = ThreadPoolExecutor(max_workers=4)
+        scheduler = PeriodicScheduler(stop_event, executor=pool)
+        active = []
+        max_active = []
+        lock = threading.Lock()
+
+        def slow():
+            with lock:
+                active.append(1)
+                max_active.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+        scheduler.add_task("slow", slow, 0.01)
+        scheduler.start()
+        time.sleep(0.2)
+        stop_event.set()
+        scheduler.join(timeout=1)
+        pool.shutdown(wait=True)
+
+        assert max(max_active) == 1
+
+    def test_join_reports_tasks_still_running_at_deadline(self):
+        """Test join shares one deadline and reports unfinished tasks"""
+        stop_event = threading.Event()
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            release.wait(5)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            scheduler = PeriodicScheduler(stop_event, executor=executor)
+            scheduler.add_task("slow", slow, 10)
+            scheduler.start()
+            assert started.wait(2)
+
+            stop_event.set()
+            begin = time.monotonic()
+            still_running = scheduler.join(timeout=0.2)
+            elapsed = time.monotonic() - begin
+
+            assert still_running == ["slow"]
+            assert elapsed < 1.0
+
+            release.set()
+            assert scheduler.join(timeout=2) == []